@@ -0,0 +1,60 @@
+"""Per-component render micro-benchmark.
+
+Times rendering one representative instance of each component type, the way
+it happens inside a page: 100 copies sit in a ContainerComponent and the cost
+of container.to_html() is divided by 100. Containers are given three text
+children. Run it on two checkouts to compare a change to the templates.
+
+Usage:
+    python benchmarks/component_templates.py [iterations]
+"""
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pycob as cob
+
+COPIES = 100
+
+
+def children():
+    return [cob.TextComponent("child %d" % i) for i in range(3)]
+
+
+SAMPLES = {
+    "Alert": lambda: cob.AlertComponent("Something happened", "Info", "red"),
+    "Card": lambda: cob.CardComponent(classes="extra", components=children()),
+    "Code": lambda: cob.CodeComponent("print('hello')", "main.py"),
+    "Container": lambda: cob.ContainerComponent(grid_columns=3, components=children()),
+    "Divider": lambda: cob.DividerComponent(),
+    "Form": lambda: cob.FormComponent("/submit", components=children()),
+    "Formtext": lambda: cob.FormtextComponent("Name", "name", "Your name", "Ada"),
+    "Formsubmit": lambda: cob.FormsubmitComponent("Send"),
+    "Header": lambda: cob.HeaderComponent("Heading", 3),
+    "Html": lambda: cob.HtmlComponent("<b>bold</b>"),
+    "Image": lambda: cob.ImageComponent("https://example.com/a.png", "An image"),
+    "Link": lambda: cob.LinkComponent("Docs", "https://example.com"),
+    "List": lambda: cob.ListComponent(components=children()),
+    "Listitem": lambda: cob.ListitemComponent("Item", is_checked=True),
+    "Plainlink": lambda: cob.PlainlinkComponent("Home", "/", "underline"),
+    "Selectoption": lambda: cob.SelectoptionComponent("One", "1", "selected"),
+    "Tablecell": lambda: cob.TablecellComponent("42"),
+    "Tablecellheader": lambda: cob.TablecellheaderComponent("Total"),
+    "Tablerow": lambda: cob.TablerowComponent([cob.TablecellComponent(str(i)) for i in range(5)]),
+    "Text": lambda: cob.TextComponent("A paragraph of text"),
+}
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    for name, make in SAMPLES.items():
+        parent = cob.ContainerComponent(components=[make() for _ in range(COPIES)])
+        seconds = min(timeit.repeat(parent.to_html, number=iterations, repeat=3))
+        print(f"{name:<16} {seconds / iterations / COPIES * 1e9:8.0f} ns/render")
+
+
+if __name__ == "__main__":
+    main()
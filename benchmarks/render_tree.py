@@ -0,0 +1,56 @@
+"""Render time and peak allocation for a deep component tree.
+
+Builds a 5-level tree (Page > Container > Card > Container > List) with 100k
+ListItem leaves and renders it with Page.to_html(). Run it on two checkouts to
+compare a change to the render path.
+
+Usage:
+    python benchmarks/render_tree.py
+"""
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pycob as cob
+
+FANOUT = 10
+
+
+def build_tree() -> cob.Page:
+    page = cob.Page("Benchmark")
+    for a in range(FANOUT):
+        container = page.add_container()
+        for b in range(FANOUT):
+            card = container.add_card()
+            for c in range(FANOUT):
+                inner = card.add_container()
+                for d in range(FANOUT):
+                    items = inner.add_list()
+                    for e in range(FANOUT):
+                        items.add_listitem(f"Item {a}.{b}.{c}.{d}.{e}")
+    return page
+
+
+def main():
+    page = build_tree()
+
+    start = time.perf_counter()
+    html = page.to_html()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    page.to_html()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"leaves:      {FANOUT ** 5}")
+    print(f"output:      {len(html) / 1e6:.1f} MB")
+    print(f"render time: {elapsed * 1000:.0f} ms")
+    print(f"peak alloc:  {peak / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
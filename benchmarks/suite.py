@@ -0,0 +1,277 @@
+"""Benchmark suite for the render path, with stored baselines.
+
+Times the operations that dominate a page request:
+
+    page_to_html           Page.to_html() with N mixed components
+    pandastable_1k/100k    Page.add_pandastable() + to_html() on mixed dtypes
+    datagrid_1k/100k       Page.add_datagrid() + to_html() on mixed dtypes
+    *_actions_100k         The same with Rowaction buttons formatted from the rows
+    datagrid_block_100k    A sorted block of rows from a server-side data grid
+    plotlyfigure           PlotlyfigureComponent construction
+    page_handler           A full request through PageHandler and Flask's test client
+    page_handler_cached    The same request answered from the render cache
+    navbar_footer          Rendering the navbar and footer for 50 registered pages
+
+Each case runs `repeat` times and the fastest run is kept. Results are written as
+JSON. Given a baseline, every case that got slower by more than the tolerance is
+reported and the exit status is 1, so it can gate a release.
+
+Usage:
+    python benchmarks/suite.py                          # run and print JSON
+    python benchmarks/suite.py -o results.json          # also write it to a file
+    python benchmarks/suite.py --compare                # fail on regressions against benchmarks/baseline.json
+    python benchmarks/suite.py --save-baseline          # record the cases that ran in benchmarks/baseline.json
+    python benchmarks/suite.py -k pandastable --quick   # only matching cases, skipping the 100k-row ones
+
+Timings depend on the machine, so compare against a baseline recorded on the
+same one.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+import pycob as cob
+from pycob.handler import _get_page_chrome
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+# Slower than the baseline by more than this fraction counts as a regression
+TOLERANCE = 0.25
+
+
+def mixed_dataframe(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "id": np.arange(rows),
+        "price": rng.random(rows) * 1000,
+        "name": ["item %d" % i for i in range(rows)],
+        "created": pd.date_range("2020-01-01", periods=rows, freq="min"),
+        "active": rng.random(rows) > 0.5,
+        "category": pd.Categorical(rng.choice(["red", "green", "blue"], rows)),
+    })
+    df.loc[::7, "price"] = np.nan
+    df.loc[::11, "name"] = None
+    return df
+
+
+def add_mixed_components(page, count: int):
+    for i in range(count):
+        kind = i % 5
+
+        if kind == 0:
+            page.add_header("Header %d" % i, size=3)
+        elif kind == 1:
+            page.add_text("Paragraph %d with a few words of text" % i)
+        elif kind == 2:
+            with page.add_card() as card:
+                card.add_text("Card %d" % i)
+                card.add_link("Link", "/link/%d" % i)
+        elif kind == 3:
+            page.add_alert("Alert %d" % i, "Info", color="blue")
+        else:
+            with page.add_container(grid_columns=2) as container:
+                container.add_code("print(%d)" % i)
+                container.add_image("https://example.com/%d.png" % i, "Image")
+
+
+def page_to_html(count: int):
+    page = cob.Page("Benchmark")
+    add_mixed_components(page, count)
+    return page.to_html
+
+
+def table(method: str, rows: int, actions: bool = False):
+    df = mixed_dataframe(rows)
+    action_buttons = [cob.Rowaction("Edit", "/edit/{id}"), cob.Rowaction("{name}", "/item/{id}")] if actions else None
+
+    def run():
+        page = cob.Page("Benchmark")
+
+        if action_buttons is None:
+            getattr(page, method)(df)
+        else:
+            getattr(page, method)(df, action_buttons=action_buttons)
+
+        return page.to_html()
+
+    return run
+
+
+def datagrid_block(rows: int):
+    app = cob.App("Benchmark")
+    df = mixed_dataframe(rows)
+
+    def home(server_request: cob.Request) -> cob.Page:
+        page = cob.Page("Home")
+        page.add_datagrid(df, server_side=True)
+        return page
+
+    app.register_function(home)
+    client = app.flask_app.test_client()
+    grid_id = client.get("/home").get_data(as_text=True).split("/_pycob/datagrid/")[1].split("'")[0]
+    query = {"startRow": 1000, "endRow": 1100, "sortModel": [{"colId": "price", "sort": "desc"}], "filterModel": {}}
+
+    # The sort is done by the first request and kept for the ones after it, like scrolling through the grid
+    return lambda: client.post("/_pycob/datagrid/" + grid_id, json=query)
+
+
+def plotlyfigure():
+    df = mixed_dataframe(10000)
+    fig = px.scatter(df, x="created", y="price", color="category")
+    return lambda: cob.PlotlyfigureComponent(fig)
+
+
+def benchmark_app(pages: int = 1) -> cob.App:
+    app = cob.App("Benchmark")
+    df = mixed_dataframe(1000)
+
+    def home(server_request: cob.Request) -> cob.Page:
+        page = cob.Page("Home")
+        add_mixed_components(page, 100)
+        page.add_pandastable(df)
+        return page
+
+    app.register_function(home, cache_ttl=3600)
+
+    for i in range(1, pages):
+        app.add_page("/page%d" % i, "Page %d" % i, home, footer_category="Category %d" % (i % 5))
+
+    return app
+
+
+def page_handler(cached: bool):
+    client = benchmark_app().flask_app.test_client()
+    client.get("/home")
+
+    if cached:
+        return lambda: client.get("/home")
+
+    # A different query string every time misses the cache, so the page function runs and the page renders
+    counter = iter(range(10 ** 9))
+    return lambda: client.get("/home?n=%d" % next(counter))
+
+
+def navbar_footer():
+    app = benchmark_app(pages=50)
+
+    def run():
+        app.page_chrome = None
+        return _get_page_chrome(app)
+
+    return run
+
+
+# name: (setup returning the function to time, calls per run, runs, part of --quick)
+CASES = {
+    "page_to_html_100": (lambda: page_to_html(100), 100, 5, True),
+    "page_to_html_10k": (lambda: page_to_html(10000), 1, 5, True),
+    "pandastable_1k": (lambda: table("add_pandastable", 1000), 1, 5, True),
+    "pandastable_100k": (lambda: table("add_pandastable", 100000), 1, 1, False),
+    "datagrid_1k": (lambda: table("add_datagrid", 1000), 1, 5, True),
+    "datagrid_100k": (lambda: table("add_datagrid", 100000), 1, 1, False),
+    "pandastable_actions_100k": (lambda: table("add_pandastable", 100000, actions=True), 1, 1, False),
+    "datagrid_actions_100k": (lambda: table("add_datagrid", 100000, actions=True), 1, 1, False),
+    "datagrid_block_100k": (lambda: datagrid_block(100000), 10, 5, False),
+    "plotlyfigure": (plotlyfigure, 10, 5, True),
+    "page_handler": (lambda: page_handler(cached=False), 1, 5, True),
+    "page_handler_cached": (lambda: page_handler(cached=True), 100, 5, True),
+    "navbar_footer": (navbar_footer, 100, 5, True),
+}
+
+
+def run_case(setup, number: int, repeat: int) -> dict:
+    function = setup()
+    function()
+    best = None
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        elapsed = (time.perf_counter() - start) / number
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {"seconds": best, "number": number, "repeat": repeat}
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Returns (name, baseline seconds, seconds, ratio) for each case that regressed."""
+    regressions = []
+
+    for name, result in results["cases"].items():
+        base = baseline["cases"].get(name)
+
+        if base is None:
+            continue
+
+        ratio = result["seconds"] / base["seconds"]
+
+        if ratio > 1 + tolerance:
+            regressions.append((name, base["seconds"], result["seconds"], ratio))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks the pycob render path.")
+    parser.add_argument("-k", "--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="Skip the 100k-row cases")
+    parser.add_argument("-o", "--output", help="Also write the results to this file")
+    parser.add_argument("--compare", nargs="?", const=str(BASELINE), help="Baseline to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="Allowed slowdown as a fraction (default: 0.25)")
+    parser.add_argument("--save-baseline", action="store_true", help="Record the results of the cases that ran in benchmarks/baseline.json")
+    args = parser.parse_args()
+
+    results = {"environment": environment(), "cases": {}}
+
+    for name, (setup, number, repeat, quick) in CASES.items():
+        if args.filter not in name or (args.quick and not quick):
+            continue
+
+        results["cases"][name] = run_case(setup, number, repeat)
+        print(f"{name:<26} {results['cases'][name]['seconds'] * 1000:10.3f} ms", file=sys.stderr)
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    print(text)
+
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+
+    if args.save_baseline:
+        # Cases that weren't run (e.g. with -k or --quick) keep their old baseline
+        baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {"cases": {}}
+        baseline["environment"] = results["environment"]
+        baseline["cases"].update(results["cases"])
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+
+    if args.compare:
+        regressions = compare(results, json.loads(Path(args.compare).read_text()), args.tolerance)
+
+        for name, base, seconds, ratio in regressions:
+            print(f"REGRESSION {name}: {base * 1000:.3f} ms -> {seconds * 1000:.3f} ms ({ratio:.2f}x)", file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
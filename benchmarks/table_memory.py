@@ -0,0 +1,48 @@
+"""Memory held by a large RawtableComponent.
+
+Builds a table of 20k rows x 10 cells (200k TablecellComponents) and reports
+the memory retained by the component tree, measured with tracemalloc. The
+cell values are created before measuring so only the components are counted.
+
+Usage:
+    python benchmarks/table_memory.py [rows]
+"""
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pycob as cob
+
+COLUMNS = 10
+
+
+def build_table(values) -> cob.RawtableComponent:
+    table = cob.RawtableComponent()
+    body = table.add_tablebody()
+    for row_values in values:
+        row = body.add_tablerow()
+        for value in row_values:
+            row.add_tablecell(value)
+    return table
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    values = [[f"r{r}c{c}" for c in range(COLUMNS)] for r in range(rows)]
+
+    # The table is kept alive until after the measurement, then rendered to check it holds every cell
+    tracemalloc.start()
+    table = build_table(values)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    cells = table.to_html().count("<td")
+    print(f"cells:     {cells}")
+    print(f"retained:  {retained / 1e6:.1f} MB")
+    print(f"per cell:  {retained / cells:.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
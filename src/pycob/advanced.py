@@ -1,159 +1,330 @@
 from urllib.parse import quote
+from functools import partial
+from itertools import chain, repeat
+from string import Formatter
+from .formatting import format_column, format_value
+from .json_encoder import encode_records
+from .columnar import ColumnarTable, as_columnar
+from .request import _page_access
+from .cache import RenderCache
+from .component_interface import Component
 import re
 import json
-
-def advanced_add_pandastable(self, df, hide_fields, action_buttons):
-    cols_to_show = []
-    show_actions = False
-
+import operator
+import uuid
+
+# DataFrames of paginated tables by id, with the columns and action buttons to render.
+# Served by the /_pycob/table/<id> route. Each request for rows keeps the table for another ttl.
+_pandastable_datasets = RenderCache(ttl=1800, max_entries=64, sliding=True, max_bytes=512 * 2 ** 20)
+# The ids of those tables by frame, shown columns and action buttons, so every render of a table shares one
+_pandastable_ids = RenderCache(ttl=1800, max_entries=256, sliding=True)
+
+# DataFrames of server-side data grids by id, with their action buttons, their ids by frame and action
+# buttons, and the row positions of their recent sorts and filters. Served by the /_pycob/datagrid/<id> route.
+_datagrid_datasets = RenderCache(ttl=1800, max_entries=64, sliding=True, max_bytes=512 * 2 ** 20)
+_datagrid_ids = RenderCache(ttl=1800, max_entries=256, sliding=True)
+_datagrid_views = RenderCache(ttl=1800, max_entries=256, sliding=True, max_bytes=256 * 2 ** 20)
+
+# Rows fetched at a time from a SQL result given to add_pandastable() or add_datagrid()
+_SQL_CHUNK_SIZE = 10000
+
+# Rows of a table rendered at a time when the page is streamed
+_TABLE_BLOCK_SIZE = 1000
+
+class PandastableComponent(Component):
+    """The rows of a DataFrame as a table. You don't normally need to invoke this constructor directly.
+
+    Instead, use `Page.add_pandastable`. The rows are rendered with the page, not when the table is added.
+    A streaming response sends them _TABLE_BLOCK_SIZE rows at a time, so the browser gets the head of the
+    table while the rest is rendered.
+    """
+    __slots__ = ('head', 'rows', 'row_count', 'foot')
+    def __init__(self, head: str, rows, row_count: int, foot: str):
+        self.head = head
+        # rows(start, stop) returns the HTML of rows start to stop as a list of strings
+        self.rows = rows
+        self.row_count = row_count
+        self.foot = foot
+
+    def render_into(self, out: list):
+        out.append(self.head)
+        out.extend(self.rows(0, self.row_count))
+        out.append(self.foot)
+
+    def iter_html(self):
+        yield self.head
+
+        for start in range(0, self.row_count, _TABLE_BLOCK_SIZE):
+            yield "".join(self.rows(start, min(start + _TABLE_BLOCK_SIZE, self.row_count)))
+
+        yield self.foot
+
+class HtmlStreamComponent(Component):
+    """HTML that is produced while the page is being sent. You don't normally need to invoke this constructor directly.
+
+    Instead, pass an iterator of DataFrames or a SQL result to `Page.add_pandastable` or `Page.add_datagrid`.
+    With a streaming response, each piece goes out to the client as soon as it is made. The pieces are
+    only made once, so the component can only be rendered once. Pieces after the first are made while the
+    page is sent, after the page function has returned.
+    """
+    __slots__ = ('chunks', 'assets')
+    def __init__(self, chunks, assets: list = None):
+        self.chunks = chunks
+        self.assets = tuple(assets or ())
+
+    def render_into(self, out: list):
+        out.extend(self.chunks)
+
+    def iter_html(self):
+        return iter(self.chunks)
+
+def advanced_add_pandastable(self, df, hide_fields, action_buttons, page_size=None):
     if action_buttons is None:
         action_buttons = []
 
-    if len(__get_action_buttons_to_add(action_buttons)) > 0:
-        show_actions = True
+    if page_size is not None and page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    source = df
+    df = __as_table(df)
+
+    if __is_chunked(df):
+        if page_size is not None:
+            raise ValueError("page_size needs a DataFrame. Chunked sources are rendered as they are read.")
+
+        self.components.append(HtmlStreamComponent(__stream_pandastable(__iter_chunks(df), hide_fields, action_buttons)))
+        return self
+
+    cols_to_show = []
 
     for col in df.columns:
         if col not in hide_fields:
             cols_to_show.append(col)
 
+    head = __pandastable_head(df, cols_to_show, action_buttons)
+
+    # The Actions column's buttons are spaced apart, those in place of a value aren't
+    buttons = __compile_action_buttons(df.columns, cols_to_show, action_buttons, " mr-1", "")
+    paginate = page_size is not None and len(df) > page_size
+    foot = ["</tbody>", "</table>", "</div>"]
+
+    if paginate:
+        options = (tuple(cols_to_show), __action_buttons_identity(action_buttons))
+        table_id, _ = __shared_dataset_id(_pandastable_datasets, _pandastable_ids, source, options, lambda: (df, cols_to_show, buttons))
+        head.append('''<tbody data-pycob-table-rows>''')
+
+        # Later rows are fetched from the server by loadTableRows()
+        foot.append('''<div class="flex items-center justify-between mt-4 text-sm text-gray-500 dark:text-gray-400">''')
+        foot.append('''<span data-pycob-table-status>Showing ''' + "{:,}".format(page_size) + " of " + "{:,}".format(len(df)) + " rows</span>")
+        foot.append('''<button onclick="loadTableRows(this)" data-pycob-table="''' + table_id + '''" data-offset="''' + str(page_size) + '''" data-limit="''' + str(page_size) + '''" data-total="''' + str(len(df)) + '''" class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800">Load more</button>''')
+        foot.append("</div>")
+    else:
+        head.append("<tbody>")
+
+    foot.append("</div>")
+
+    rows = partial(__pandastable_block, df, cols_to_show, buttons)
+    self.components.append(PandastableComponent("".join(head), rows, page_size if paginate else len(df), "".join(foot)))
+    return self
+
+def __shared_dataset_id(datasets, ids, source, options: tuple, make_dataset) -> tuple:
+    # Returns the id and dataset stored for the frame or table the caller passed in, with the given
+    # options, storing make_dataset() (a tuple starting with the frame to serve) the first time. Entries
+    # are (source, dataset, access), with the access rule of the page being rendered, and pages with
+    # different rules get different ids. They hold the source, so while one is cached no other object can
+    # have its id().
+    access = _page_access.get()
+    identity = (id(source), access) + options
+    dataset_id = ids.get(identity)
+
+    if dataset_id is not None:
+        stored = datasets.get(dataset_id)
+
+        if stored is not None and stored[0] is source:
+            return dataset_id, stored[1]
+
+    dataset = make_dataset()
+    dataset_id = str(uuid.uuid4())
+    datasets.set(dataset_id, (source, dataset, access), __table_nbytes(dataset[0]))
+    ids.set(identity, dataset_id)
+    return dataset_id, dataset
+
+def advanced_pandastable_access(table_id: str):
+    """Returns the access rule of the page that made a paginated table, as (require_login, protect_with_code), or None."""
+    return __dataset_access(_pandastable_datasets, table_id)
+
+def advanced_datagrid_access(grid_id: str):
+    """Returns the access rule of the page that made a server-side data grid, as (require_login, protect_with_code), or None."""
+    return __dataset_access(_datagrid_datasets, grid_id)
+
+def __dataset_access(datasets, dataset_id: str):
+    # None too if the dataset has expired, which its route answers with a 404 anyway
+    stored = datasets.get(dataset_id)
+    return None if stored is None else stored[2]
+
+def __action_buttons_identity(action_buttons) -> tuple:
+    return tuple((button.label, button.url, button.open_in_new_window) for button in action_buttons)
+
+def __table_nbytes(df) -> int:
+    # Text in object columns is counted by its pointers only. Counting the strings themselves takes longer
+    # than rendering a page of rows.
+    if isinstance(df, ColumnarTable):
+        return df.nbytes()
+
+    return int(df.memory_usage(index=True).sum())
+
+def __pandastable_head(df, cols_to_show, action_buttons) -> list:
     # Pandas dataframe to html
-    html = '''<div class="p-8">'''
+    html = ['''<div class="p-8">''']
 
-    html += '''<div class="relative overflow-x-auto shadow-md sm:rounded-lg">'''
+    html.append('''<div class="relative overflow-x-auto shadow-md sm:rounded-lg">''')
 
-    html += '''<table class="w-full text-sm text-left text-gray-500 dark:text-gray-400">'''
+    html.append('''<table class="w-full text-sm text-left text-gray-500 dark:text-gray-400">''')
 
-    # Pandas DataFrame columns to 
-    html += '''<thead class="text-xs text-gray-700 uppercase bg-gray-50 dark:bg-gray-700 dark:text-gray-400">'''
+    # Pandas DataFrame columns to
+    html.append('''<thead class="text-xs text-gray-700 uppercase bg-gray-50 dark:bg-gray-700 dark:text-gray-400">''')
 
-    html += "<tr>"
+    html.append("<tr>")
 
-    # Get df index name
-    if df.index.name is not None:
-        html += '''<th scope="col" class="px-6 py-3">''' + df.index.name +  "</th>"
+    # Get df index name. Arrow and Polars tables don't have an index.
+    if not isinstance(df, ColumnarTable) and df.index.name is not None:
+        html.append('''<th scope="col" class="px-6 py-3">''' + df.index.name +  "</th>")
 
-    if show_actions:
-        html += '''<th scope="col" class="px-6 py-3">Actions</th>'''
+    if len(__get_action_buttons_to_add(action_buttons)) > 0:
+        html.append('''<th scope="col" class="px-6 py-3">Actions</th>''')
 
     for column in df.columns:
         if column in cols_to_show:
-            html += '''<th scope="col" class="px-6 py-3">''' + column + "</th>"
+            html.append('''<th scope="col" class="px-6 py-3">''' + column + "</th>")
 
-    html += "</tr>"
+    html.append("</tr>")
 
-    html += "</thead>"
+    html.append("</thead>")
 
-    # Pandas DataFrame rows to html
-    html += "<tbody>"
-    i = 0
-    for index, row in df.iterrows():
-        record = row.to_dict()
+    return html
 
-        if i % 2 == 0:
-            html += '''<tr class="bg-white border-b dark:bg-gray-900 dark:border-gray-700">'''
-        else:
-            html += '''<tr class="bg-gray-50 border-b dark:bg-gray-800 dark:border-gray-700">'''
+def __stream_pandastable(chunks, hide_fields, action_buttons):
+    # The header is rendered from the first chunk. Each chunk's rows are then rendered as it is read, so
+    # only one chunk is in memory at a time.
+    buttons = None
+    first_row = 0
 
-        if show_actions:
-            html += '''<td class="px-6 py-4">'''
-        
-            action_buttons_to_add = __get_action_buttons_to_add(action_buttons)
-            
-            for button_to_add in action_buttons_to_add:
-                hydrated_label = button_to_add.label.format(**record)
-                hydrated_url = button_to_add.url.format(**record)
+    for df in chunks:
+        if buttons is None:
+            cols_to_show = [col for col in df.columns if col not in hide_fields]
+            buttons = __compile_action_buttons(df.columns, cols_to_show, action_buttons, " mr-1", "")
+            yield "".join(__pandastable_head(df, cols_to_show, action_buttons)) + "<tbody>"
 
-                if button_to_add.open_in_new_window:
-                    html += """<a href='""" + hydrated_url + """' target="_blank" class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap mr-1">""" + hydrated_label + """</button>"""
-                else:
-                    html += """<a href='""" + hydrated_url + """' class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap mr-1">""" + hydrated_label + """</button>"""
+        yield "".join(__pandastable_rows(df, cols_to_show, buttons, first_row))
+        first_row += len(df)
 
+    if buttons is not None:
+        yield "</tbody></table></div></div>"
 
-            html += '''</td>'''
+def __as_table(source):
+    # pyarrow and Polars tables are read column by column as they are. Anything else is used as it is.
+    columnar = as_columnar(source)
 
-        for column in df.columns:
-            key = column
-            if column in cols_to_show:
-                action_button = __find_key_in_action_buttons(key, action_buttons)
+    if columnar is None:
+        return source
 
-                value = __format_python_object_for_json(record[key])
+    return columnar
 
-                if action_button is not None:
-                    hydrated_label = action_button.label.format(**record)
-                    hydrated_url = action_button.url.format(**record)
-                    if action_button.open_in_new_window:
-                        html += """<td class="px-6 py-4"><a href='""" + hydrated_url + """' target="_blank" class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap">""" + hydrated_label + """</button></td>"""
-                    else:
-                        html += """<td class="px-6 py-4"><a href='""" + hydrated_url + """' class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap">""" + hydrated_label + """</button></td>"""
-                else:
-                    html += '''<td class="px-6 py-4">''' + format_input(row[column]) + "</td>"
+def __slice_table(df, start: int, stop: int):
+    if isinstance(df, ColumnarTable):
+        return df.slice(start, stop)
 
-        html += "</tr>"
-        i += 1
+    return df.iloc[start:stop]
 
-    html += "</tbody>"
+def __table_column(df, i: int):
+    # A pandas Series, or an Arrow or Polars column. format_column() takes any of them.
+    if isinstance(df, ColumnarTable):
+        return df.column(i)
 
-    html += "</table>"
+    return df.iloc[:, i]
 
-    html += "</div>"
+def __is_chunked(source) -> bool:
+    return hasattr(source, "fetchmany") or (hasattr(source, "__iter__") and not hasattr(source, "columns"))
 
-    html += "</div>"
+def __iter_chunks(source):
+    # The first chunk is read right away, while the page function runs, so a source that can't be read
+    # fails there and gets the usual error page. The rest are read as the page is sent, so a connection
+    # has to stay open until then unless the whole result fits in the first chunk.
+    chunks = __read_chunks(source)
+    first = next(chunks, None)
 
-    self.components.append(HtmlComponent(html))
-    return self
+    if first is None:
+        return iter(())
 
+    return chain((first,), chunks)
 
-"""
-A function that formats input into a human-readable string:
-Input: An arbitrary type that could be string, integer, floating point, a numpy object, a pandas datetime, or something else
-Output: String
+def __read_chunks(source):
+    # DataFrames from a chunked source: an iterable of DataFrames (e.g. pd.read_csv(..., chunksize=...)) or
+    # of Arrow record batches or Polars DataFrames, or a SQLAlchemy result or DB-API cursor, read
+    # _SQL_CHUNK_SIZE rows at a time
+    if not hasattr(source, "fetchmany"):
+        yield from map(__as_table, source)
+        return
 
-Dates should be formatted using ISO-8601. Numbers below 10 should include 2 decimal places. Numbers between 10 and 100 should have 1 decimal place. Numbers between 100 and 1000 should have 0 decimal places. Numbers between 1000 and 1000000 should have 0 decimal places and be formatted with a comma for the thousands separator. Numbers between 1000000 and 1000000000 should be formatted as X.Y million. Numbers above 1000000000 should be formatted as X.Y billion
-"""
+    import pandas as pd
 
+    columns = list(source.keys()) if hasattr(source, "keys") else [column[0] for column in source.description]
+    rows = source.fetchmany(_SQL_CHUNK_SIZE)
 
-def format_input(input):
-    is_int = "int" in type(input).__name__
-    is_float = "float" in type(input).__name__
+    # The first chunk is used even when it's empty, so a result without rows still gets its header
+    while True:
+        yield pd.DataFrame.from_records(rows, columns=columns)
 
-    if is_float or is_int:
-        if input < 10:
-            if is_float:
-                return '{:.2f}'.format(input)
-            else:
-                return string_format_with_more(str(input), 10)
-        elif input < 100:
-            if is_float:
-                return '{:.1f}'.format(input)
+        # Fewer rows than asked for is the end of the result, which then isn't read again
+        if len(rows) < _SQL_CHUNK_SIZE:
+            return
+
+        rows = source.fetchmany(_SQL_CHUNK_SIZE)
+
+        if len(rows) == 0:
+            return
+
+def advanced_pandastable_rows(table_id: str, offset: int, limit: int):
+    """Returns the HTML of rows offset to offset + limit of a paginated table, or None if the table has expired."""
+    dataset = _pandastable_datasets.get(table_id)
+
+    if dataset is None:
+        return None
+
+    df, cols_to_show, buttons = dataset[1]
+    return "".join(__pandastable_block(df, cols_to_show, buttons, offset, offset + limit))
+
+def __pandastable_block(df, cols_to_show, buttons, start: int, stop: int) -> list:
+    return __pandastable_rows(__slice_table(df, start, stop), cols_to_show, buttons, start)
+
+def __pandastable_rows(df, cols_to_show, buttons, first_row: int) -> list:
+    # Pandas DataFrame rows to html. The cells are built a column at a time and the rows are
+    # assembled with a single join by the caller.
+    actions, column_buttons = buttons
+    rows = len(df)
+    values_of = __column_values(df)
+    cell_columns = []
+
+    if len(actions) > 0:
+        cell_columns.append(['''<td class="px-6 py-4">''' + "".join(cell) + "</td>" for cell in zip(*(action(values_of, rows) for action in actions))])
+
+    for i, column in enumerate(df.columns):
+        if column in cols_to_show:
+            if i in column_buttons:
+                cell_columns.append(['''<td class="px-6 py-4">''' + cell + "</td>" for cell in column_buttons[i](values_of, rows)])
             else:
-                return string_format_with_more(str(input), 10)
-        elif input < 1000:
-            return '{:.0f}'.format(input)
-        elif input < 1000000:
-            return '{:,.0f}'.format(input)
-        elif input < 1000000000:
-            return '{:.1f} million'.format(input / 1000000)
-        # Check if it's nan
-        elif input != input:
-            return "N/A"
-        else:
-            return '{:.1f} billion'.format(input / 1000000000)
-    elif callable(getattr(input, "isoformat", None)):
-        iso = input.isoformat()
+                cell_columns.append(['''<td class="px-6 py-4">''' + value + "</td>" for value in format_column(__table_column(df, i))])
 
-        if "T00:00:00" in iso:
-            return iso[0:10]
+    # Rows alternate between white and gray, counted from the top of the whole table
+    row_starts = ('''<tr class="bg-white border-b dark:bg-gray-900 dark:border-gray-700">''', '''<tr class="bg-gray-50 border-b dark:bg-gray-800 dark:border-gray-700">''') * (rows // 2 + 2)
+    return list(chain.from_iterable(zip(row_starts[first_row % 2:], *cell_columns, repeat("</tr>", rows))))
 
-        return iso
-    else:
-        formatted_string = str(input)
-        return string_format_with_more(formatted_string, 100)
+def format_input(input):
+    """Formats a single value into a human-readable string. See pycob.formatting for the rules.
 
-def string_format_with_more(text: str, max_length: int) -> str:
-    if len(text) > max_length:
-        return text[0:max_length] + f'... <button data-text-full="{text}" data-text-truncated="{text[0:max_length]}..." onclick="toggleMore(this)" class="text-blue-500">more</button>'
-    else:
-        return text
+    Tables don't call this per cell. They format whole columns with format_column().
+    """
+    return format_value(input)
 
 def __format_python_object_for_json(t):
     if callable(getattr(t, "isoformat", None)):
@@ -204,45 +375,363 @@ def __find_key_in_action_buttons(key: str, action_buttons):
 
     return None
 
-def __replace_text_with_button(record: dict, action_buttons) -> dict:
-    new_record = {}
+def __column_values(df):
+    # Returns a function that gives a column's values by position, converting each column once and
+    # only if it's asked for
+    values = {}
 
-    for key in record.keys():
-        action_button = __find_key_in_action_buttons(key, action_buttons)
+    def values_of(i: int) -> list:
+        if i not in values:
+            values[i] = df.values(i) if isinstance(df, ColumnarTable) else df.iloc[:, i].tolist()
 
-        value = __format_python_object_for_json(record[key])
+        return values[i]
 
-        if action_button is not None:
-            hydrated_label = action_button.label.format(**record)
-            hydrated_url = action_button.url.format(**record)
-            if action_button.open_in_new_window:
-                new_record[key] = """<a href='""" + hydrated_url + """' target="_blank" class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap mr-1">""" + hydrated_label + """</button>"""
-            else:
-                new_record[key] = """<a href='""" + hydrated_url + """' class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap mr-1">""" + hydrated_label + """</button>"""
-        else:
-            new_record[key] = value
-    
-    action_buttons_html = ''
+    return values_of
 
-    action_buttons_to_add = __get_action_buttons_to_add(action_buttons)
-    for button_to_add in action_buttons_to_add:
-        hydrated_label = button_to_add.label.format(**record)
-        hydrated_url = button_to_add.url.format(**record)
+def __compile_row_template(template: str, columns):
+    # Compiles a Rowaction's label or url, e.g. "/edit/{id}", into a function that formats it for every
+    # row at once. Each field is bound to its column's position, so only the referenced columns are read.
+    positions = {column: i for i, column in enumerate(columns)}
+    parts = []
+    fields = []
 
-        if button_to_add.open_in_new_window:
-            action_buttons_html += """<a href='""" + hydrated_url + """' target="_blank" class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap">""" + hydrated_label + """</button>"""
-        else:
-            action_buttons_html += """<a href='""" + hydrated_url + """' class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap">""" + hydrated_label + """</button>"""
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+
+        if field_name is None:
+            continue
+
+        if field_name not in positions or "." in field_name or "[" in field_name or "{" in format_spec:
+            # Attributes, indexes, nested format specs and unknown fields are left to str.format(),
+            # which raises the same errors it always has
+            return lambda values_of, rows: [template.format(**dict(zip(columns, row))) for row in zip(*map(values_of, range(len(columns))))]
+
+        parts.append("{" + str(len(fields)) + ("!" + conversion if conversion else "") + (":" + format_spec if format_spec else "") + "}")
+        fields.append(positions[field_name])
+
+    compiled = "".join(parts)
+
+    if len(fields) == 0:
+        return lambda values_of, rows: [compiled.format()] * rows
 
-    new_record['Actions'] = action_buttons_html
+    return lambda values_of, rows: list(map(compiled.format, *map(values_of, fields)))
 
-    return new_record
+def __compile_rowaction(action_button, columns, spacing: str):
+    label = __compile_row_template(action_button.label, columns)
+    url = __compile_row_template(action_button.url, columns)
+    target = ''' target="_blank"''' if action_button.open_in_new_window else ""
+    link_end = "'" + target + ''' class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap''' + spacing + '">'
 
-def advanced_add_datagrid(page, dataframe, action_buttons):
+    def render(values_of, rows: int) -> list:
+        return ["<a href='" + hydrated_url + link_end + hydrated_label + "</button>" for hydrated_url, hydrated_label in zip(url(values_of, rows), label(values_of, rows))]
+
+    return render
+
+def __compile_action_buttons(columns, cols_to_show, action_buttons, action_spacing: str, column_spacing: str) -> tuple:
+    # Compiles a table's action buttons once, before any rows are rendered. Returns the buttons of the
+    # Actions column and the buttons that replace a shown column's values, by column position.
+    actions = [__compile_rowaction(button, columns, action_spacing) for button in __get_action_buttons_to_add(action_buttons)]
+    column_buttons = {}
+
+    for i, column in enumerate(columns):
+        if column in cols_to_show:
+            action_button = __find_key_in_action_buttons(column, action_buttons)
+
+            if action_button is not None:
+                column_buttons[i] = __compile_rowaction(action_button, columns, column_spacing)
+
+    return actions, column_buttons
+
+def advanced_add_datagrid(page, dataframe, action_buttons, server_side=False):
     if action_buttons is None:
         action_buttons = []
 
-    cols = list(map(lambda x: {'headerName': __format_column_header(x), 'field': x} , dataframe.columns.to_list()))
+    source = dataframe
+    dataframe = __as_table(dataframe)
+
+    if server_side:
+        if __is_chunked(dataframe):
+            raise ValueError("server_side needs a DataFrame. Chunked sources are rendered as they are read.")
+
+        page.components.append(HtmlComponent(__server_side_datagrid(source, dataframe, action_buttons), assets=["ag-grid"]))
+        return
+
+    if __is_chunked(dataframe):
+        page.components.append(HtmlStreamComponent(__stream_datagrid(__iter_chunks(dataframe), action_buttons), assets=["ag-grid"]))
+        return
+
+    datagridHtml = __datagrid_script_start(dataframe, action_buttons)
+
+    datagridHtml += __datagrid_rows_json(dataframe, action_buttons)
+
+    datagridHtml += _DATAGRID_SCRIPT_END
+
+    page.components.append(HtmlComponent(datagridHtml, assets=["ag-grid"]))
+
+def __server_side_datagrid(source, dataframe, action_buttons) -> str:
+    # Only the column definitions are sent with the page. ag-grid's infinite row model asks
+    # /_pycob/datagrid/<id> for each block of rows as the grid scrolls, with its sort and filter models.
+    # Every render of a grid of the same frame shares its dataset. Sorting and filtering are done in
+    # pandas, so Arrow and Polars tables are converted when they are first stored.
+    to_pandas = lambda: (dataframe.table.to_pandas() if isinstance(dataframe, ColumnarTable) else dataframe, action_buttons)
+    grid_id, (dataframe, action_buttons) = __shared_dataset_id(_datagrid_datasets, _datagrid_ids, source, (__action_buttons_identity(action_buttons),), to_pandas)
+    # The grid's element, which is new for every render because the same grid can be on a page twice
+    element_id = str(uuid.uuid4())
+
+    cols = [{'headerName': __format_column_header(column), 'field': column, 'filter': __datagrid_filter(dtype)} for column, dtype in zip(dataframe.columns, dataframe.dtypes)]
+
+    if len(__get_action_buttons_to_add(action_buttons)) > 0:
+        cols.append({'headerName': 'Actions', 'field': 'Actions', 'sortable': False, 'filter': False})
+
+    # Rows of the infinite row model have a fixed height, so cells don't wrap
+    return '''
+        <script>
+        (function() {
+            var columnDefs = ''' + json.dumps(cols) + ''';
+            columnDefs.forEach( (x) => { x.cellRenderer = function(params) { return params.value ? params.value : '' } } );
+
+            var gridOptions = {
+                columnDefs: columnDefs,
+                rowModelType: 'infinite',
+                cacheBlockSize: 100,
+                datasource: {
+                    getRows: function(params) {
+                        fetch('/_pycob/datagrid/''' + grid_id + '''' + window.location.search, {
+                            method: 'POST',
+                            headers: { 'Content-Type': 'application/json' },
+                            body: JSON.stringify({ startRow: params.startRow, endRow: params.endRow, sortModel: params.sortModel, filterModel: params.filterModel })
+                        }).then((response) => {
+                            if (!response.ok) {
+                                throw new Error(response.status);
+                            }
+                            return response.json();
+                        }).then((result) => {
+                            params.successCallback(result.rows, result.lastRow);
+                        }).catch(() => {
+                            params.failCallback();
+                        });
+                    }
+                },
+                defaultColDef: {
+                    sortable: true,
+                    filter: true,
+                    resizable: true,
+                    floatingFilter: true,
+                    autoSizePadding: 10,
+                }
+            };
+
+            function createGrid() {
+                var gridDiv = document.getElementById('divid_aggrid_''' + element_id + '''');
+
+                if (agGrid.createGrid) {
+                    agGrid.createGrid(gridDiv, gridOptions);
+                } else {
+                    new agGrid.Grid(gridDiv, gridOptions);
+                }
+            }
+
+            if (document.readyState === 'loading') {
+                document.addEventListener('DOMContentLoaded', createGrid);
+            } else {
+                createGrid();
+            }
+        })();
+
+        function expand(e) {
+            e.parentElement.children[1].style.height = 'calc( 100vh )';
+            e.scrollIntoView();
+        }
+        </script>
+        <div>
+            <button onclick="expand(this)" class="mb-4 px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800">Expand</button>
+            <div id="divid_aggrid_''' + element_id + '''" style="height: 500px; max-height: calc( 100vh - 60px ); " class="data-grid ag-theme-alpine-dark "></div>
+        </div>
+    '''
+
+def __datagrid_filter(dtype) -> str:
+    # The ag-grid filter for a column, which decides the filter model the server gets
+    kind = getattr(dtype, "kind", "O")
+
+    if kind in "iuf":
+        return 'agNumberColumnFilter'
+
+    if kind == "M":
+        return 'agDateColumnFilter'
+
+    return 'agTextColumnFilter'
+
+def advanced_datagrid_rows(grid_id: str, start: int, end: int, sort_model: list, filter_model: dict):
+    """Returns the JSON for rows start to end of a server-side data grid after sorting and filtering, or None if the grid has expired.
+
+    sort_model and filter_model are ag-grid's. The row positions of each sort and filter are kept, so
+    scrolling through them only slices.
+    """
+    dataset = _datagrid_datasets.get(grid_id)
+
+    if dataset is None:
+        return None
+
+    dataframe, action_buttons = dataset[1]
+    view_key = grid_id + json.dumps([sort_model, filter_model], sort_keys=True)
+    positions = _datagrid_views.get(view_key)
+
+    if positions is None:
+        positions = __datagrid_view(dataframe, sort_model, filter_model)
+        _datagrid_views.set(view_key, positions, positions.nbytes)
+
+    # JSON.parse() doesn't accept NaN, so the rows are encoded strictly
+    rows = __datagrid_rows_json(dataframe.iloc[positions[start:end]], action_buttons, strict=True)
+    return '{"rows": ' + rows + ', "lastRow": ' + str(len(positions)) + '}'
+
+def __datagrid_view(dataframe, sort_model: list, filter_model: dict):
+    # The positions of the rows that pass every column's filter, in sorted order
+    import numpy as np
+    import pandas as pd
+
+    column_positions = {str(column): i for i, column in enumerate(dataframe.columns)}
+    keep = np.ones(len(dataframe), dtype=bool)
+
+    for column, model in filter_model.items():
+        # Filters on the Actions column or on columns that aren't there are ignored
+        if column in column_positions and isinstance(model, dict):
+            keep &= __datagrid_filter_mask(np, pd, dataframe.iloc[:, column_positions[column]], model)
+
+    positions = np.flatnonzero(keep)
+    keys = [(column_positions[sort["colId"]], sort.get("sort") != "desc") for sort in sort_model if sort.get("colId") in column_positions]
+
+    if len(keys) == 0:
+        return positions
+
+    sort_frame = pd.DataFrame({n: dataframe.iloc[positions, i].reset_index(drop=True) for n, (i, _) in enumerate(keys)})
+    ascending = [ascending for _, ascending in keys]
+
+    try:
+        order = sort_frame.sort_values(list(sort_frame.columns), ascending=ascending, kind="stable", na_position="last").index
+    except TypeError:
+        # Object columns whose values can't be compared to each other (e.g. numbers and text) sort as text
+        order = sort_frame.astype(str).sort_values(list(sort_frame.columns), ascending=ascending, kind="stable").index
+
+    return positions[order.to_numpy()]
+
+# ag-grid's number and date filter types
+_FILTER_COMPARISONS = {
+    "equals": operator.eq,
+    "notEqual": operator.ne,
+    "lessThan": operator.lt,
+    "lessThanOrEqual": operator.le,
+    "greaterThan": operator.gt,
+    "greaterThanOrEqual": operator.ge,
+}
+
+def __datagrid_filter_mask(np, pd, column, model: dict):
+    # A column's filter model is either one condition or conditions joined by an operator
+    if "conditions" in model or "condition1" in model:
+        conditions = model.get("conditions") or [model.get("condition1"), model.get("condition2")]
+        masks = [__datagrid_filter_mask(np, pd, column, condition) for condition in conditions if condition]
+
+        if len(masks) == 0:
+            return np.ones(len(column), dtype=bool)
+
+        if model.get("operator") == "OR":
+            return np.logical_or.reduce(masks)
+
+        return np.logical_and.reduce(masks)
+
+    filter_type = model.get("filterType")
+    comparison = model.get("type")
+    missing = column.isna().to_numpy()
+
+    if filter_type == "number":
+        values = pd.to_numeric(column, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        low, high = model.get("filter"), model.get("filterTo")
+    elif filter_type == "date":
+        values = pd.to_datetime(column, errors="coerce")
+
+        if getattr(values.dt, "tz", None) is not None:
+            values = values.dt.tz_localize(None)
+
+        # ag-grid's date filter compares days
+        values = values.dt.normalize().to_numpy()
+
+        try:
+            low, high = [None if model.get(key) is None else np.datetime64(pd.Timestamp(model.get(key)).normalize()) for key in ("dateFrom", "dateTo")]
+        except (TypeError, ValueError, OverflowError):
+            # Dates the client sent that don't parse (pandas' DateParseError is a ValueError) filter nothing
+            return np.ones(len(column), dtype=bool)
+    else:
+        # Text filters are case insensitive, like ag-grid's own
+        text = pd.Series(column.to_numpy(dtype=object)).where(~missing, "").astype(str).str.lower()
+        blank = missing | (text == "").to_numpy()
+        query = str(model.get("filter") or "").lower()
+
+        if comparison == "blank":
+            return blank
+        if comparison == "notBlank":
+            return ~blank
+        if comparison == "contains":
+            return text.str.contains(query, regex=False).to_numpy()
+        if comparison == "notContains":
+            return ~text.str.contains(query, regex=False).to_numpy()
+        if comparison == "equals":
+            return (text == query).to_numpy()
+        if comparison == "notEqual":
+            return (text != query).to_numpy()
+        if comparison == "startsWith":
+            return text.str.startswith(query).to_numpy()
+        if comparison == "endsWith":
+            return text.str.endswith(query).to_numpy()
+
+        return np.ones(len(column), dtype=bool)
+
+    if comparison == "blank":
+        return missing
+    if comparison == "notBlank":
+        return ~missing
+
+    if filter_type == "number":
+        try:
+            low = None if low is None else float(low)
+            high = None if high is None else float(high)
+        except (TypeError, ValueError):
+            return np.ones(len(column), dtype=bool)
+
+    if low is None:
+        return np.ones(len(column), dtype=bool)
+
+    with np.errstate(invalid="ignore"):
+        # Like ag-grid, ranges don't include their ends and blanks are never equal or not equal to anything
+        if comparison == "inRange" and high is not None:
+            return (values > low) & (values < high) & ~missing
+
+        if comparison in _FILTER_COMPARISONS:
+            return _FILTER_COMPARISONS[comparison](values, low) & ~missing
+
+    return np.ones(len(column), dtype=bool)
+
+def __stream_datagrid(chunks, action_buttons):
+    # The rows are written into the script's rowData array a chunk at a time, so only one chunk is in
+    # memory at a time
+    started = False
+    empty = True
+
+    for dataframe in chunks:
+        if not started:
+            started = True
+            yield __datagrid_script_start(dataframe, action_buttons) + "["
+
+        records = __datagrid_rows_json(dataframe, action_buttons)[1:-1]
+
+        if records != "":
+            yield records if empty else ", " + records
+            empty = False
+
+    if started:
+        yield "]" + _DATAGRID_SCRIPT_END
+
+def __datagrid_script_start(dataframe, action_buttons) -> str:
+    # The script up to the rowData array
+    cols = list(map(lambda x: {'headerName': __format_column_header(x), 'field': x} , list(dataframe.columns)))
 
     if len(__get_action_buttons_to_add(action_buttons)) > 0:
         cols.append({'headerName': 'Actions', 'field': 'Actions'})
@@ -252,17 +741,73 @@ def advanced_add_datagrid(page, dataframe, action_buttons):
         var columnDefsasdf = {columns};
         '''.format(columns = cols)
 
-    records = list (map(lambda x: __replace_text_with_button(x, action_buttons=action_buttons), dataframe.to_dict(orient='records')))
-
     datagridHtml += '''
     columnDefsasdf.forEach( (x) => { x.cellRenderer = function(params) { return params.value ? params.value : '' } } )
     '''
 
     datagridHtml += '''
-        var rowDataasdf = {records};
-        '''.format(records = json.dumps( records ) )
+        var rowDataasdf = '''
 
-    datagridHtml += '''
+    return datagridHtml
+
+def __datagrid_rows_json(dataframe, action_buttons, strict: bool = False) -> str:
+    # The rows as a JSON array of objects, encoded a column at a time without a dict per row
+    columns = list(dataframe.columns)
+
+    if isinstance(dataframe, ColumnarTable):
+        shown_values = list(map(partial(__datagrid_columnar_values, dataframe), range(len(columns))))
+    else:
+        shown_values = __datagrid_dataframe_values(dataframe)
+
+    # Action buttons replace the values of their columns and fill the Actions column, which is empty without any
+    actions, column_buttons = __compile_action_buttons(columns, columns, action_buttons, "", " mr-1")
+    rows = len(dataframe)
+    values_of = __column_values(dataframe)
+
+    for i, render in column_buttons.items():
+        shown_values[i] = render(values_of, rows)
+
+    if len(actions) > 0:
+        shown_values.append(["".join(cell) for cell in zip(*(action(values_of, rows) for action in actions))])
+    else:
+        shown_values.append([""] * rows)
+
+    return encode_records(columns + ['Actions'], shown_values, strict)
+
+def __datagrid_columnar_values(dataframe, i: int):
+    # The values to send for a column of an Arrow or Polars table. Numbers and booleans without nulls are
+    # encoded straight from their buffers, dates are sent as ISO strings and the rest as Python values.
+    if dataframe.is_temporal(i):
+        return format_column(dataframe.column(i))
+
+    values = dataframe.to_numpy(i)
+
+    if values is None:
+        return dataframe.values(i)
+
+    return values
+
+def __datagrid_dataframe_values(dataframe) -> list:
+    # The values to send for each column of a pandas DataFrame. Datetime columns are sent as ISO strings,
+    # formatted a column at a time. Numbers and booleans are encoded straight from their NumPy arrays.
+    # Dates and durations in other columns are converted one by one.
+    shown_values = []
+
+    for i, dtype in enumerate(dataframe.dtypes):
+        column = dataframe.iloc[:, i]
+
+        if dtype.kind == 'M':
+            shown_values.append(format_column(column))
+        elif dtype.kind in 'iufb' and not hasattr(dtype, 'numpy_dtype'):
+            # NumPy dtypes. Nullable and Arrow-backed ones have a numpy_dtype and missing values that NumPy doesn't.
+            shown_values.append(column.to_numpy())
+        else:
+            shown_values.append(list(map(__format_python_object_for_json, column.tolist())))
+
+    return shown_values
+
+_DATAGRID_SCRIPT_END = ''';
+        
         var gridOptionsasdf = {
             columnDefs: columnDefsasdf,
             rowData: rowDataasdf,
@@ -296,5 +841,4 @@ def advanced_add_datagrid(page, dataframe, action_buttons):
         </div>
     '''
 
-    page.components.append(HtmlComponent(datagridHtml))
 
@@ -1,6 +1,9 @@
 from __future__ import annotations
 from .component_interface import *
+from .cache import RenderCache
 import uuid
+import weakref
+from .request import _page_access
 
 
 
@@ -9,6 +12,7 @@ class AlertComponent(Component):
   
   Instead, use the `Page.add_alert` method of the parent component.
   """
+  __slots__ = ('text', 'badge', 'color')
   def __init__(self, text: str, badge: str = '', color: str = 'indigo'):    
     self.text = text
     self.badge = badge
@@ -21,11 +25,10 @@ class AlertComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="text-center py-4 lg:px-4">
-<div class="p-2 bg-''' + self.color + '''-800 items-center text-''' + self.color + '''-100 leading-none lg:rounded-full flex lg:inline-flex" role="alert">
-    <span class="flex rounded-full bg-''' + self.color + '''-500 uppercase px-2 py-1 text-xs font-bold mr-3">''' + self.badge + '''</span>
-    <span class="font-semibold mr-2 text-left flex-auto">''' + self.text + '''</span>            
+  _template = '''<div class="text-center py-4 lg:px-4">
+<div class="p-2 bg-{{color}}-800 items-center text-{{color}}-100 leading-none lg:rounded-full flex lg:inline-flex" role="alert">
+    <span class="flex rounded-full bg-{{color}}-500 uppercase px-2 py-1 text-xs font-bold mr-3">{{badge}}</span>
+    <span class="font-semibold mr-2 text-left flex-auto">{{text}}</span>            
 </div>
 </div>'''
 
@@ -34,6 +37,7 @@ class CardComponent(Component):
   
   Instead, use the `Page.add_card` method of the parent component.
   """
+  __slots__ = ('center_content', 'classes', 'components')
   def __init__(self, center_content: bool = False, classes: str = '', components: list = None):    
     self.center_content = center_content
     self.classes = classes
@@ -47,10 +51,9 @@ class CardComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="block p-6 mb-6 bg-white border border-gray-200 rounded-lg shadow-md hover:bg-gray-100 dark:bg-gray-800 dark:border-gray-700 dark:hover:bg-gray-700 overflow-x-auto max-w-fit mx-auto ''' + self.classes + '''">
+  _template = '''<div class="block p-6 mb-6 bg-white border border-gray-200 rounded-lg shadow-md hover:bg-gray-100 dark:bg-gray-800 dark:border-gray-700 dark:hover:bg-gray-700 overflow-x-auto max-w-fit mx-auto {{classes}}">
     <div class="flex flex-col h-full ">
-        ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+        {{components}} 
     </div>
 </div>'''
 
@@ -61,16 +64,17 @@ class CardComponent(Component):
   def add_component(self, component):
     self.components.append(component)
     return self
-  def add_html(self, value: str) -> HtmlComponent:
+  def add_html(self, value: str, assets: list = None) -> HtmlComponent:
     """Renders raw HTML
 
     Args:
         value (str): Raw HTML code to be rendered
+        assets (list): Optional. Client libraries the HTML needs, e.g. ["plotly"], or URLs of scripts to load
     
     Returns:
         HtmlComponent: The new component
     """
-    new_component = HtmlComponent(value)    
+    new_component = HtmlComponent(value, assets)    
     self.components.append(new_component)
     return new_component
     
@@ -374,18 +378,19 @@ class CardComponent(Component):
     
 
 
-  def add_pandastable(self, dataframe, hide_fields: list = [], action_buttons: list = None):
+  def add_pandastable(self, dataframe, hide_fields: list = [], action_buttons: list = None, page_size: int = None):
     """Renders a pandas table
 
     Args:
-        dataframe: Dataframe to render
+        dataframe: pandas or Polars DataFrame or pyarrow Table to render. Also takes an iterator of chunks (e.g. pd.read_csv(..., chunksize=...)) or a SQLAlchemy result, whose rows are rendered as they are read. Chunks after the first (10,000 rows of a SQL result) are read while the page is sent, so the connection must stay open until the response is done
         hide_fields (list): List of fields to hide
         action_buttons (list): Row actions to render
+        page_size (int): Optional. Number of rows to render into the page. The rest are loaded from the server as the user asks for them. Defaults to rendering every row. Needs a DataFrame
     
     Returns:
         PandastableComponent: The new component
     """
-    advanced_add_pandastable(self, dataframe, hide_fields, action_buttons)
+    advanced_add_pandastable(self, dataframe, hide_fields, action_buttons, page_size)
     return self
     
 
@@ -405,17 +410,18 @@ class CardComponent(Component):
     
 
 
-  def add_datagrid(self, dataframe, action_buttons: list = None):
+  def add_datagrid(self, dataframe, action_buttons: list = None, server_side: bool = False):
     """Renders a data grid
 
     Args:
-        dataframe: Dataframe to render
+        dataframe: pandas or Polars DataFrame or pyarrow Table to render. Also takes an iterator of chunks (e.g. pd.read_csv(..., chunksize=...)) or a SQLAlchemy result, whose rows are rendered as they are read. Chunks after the first (10,000 rows of a SQL result) are read while the page is sent, so the connection must stay open until the response is done
         action_buttons (list): Row actions to render
+        server_side (bool): Optional. Only send the column definitions with the page. The grid loads rows from the server as it scrolls, sorted and filtered there. Needs a DataFrame
     
     Returns:
         DatagridComponent: The new component
     """
-    advanced_add_datagrid(self, dataframe, action_buttons)
+    advanced_add_datagrid(self, dataframe, action_buttons, server_side)
     return self
     
 
@@ -448,11 +454,43 @@ class CardComponent(Component):
     return new_component
     
 
+  def add_lazy(self, func, placeholder: str = '') -> LazyComponent:
+    """Renders a placeholder right away and loads the component returned by func after the page has loaded
+
+    Args:
+        func: Function that takes the server request and returns the component to render
+        placeholder (str): Optional. HTML to show until the component has loaded
+    
+    Returns:
+        LazyComponent: The new component
+    """
+    new_component = LazyComponent(func, placeholder)    
+    self.components.append(new_component)
+    return new_component
+    
+
+  def add_fragment(self, id: str, classes: str = '', components: list = None) -> FragmentComponent:
+    """Adds a container that can be re-rendered on its own. Forms inside it are submitted in the background and only the fragment is replaced with the response
+
+    Args:
+        id (str): Id of the fragment. Must be unique within the page
+        classes (str): Optional. Classes to add to the fragment
+        components (list): Optional. List of components to add to the fragment
+    
+    Returns:
+        FragmentComponent: The new component
+    """
+    new_component = FragmentComponent(id, classes, components)    
+    self.components.append(new_component)
+    return new_component
+    
+
 class CodeComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_code` method of the parent component.
   """
+  __slots__ = ('value', 'header', 'prefix')
   def __init__(self, value: str, header: str = '', prefix: str = '>>>'):    
     self.value = value
     self.header = header
@@ -466,17 +504,16 @@ class CodeComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="mx-auto my-10 max-w-3xl">
+  _template = '''<div class="mx-auto my-10 max-w-3xl">
     <div class="flex h-11 w-full items-center justify-start space-x-1.5 rounded-t-lg bg-gray-900 px-3">
         <span class="h-3 w-3 rounded-full bg-red-400"></span>
         <span class="h-3 w-3 rounded-full bg-yellow-400"></span>
         <span class="h-3 w-3 rounded-full bg-green-400"></span>
-        <code class="pl-5 text-lime-500">''' + self.header + '''</code>
+        <code class="pl-5 text-lime-500">{{header}}</code>
     </div>
     <div class="w-full border-t-0 bg-gray-700 pb-5 rounded-b-lg whitespace-nowrap overflow-x-scroll p-2">
-        <code class="text-gray-500">''' + self.prefix + '''</code>
-        <code class="text-white" style="white-space: break-spaces">''' + self.value + '''</code>
+        <code class="text-gray-500">{{prefix}}</code>
+        <code class="text-white" style="white-space: break-spaces">{{value}}</code>
     </div>
 </div>'''
 
@@ -485,6 +522,8 @@ class CodeeditorComponent(Component):
   
   Instead, use the `Page.add_codeeditor` method of the parent component.
   """
+  __slots__ = ('value', 'language')
+  assets = ('ace',)
   def __init__(self, value: str, language: str = 'python'):    
     self.value = value
     self.language = language
@@ -496,8 +535,7 @@ class CodeeditorComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<style type="text/css" media="screen">
+  _template = '''<style type="text/css" media="screen">
 #editorContainer {
     // width: calc( 100vw - 40px );
     height: 500px;
@@ -515,13 +553,12 @@ class CodeeditorComponent(Component):
 </style>
 
 <div id="editorContainer">
-    <div id="editor">''' + self.value + '''</div> 
+    <div id="editor">{{value}}</div> 
 </div>
-<script src="https://cdn.jsdelivr.net/gh/ajaxorg/ace-builds/src-noconflict/ace.js" type="text/javascript" charset="utf-8"></script>
 <script>
     var editor = ace.edit("editor");
     editor.setTheme("ace/theme/monokai");
-    editor.session.setMode("ace/mode/''' + self.language + '''");
+    editor.session.setMode("ace/mode/{{language}}");
 
     // const savedCode = localStorage.getItem('code');
 
@@ -535,6 +572,7 @@ class ContainerComponent(Component):
   
   Instead, use the `Page.add_container` method of the parent component.
   """
+  __slots__ = ('grid_columns', 'classes', 'components')
   def __init__(self, grid_columns: int = None, classes: str = '', components: list = None):    
     self.grid_columns = grid_columns
     self.classes = classes
@@ -549,9 +587,8 @@ class ContainerComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class=" ''' + self.classes + '''">
-    ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+  _template = '''<div class=" {{classes}}">
+    {{components}} 
 </div>'''
 
   def add(self, component):
@@ -561,16 +598,17 @@ class ContainerComponent(Component):
   def add_component(self, component):
     self.components.append(component)
     return self
-  def add_html(self, value: str) -> HtmlComponent:
+  def add_html(self, value: str, assets: list = None) -> HtmlComponent:
     """Renders raw HTML
 
     Args:
         value (str): Raw HTML code to be rendered
+        assets (list): Optional. Client libraries the HTML needs, e.g. ["plotly"], or URLs of scripts to load
     
     Returns:
         HtmlComponent: The new component
     """
-    new_component = HtmlComponent(value)    
+    new_component = HtmlComponent(value, assets)    
     self.components.append(new_component)
     return new_component
     
@@ -876,11 +914,43 @@ class ContainerComponent(Component):
     return new_component
     
 
+  def add_lazy(self, func, placeholder: str = '') -> LazyComponent:
+    """Renders a placeholder right away and loads the component returned by func after the page has loaded
+
+    Args:
+        func: Function that takes the server request and returns the component to render
+        placeholder (str): Optional. HTML to show until the component has loaded
+    
+    Returns:
+        LazyComponent: The new component
+    """
+    new_component = LazyComponent(func, placeholder)    
+    self.components.append(new_component)
+    return new_component
+    
+
+  def add_fragment(self, id: str, classes: str = '', components: list = None) -> FragmentComponent:
+    """Adds a container that can be re-rendered on its own. Forms inside it are submitted in the background and only the fragment is replaced with the response
+
+    Args:
+        id (str): Id of the fragment. Must be unique within the page
+        classes (str): Optional. Classes to add to the fragment
+        components (list): Optional. List of components to add to the fragment
+    
+    Returns:
+        FragmentComponent: The new component
+    """
+    new_component = FragmentComponent(id, classes, components)    
+    self.components.append(new_component)
+    return new_component
+    
+
 class DividerComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_divider` method of the parent component.
   """
+  __slots__ = ()
   def __init__(self):    
     pass
     
@@ -891,14 +961,14 @@ class DividerComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<hr class="my-5 border-gray-300 w-full">'''
+  _template = '''<hr class="my-5 border-gray-300 w-full">'''
 
 class FooterComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_footer` method of the parent component.
   """
+  __slots__ = ('title', 'subtitle', 'logo', 'components')
   def __init__(self, title: str, subtitle: str = '', logo: str = '', components: list = None):    
     self.title = title
     self.subtitle = subtitle
@@ -913,15 +983,14 @@ class FooterComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<footer class="text-gray-600 body-font">
+  _template = '''<footer class="text-gray-600 body-font">
     <div class="container px-5 mx-auto flex md:items-center lg:items-start md:flex-row md:flex-nowrap flex-wrap flex-col">
         <div class="w-64 flex-shrink-0 md:mx-0 mx-auto text-center md:text-left">
-            <a class="flex title-font font-medium items-center md:justify-start justify-center text-gray-900 dark:text-white"><img class="object-scale-down h-10" src="''' + self.logo + '''"><span class="ml-3 text-xl">''' + self.title + '''</span></a>
-            <p class="mt-2 text-sm text-gray-500">''' + self.subtitle + '''</p>
+            <a class="flex title-font font-medium items-center md:justify-start justify-center text-gray-900 dark:text-white"><img class="object-scale-down h-10" src="{{logo}}"><span class="ml-3 text-xl">{{title}}</span></a>
+            <p class="mt-2 text-sm text-gray-500">{{subtitle}}</p>
         </div>
         <div class="flex-grow flex flex-wrap md:pl-20 -mb-10 md:mt-0 mt-10 md:text-left text-center">
-            ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+            {{components}} 
         </div>
     </div>
 </footer>'''
@@ -953,6 +1022,7 @@ class FootercategoryComponent(Component):
   
   Instead, use the `Page.add_footercategory` method of the parent component.
   """
+  __slots__ = ('title', 'components')
   def __init__(self, title: str, components: list = None):    
     self.title = title
     # https://stackoverflow.com/questions/4841782/python-constructor-and-default-value
@@ -965,11 +1035,10 @@ class FootercategoryComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="lg:w-1/4 md:w-1/2 w-full px-4">
-    <h2 class="title-font font-medium text-gray-900 dark:text-white tracking-widest text-sm mb-3 uppercase">''' + self.title + '''</h2>
+  _template = '''<div class="lg:w-1/4 md:w-1/2 w-full px-4">
+    <h2 class="title-font font-medium text-gray-900 dark:text-white tracking-widest text-sm mb-3 uppercase">{{title}}</h2>
     <nav class="list-none mb-10">
-        ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+        {{components}} 
     </nav>
 </div>'''
 
@@ -1000,6 +1069,7 @@ class FooterlinkComponent(Component):
   
   Instead, use the `Page.add_footerlink` method of the parent component.
   """
+  __slots__ = ('title', 'url')
   def __init__(self, title: str, url: str):    
     self.title = title
     self.url = url
@@ -1011,14 +1081,14 @@ class FooterlinkComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<li><a href="''' + self.url + '''" class="text-gray-600 hover:text-gray-800 dark:hover:text-white">''' + self.title + '''</a></li>'''
+  _template = '''<li><a href="{{url}}" class="text-gray-600 hover:text-gray-800 dark:hover:text-white">{{title}}</a></li>'''
 
 class FormComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_form` method of the parent component.
   """
+  __slots__ = ('action', 'method', 'components')
   def __init__(self, action: str = '?', method: str = 'GET', components: list = None):    
     self.action = action
     self.method = method
@@ -1032,9 +1102,8 @@ class FormComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<form class="max-w-full" style="width: 500px" onsubmit="setLoading(this)" action="''' + self.action + '''" method="''' + self.method + '''">
-    ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+  _template = '''<form class="max-w-full" style="width: 500px" onsubmit="setLoading(this)" action="{{action}}" method="{{method}}">
+    {{components}} 
 </form>'''
 
   def add(self, component):
@@ -1269,6 +1338,7 @@ class FormemailComponent(Component):
   
   Instead, use the `Page.add_formemail` method of the parent component.
   """
+  __slots__ = ('label', 'name', 'placeholder')
   def __init__(self, label: str = 'Your E-mail', name: str = 'email', placeholder: str = 'user@example.com'):    
     self.label = label
     self.name = name
@@ -1281,10 +1351,9 @@ class FormemailComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="mb-6">
-    <label for="''' + self.name + '''" class="block mb-2 text-sm font-medium text-gray-900 dark:text-white">''' + self.label + '''</label>
-    <input type="email" name="''' + self.name + '''" class="bg-gray-50 border border-gray-300 text-gray-900 text-sm rounded-lg focus:ring-blue-500 focus:border-blue-500 block w-full p-2.5 dark:bg-gray-700 dark:border-gray-600 dark:placeholder-gray-400 dark:text-white dark:focus:ring-blue-500 dark:focus:border-blue-500" placeholder="''' + self.placeholder + '''" required>
+  _template = '''<div class="mb-6">
+    <label for="{{name}}" class="block mb-2 text-sm font-medium text-gray-900 dark:text-white">{{label}}</label>
+    <input type="email" name="{{name}}" class="bg-gray-50 border border-gray-300 text-gray-900 text-sm rounded-lg focus:ring-blue-500 focus:border-blue-500 block w-full p-2.5 dark:bg-gray-700 dark:border-gray-600 dark:placeholder-gray-400 dark:text-white dark:focus:ring-blue-500 dark:focus:border-blue-500" placeholder="{{placeholder}}" required>
 </div>'''
 
 class FormhiddenComponent(Component):
@@ -1292,6 +1361,7 @@ class FormhiddenComponent(Component):
   
   Instead, use the `Page.add_formhidden` method of the parent component.
   """
+  __slots__ = ('name', 'value')
   def __init__(self, name: str, value: str):    
     self.name = name
     self.value = value
@@ -1303,14 +1373,14 @@ class FormhiddenComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<input type="hidden" name="''' + self.name + '''" value="''' + self.value + '''">'''
+  _template = '''<input type="hidden" name="{{name}}" value="{{value}}">'''
 
 class FormpasswordComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_formpassword` method of the parent component.
   """
+  __slots__ = ('label', 'name', 'placeholder')
   def __init__(self, label: str = 'Password', name: str = 'password', placeholder: str = 'password'):    
     self.label = label
     self.name = name
@@ -1323,10 +1393,9 @@ class FormpasswordComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="mb-6">
-    <label for="''' + self.name + '''" class="block mb-2 text-sm font-medium text-gray-900 dark:text-white">''' + self.label + '''</label>
-    <input type="password" name="''' + self.name + '''" class="bg-gray-50 border border-gray-300 text-gray-900 text-sm rounded-lg focus:ring-blue-500 focus:border-blue-500 block w-full p-2.5 dark:bg-gray-700 dark:border-gray-600 dark:placeholder-gray-400 dark:text-white dark:focus:ring-blue-500 dark:focus:border-blue-500" placeholder="''' + self.placeholder + '''" required>
+  _template = '''<div class="mb-6">
+    <label for="{{name}}" class="block mb-2 text-sm font-medium text-gray-900 dark:text-white">{{label}}</label>
+    <input type="password" name="{{name}}" class="bg-gray-50 border border-gray-300 text-gray-900 text-sm rounded-lg focus:ring-blue-500 focus:border-blue-500 block w-full p-2.5 dark:bg-gray-700 dark:border-gray-600 dark:placeholder-gray-400 dark:text-white dark:focus:ring-blue-500 dark:focus:border-blue-500" placeholder="{{placeholder}}" required>
 </div>'''
 
 class FormselectComponent(Component):
@@ -1334,6 +1403,7 @@ class FormselectComponent(Component):
   
   Instead, use the `Page.add_formselect` method of the parent component.
   """
+  __slots__ = ('label', 'name', 'options', 'value', 'components')
   def __init__(self, label: str, name: str, options, value: str = ''):    
     self.label = label
     self.name = name
@@ -1362,11 +1432,10 @@ class FormselectComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="mb-6">
-    <label for="''' + self.name + '''" class="block mb-2 text-sm font-medium text-gray-900 dark:text-white">''' + self.label + '''</label>
-    <select id="''' + self.name + '''" name="''' + self.name + '''" class="bg-gray-50 border border-gray-300 text-gray-900 text-sm rounded-lg focus:ring-blue-500 focus:border-blue-500 block w-full p-2.5 dark:bg-gray-700 dark:border-gray-600 dark:placeholder-gray-400 dark:text-white dark:focus:ring-blue-500 dark:focus:border-blue-500">
-        ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+  _template = '''<div class="mb-6">
+    <label for="{{name}}" class="block mb-2 text-sm font-medium text-gray-900 dark:text-white">{{label}}</label>
+    <select id="{{name}}" name="{{name}}" class="bg-gray-50 border border-gray-300 text-gray-900 text-sm rounded-lg focus:ring-blue-500 focus:border-blue-500 block w-full p-2.5 dark:bg-gray-700 dark:border-gray-600 dark:placeholder-gray-400 dark:text-white dark:focus:ring-blue-500 dark:focus:border-blue-500">
+        {{components}} 
     </select>
 </div>'''
 
@@ -1391,6 +1460,7 @@ class FormsubmitComponent(Component):
   
   Instead, use the `Page.add_formsubmit` method of the parent component.
   """
+  __slots__ = ('label',)
   def __init__(self, label: str = 'Submit'):    
     self.label = label
     
@@ -1401,14 +1471,14 @@ class FormsubmitComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<button type="submit" class="text-white bg-blue-700 hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 font-medium rounded-lg text-sm w-full sm:w-auto px-5 py-2.5 text-center dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800">''' + self.label + '''</button>'''
+  _template = '''<button type="submit" class="text-white bg-blue-700 hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 font-medium rounded-lg text-sm w-full sm:w-auto px-5 py-2.5 text-center dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800">{{label}}</button>'''
 
 class FormtextComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_formtext` method of the parent component.
   """
+  __slots__ = ('label', 'name', 'placeholder', 'value')
   def __init__(self, label: str, name: str, placeholder: str = '', value: str = ''):    
     self.label = label
     self.name = name
@@ -1422,10 +1492,9 @@ class FormtextComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="mb-6">
-    <label for="''' + self.name + '''" class="block mb-2 text-sm font-medium text-gray-900 dark:text-white">''' + self.label + '''</label>
-    <input type="text" name="''' + self.name + '''" value="''' + self.value + '''" class="bg-gray-50 border border-gray-300 text-gray-900 text-sm rounded-lg focus:ring-blue-500 focus:border-blue-500 block w-full p-2.5 dark:bg-gray-700 dark:border-gray-600 dark:placeholder-gray-400 dark:text-white dark:focus:ring-blue-500 dark:focus:border-blue-500" placeholder="''' + self.placeholder + '''" required>
+  _template = '''<div class="mb-6">
+    <label for="{{name}}" class="block mb-2 text-sm font-medium text-gray-900 dark:text-white">{{label}}</label>
+    <input type="text" name="{{name}}" value="{{value}}" class="bg-gray-50 border border-gray-300 text-gray-900 text-sm rounded-lg focus:ring-blue-500 focus:border-blue-500 block w-full p-2.5 dark:bg-gray-700 dark:border-gray-600 dark:placeholder-gray-400 dark:text-white dark:focus:ring-blue-500 dark:focus:border-blue-500" placeholder="{{placeholder}}" required>
 </div>'''
 
 class FormtextareaComponent(Component):
@@ -1433,6 +1502,7 @@ class FormtextareaComponent(Component):
   
   Instead, use the `Page.add_formtextarea` method of the parent component.
   """
+  __slots__ = ('label', 'name', 'placeholder', 'value')
   def __init__(self, label: str = 'Your Message', name: str = 'message', placeholder: str = 'Leave a comment...', value: str = ''):    
     self.label = label
     self.name = name
@@ -1446,17 +1516,34 @@ class FormtextareaComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="mb-6">
-    <label for="''' + self.name + '''" class="block mb-2 text-sm font-medium text-gray-900 dark:text-white">''' + self.label + '''</label>
-    <textarea name="''' + self.name + '''" rows="4" class="block p-2.5 w-full text-sm text-gray-900 bg-gray-50 rounded-lg border border-gray-300 focus:ring-blue-500 focus:border-blue-500 dark:bg-gray-700 dark:border-gray-600 dark:placeholder-gray-400 dark:text-white dark:focus:ring-blue-500 dark:focus:border-blue-500" placeholder="''' + self.placeholder + '''">''' + self.value + '''</textarea>
+  _template = '''<div class="mb-6">
+    <label for="{{name}}" class="block mb-2 text-sm font-medium text-gray-900 dark:text-white">{{label}}</label>
+    <textarea name="{{name}}" rows="4" class="block p-2.5 w-full text-sm text-gray-900 bg-gray-50 rounded-lg border border-gray-300 focus:ring-blue-500 focus:border-blue-500 dark:bg-gray-700 dark:border-gray-600 dark:placeholder-gray-400 dark:text-white dark:focus:ring-blue-500 dark:focus:border-blue-500" placeholder="{{placeholder}}">{{value}}</textarea>
 </div>'''
 
+class FragmentComponent(ContainerComponent):
+  """You don't normally need to invoke this constructor directly.
+  
+  Instead, use the `Page.add_fragment` method of the parent component.
+  """
+  __slots__ = ('id',)
+  def __init__(self, id: str, classes: str = '', components: list = None):    
+    super().__init__(classes=classes, components=components)
+    self.id = id
+
+  _template = '''<div id="{{id}}" data-pycob-fragment class=" {{classes}}">
+    {{components}} 
+</div>'''
+
+  def find_fragment(self, id: str):
+    return self if self.id == id else super().find_fragment(id)
+
 class HeaderComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_header` method of the parent component.
   """
+  __slots__ = ('text', 'size', 'classes')
   def __init__(self, text: str, size: int = 5, classes: str = ''):    
     self.text = text
     self.size = size
@@ -1488,17 +1575,17 @@ class HeaderComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<p class="mb-4 font-extrabold leading-none tracking-tight text-gray-900 dark:text-white ''' + self.classes + ''' ">''' + self.text + '''</p>'''
+  _template = '''<p class="mb-4 font-extrabold leading-none tracking-tight text-gray-900 dark:text-white {{classes}} ">{{text}}</p>'''
 
 class HtmlComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_html` method of the parent component.
   """
-  def __init__(self, value: str):    
+  __slots__ = ('value', 'assets')
+  def __init__(self, value: str, assets: list = None):    
     self.value = value
-    
+    self.assets = tuple(assets or ())
 
   def __enter__(self):
     return self
@@ -1506,14 +1593,14 @@ class HtmlComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''''' + self.value + ''''''
+  _template = '''{{value}}'''
 
 class ImageComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_image` method of the parent component.
   """
+  __slots__ = ('url', 'alt', 'classes')
   def __init__(self, url: str, alt: str, classes: str = ''):    
     self.url = url
     self.alt = alt
@@ -1526,14 +1613,45 @@ class ImageComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<img class="max-w-fit h-auto rounded-lg ''' + self.classes + ''' " src="''' + self.url + '''" alt="''' + self.alt + '''">'''
+  _template = '''<img class="max-w-fit h-auto rounded-lg {{classes}} " src="{{url}}" alt="{{alt}}">'''
+
+class LazyComponent(Component):
+  """You don't normally need to invoke this constructor directly.
+  
+  Instead, use the `Page.add_lazy` method of the parent component.
+  """
+  __slots__ = ('func', 'placeholder', 'id', '_access', '__weakref__')
+  # Functions of lazy components rendered recently, by id, with the access rule of the page that made them.
+  # Served by the /_pycob/fragment/<id> route. Each request for a fragment keeps it for another ttl.
+  fragments = RenderCache(ttl=600, max_entries=4096, sliding=True)
+  # Lazy components that are still around, by id. Those in a frozen subtree or a cached page are served
+  # for as long as it exists, even after their function has left fragments.
+  live = weakref.WeakValueDictionary()
+
+  def __init__(self, func, placeholder: str = ''):    
+    self.func = func
+    self.placeholder = placeholder
+    self.id = str(uuid.uuid4())
+    if placeholder == "":
+        self.placeholder = '<div class="animate-pulse h-24 mb-6 rounded-lg bg-gray-200 dark:bg-gray-700"></div>'
+    self._access = _page_access.get()
+    LazyComponent.fragments.set(self.id, (func, self._access))
+    LazyComponent.live[self.id] = self
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    pass
+
+  _template = '''<div data-pycob-lazy="{{id}}">{{placeholder}}</div>'''
 
 class LinkComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_link` method of the parent component.
   """
+  __slots__ = ('text', 'url', 'classes')
   def __init__(self, text: str, url: str, classes: str = ''):    
     self.text = text
     self.url = url
@@ -1546,10 +1664,9 @@ class LinkComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<p class="text-gray-500 dark:text-gray-400 ''' + self.classes + '''">
-    <a href="''' + self.url + '''" class="inline-flex items-center font-medium text-blue-600 dark:text-blue-500 hover:underline">
-    ''' + self.text + '''
+  _template = '''<p class="text-gray-500 dark:text-gray-400 {{classes}}">
+    <a href="{{url}}" class="inline-flex items-center font-medium text-blue-600 dark:text-blue-500 hover:underline">
+    {{text}}
     <svg aria-hidden="true" class="w-5 h-5 ml-1" fill="currentColor" viewBox="0 0 20 20" xmlns="http://www.w3.org/2000/svg"><path fill-rule="evenodd" d="M12.293 5.293a1 1 0 011.414 0l4 4a1 1 0 010 1.414l-4 4a1 1 0 01-1.414-1.414L14.586 11H3a1 1 0 110-2h11.586l-2.293-2.293a1 1 0 010-1.414z" clip-rule="evenodd"></path></svg>
     </a>
 </p>'''
@@ -1559,6 +1676,7 @@ class ListComponent(Component):
   
   Instead, use the `Page.add_list` method of the parent component.
   """
+  __slots__ = ('show_dots', 'classes', 'components')
   def __init__(self, show_dots: bool = True, classes: str = '', components: list = None):    
     self.show_dots = show_dots
     self.classes = classes
@@ -1575,9 +1693,8 @@ class ListComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<ul class="max-w-md space-y-1 text-gray-500 list-inside dark:text-gray-400 ''' + self.classes + '''">
-    ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+  _template = '''<ul class="max-w-md space-y-1 text-gray-500 list-inside dark:text-gray-400 {{classes}}">
+    {{components}} 
 </ul>'''
 
   def add(self, component):
@@ -1609,6 +1726,7 @@ class ListitemComponent(Component):
   
   Instead, use the `Page.add_listitem` method of the parent component.
   """
+  __slots__ = ('value', 'classes', 'svg', 'is_checked')
   def __init__(self, value: str, classes: str = '', svg: str = '', is_checked: bool = None):    
     self.value = value
     self.classes = classes
@@ -1626,10 +1744,9 @@ class ListitemComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<li class="flex items-center ''' + self.classes + '''">
-    ''' + self.svg + '''
-    ''' + self.value + '''
+  _template = '''<li class="flex items-center {{classes}}">
+    {{svg}}
+    {{value}}
 </li>'''
 
 class NavbarComponent(Component):
@@ -1637,6 +1754,7 @@ class NavbarComponent(Component):
   
   Instead, use the `Page.add_navbar` method of the parent component.
   """
+  __slots__ = ('title', 'logo', 'button_label', 'button_url', 'button_svg', 'components')
   def __init__(self, title: str, logo: str = '', button_label: str = 'Sign In', button_url: str = '/auth/login', button_svg: str = '', components: list = None):    
     self.title = title
     self.logo = logo
@@ -1657,8 +1775,7 @@ class NavbarComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<script>
+  _template = '''<script>
     function toggleNav() {
         var nav = document.getElementById("navbar-sticky");
         if (nav.classList.contains("hidden")) {
@@ -1671,16 +1788,16 @@ class NavbarComponent(Component):
 <nav class="gradient-background top-0 left-0 z-20 w-full bg-white px-2 py-2.5 dark:border-gray-600 sm:px-4">
     <div class="container mx-auto flex flex-wrap items-center justify-between">
       <a href="/" class="flex items-center">
-        <img src="''' + self.logo + '''" class="mr-3 h-6 sm:h-9" style="filter: brightness(0) invert(1);" alt="Logo" />
-        <span class="self-center whitespace-nowrap md:text-4xl font-semibold text-white">''' + self.title + '''</span>
+        <img src="{{logo}}" class="mr-3 h-6 sm:h-9" style="filter: brightness(0) invert(1);" alt="Logo" />
+        <span class="self-center whitespace-nowrap md:text-4xl font-semibold text-white">{{title}}</span>
       </a>
       <div class="flex md:order-2">
         <button onclick="toggleDarkMode()" type="button" class="mx-3 px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 bg-gradient-to-br from-purple-600 to-blue-500 group-hover:from-purple-600 group-hover:to-blue-500">
             <svg id="sun" data-toggle-icon="sun" class="w-4 h-4" fill="currentColor" viewBox="0 0 20 20" xmlns="http://www.w3.org/2000/svg"><path d="M10 2a1 1 0 011 1v1a1 1 0 11-2 0V3a1 1 0 011-1zm4 8a4 4 0 11-8 0 4 4 0 018 0zm-.464 4.95l.707.707a1 1 0 001.414-1.414l-.707-.707a1 1 0 00-1.414 1.414zm2.12-10.607a1 1 0 010 1.414l-.706.707a1 1 0 11-1.414-1.414l.707-.707a1 1 0 011.414 0zM17 11a1 1 0 100-2h-1a1 1 0 100 2h1zm-7 4a1 1 0 011 1v1a1 1 0 11-2 0v-1a1 1 0 011-1zM5.05 6.464A1 1 0 106.465 5.05l-.708-.707a1 1 0 00-1.414 1.414l.707.707zm1.414 8.486l-.707.707a1 1 0 01-1.414-1.414l.707-.707a1 1 0 011.414 1.414zM4 11a1 1 0 100-2H3a1 1 0 000 2h1z" fill-rule="evenodd" clip-rule="evenodd"></path></svg>
             <svg id="moon" data-toggle-icon="moon" class="w-4 h-4 hidden" fill="currentColor" viewBox="0 0 20 20" xmlns="http://www.w3.org/2000/svg"><path d="M17.293 13.293A8 8 0 016.707 2.707a8.001 8.001 0 1010.586 10.586z"></path></svg>        </button>
-        <a type="button" href="''' + self.button_url + '''" id="pycob-login-button" class="mr-3 inline-flex items-center rounded-lg bg-blue-700 px-2 py-1 text-center text-xs font-medium text-white hover:bg-blue-800 focus:outline-none focus:ring-4 focus:ring-blue-300 md:mr-0">
-          ''' + self.button_label + '''
-          ''' + self.button_svg + '''
+        <a type="button" href="{{button_url}}" id="pycob-login-button" class="mr-3 inline-flex items-center rounded-lg bg-blue-700 px-2 py-1 text-center text-xs font-medium text-white hover:bg-blue-800 focus:outline-none focus:ring-4 focus:ring-blue-300 md:mr-0">
+          {{button_label}}
+          {{button_svg}}
         </a>
         <button onclick="toggleNav()" data-collapse-toggle="navbar-sticky" type="button" class="inline-flex items-center rounded-lg p-2 text-sm text-white hover:bg-gray-700 focus:outline-none focus:ring-2 focus:ring-gray-200 dark:text-white dark:hover:bg-gray-700 dark:focus:ring-gray-600 md:hidden" aria-controls="navbar-sticky" aria-expanded="true">
           <span class="sr-only">Open main menu</span>
@@ -1689,7 +1806,7 @@ class NavbarComponent(Component):
       </div>
       <div class="w-full items-center justify-between md:order-1 md:flex md:w-auto hidden" id="navbar-sticky">
         <ul class="mt-4 flex flex-col rounded-lg md:mt-0 md:flex-row md:space-x-8 md:border-0 md:text-sm md:font-medium">
-          ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+          {{components}} 
         </ul>
       </div>
     </div>
@@ -1739,6 +1856,7 @@ class Page(Component):
   
   Instead, use the `Page.add_page` method of the parent component.
   """
+  __slots__ = ('title', 'description', 'image', 'auto_navbar', 'auto_footer', 'components')
   def __init__(self, title: str = '', description: str = '', image: str = '', auto_navbar: bool = True, auto_footer: bool = True, components: list = None):    
     self.title = title
     self.description = description
@@ -1755,11 +1873,23 @@ class Page(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div id="page-container" class="container px-5 my-5 mx-auto">
-    ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+  _template = '''<div id="page-container" class="container px-5 my-5 mx-auto">
+    {{components}} 
 </div>'''
 
+  def iter_html(self):
+    """Yields the page's HTML one top-level component at a time
+
+    Used by streaming responses so the browser can start rendering before the whole page is built.
+    """
+    head, tail = self._markup.split('{{components}}')
+    yield head
+    for i, component in enumerate(self.components):
+      if i > 0:
+        yield self._component_separator
+      yield from component.iter_html()
+    yield tail
+
   def add(self, component):
     self.components.append(component)
     return self
@@ -1767,16 +1897,17 @@ class Page(Component):
   def add_component(self, component):
     self.components.append(component)
     return self
-  def add_html(self, value: str) -> HtmlComponent:
+  def add_html(self, value: str, assets: list = None) -> HtmlComponent:
     """Renders raw HTML
 
     Args:
         value (str): Raw HTML code to be rendered
+        assets (list): Optional. Client libraries the HTML needs, e.g. ["plotly"], or URLs of scripts to load
     
     Returns:
         HtmlComponent: The new component
     """
-    new_component = HtmlComponent(value)    
+    new_component = HtmlComponent(value, assets)    
     self.components.append(new_component)
     return new_component
     
@@ -1999,18 +2130,19 @@ class Page(Component):
     
 
 
-  def add_pandastable(self, dataframe, hide_fields: list = [], action_buttons: list = None):
+  def add_pandastable(self, dataframe, hide_fields: list = [], action_buttons: list = None, page_size: int = None):
     """Renders a pandas table
 
     Args:
-        dataframe: Dataframe to render
+        dataframe: pandas or Polars DataFrame or pyarrow Table to render. Also takes an iterator of chunks (e.g. pd.read_csv(..., chunksize=...)) or a SQLAlchemy result, whose rows are rendered as they are read. Chunks after the first (10,000 rows of a SQL result) are read while the page is sent, so the connection must stay open until the response is done
         hide_fields (list): List of fields to hide
         action_buttons (list): Row actions to render
+        page_size (int): Optional. Number of rows to render into the page. The rest are loaded from the server as the user asks for them. Defaults to rendering every row. Needs a DataFrame
     
     Returns:
         PandastableComponent: The new component
     """
-    advanced_add_pandastable(self, dataframe, hide_fields, action_buttons)
+    advanced_add_pandastable(self, dataframe, hide_fields, action_buttons, page_size)
     return self
     
 
@@ -2030,17 +2162,18 @@ class Page(Component):
     
 
 
-  def add_datagrid(self, dataframe, action_buttons: list = None):
+  def add_datagrid(self, dataframe, action_buttons: list = None, server_side: bool = False):
     """Renders a data grid
 
     Args:
-        dataframe: Dataframe to render
+        dataframe: pandas or Polars DataFrame or pyarrow Table to render. Also takes an iterator of chunks (e.g. pd.read_csv(..., chunksize=...)) or a SQLAlchemy result, whose rows are rendered as they are read. Chunks after the first (10,000 rows of a SQL result) are read while the page is sent, so the connection must stay open until the response is done
         action_buttons (list): Row actions to render
+        server_side (bool): Optional. Only send the column definitions with the page. The grid loads rows from the server as it scrolls, sorted and filtered there. Needs a DataFrame
     
     Returns:
         DatagridComponent: The new component
     """
-    advanced_add_datagrid(self, dataframe, action_buttons)
+    advanced_add_datagrid(self, dataframe, action_buttons, server_side)
     return self
     
 
@@ -2138,11 +2271,43 @@ class Page(Component):
     return new_component
     
 
+  def add_lazy(self, func, placeholder: str = '') -> LazyComponent:
+    """Renders a placeholder right away and loads the component returned by func after the page has loaded
+
+    Args:
+        func: Function that takes the server request and returns the component to render
+        placeholder (str): Optional. HTML to show until the component has loaded
+    
+    Returns:
+        LazyComponent: The new component
+    """
+    new_component = LazyComponent(func, placeholder)    
+    self.components.append(new_component)
+    return new_component
+    
+
+  def add_fragment(self, id: str, classes: str = '', components: list = None) -> FragmentComponent:
+    """Adds a container that can be re-rendered on its own. Forms inside it are submitted in the background and only the fragment is replaced with the response
+
+    Args:
+        id (str): Id of the fragment. Must be unique within the page
+        classes (str): Optional. Classes to add to the fragment
+        components (list): Optional. List of components to add to the fragment
+    
+    Returns:
+        FragmentComponent: The new component
+    """
+    new_component = FragmentComponent(id, classes, components)    
+    self.components.append(new_component)
+    return new_component
+    
+
 class PlainlinkComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_plainlink` method of the parent component.
   """
+  __slots__ = ('text', 'url', 'classes')
   def __init__(self, text: str, url: str, classes: str = ''):    
     self.text = text
     self.url = url
@@ -2155,14 +2320,15 @@ class PlainlinkComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<a class="''' + self.classes + '''" href="''' + self.url + '''">''' + self.text + '''</a>'''
+  _template = '''<a class="{{classes}}" href="{{url}}">{{text}}</a>'''
 
 class PlotlyfigureComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_plotlyfigure` method of the parent component.
   """
+  __slots__ = ('fig', 'id')
+  assets = ('plotly',)
   def __init__(self, fig, id: str = ''):    
     self.fig = fig
     self.id = id
@@ -2176,11 +2342,10 @@ class PlotlyfigureComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div id="''' + self.id + '''"></div>
+  _template = '''<div id="{{id}}"></div>
 <script>
-    config = ''' + self.fig + '''
-    Plotly.newPlot( document.getElementById("''' + self.id + '''"), config, {responsive: true} );
+    config = {{fig}}
+    Plotly.newPlot( document.getElementById("{{id}}"), config, {responsive: true} );
 </script>'''
 
 class RawtableComponent(Component):
@@ -2188,6 +2353,7 @@ class RawtableComponent(Component):
   
   Instead, use the `Page.add_rawtable` method of the parent component.
   """
+  __slots__ = ('components',)
   def __init__(self, components: list = None):    
     # https://stackoverflow.com/questions/4841782/python-constructor-and-default-value
     self.components = components or []
@@ -2199,10 +2365,9 @@ class RawtableComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="relative overflow-x-auto shadow-md mb-5 sm:rounded-lg">
+  _template = '''<div class="relative overflow-x-auto shadow-md mb-5 sm:rounded-lg">
     <table class="w-full text-sm text-left text-gray-500 dark:text-gray-400">
-        ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+        {{components}} 
     </table>
 </div>'''
 
@@ -2260,6 +2425,7 @@ class Rowaction(Component):
   
   Instead, use the `Page.add_rowaction` method of the parent component.
   """
+  __slots__ = ('label', 'url', 'classes', 'open_in_new_window')
   def __init__(self, label: str, url: str, classes: str = '', open_in_new_window: bool = True):    
     self.label = label
     self.url = url
@@ -2273,14 +2439,14 @@ class Rowaction(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''TODO: Internal Component'''
+  _template = '''TODO: Internal Component'''
 
 class ScriptstatusComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_scriptstatus` method of the parent component.
   """
+  __slots__ = ('job_id', 'redirect_url')
   def __init__(self, job_id: str, redirect_url: str):    
     self.job_id = job_id
     self.redirect_url = redirect_url
@@ -2292,8 +2458,7 @@ class ScriptstatusComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<script type="module">
+  _template = '''<script type="module">
     import { initializeApp } from 'https://www.gstatic.com/firebasejs/9.17.1/firebase-app.js'
         
     import { getFirestore, doc, onSnapshot } from 'https://www.gstatic.com/firebasejs/9.17.1/firebase-firestore.js'
@@ -2308,19 +2473,19 @@ class ScriptstatusComponent(Component):
 
     let db = getFirestore();
 
-    const unsub = onSnapshot(doc(db, "users", "test", "_jobs", "''' + self.job_id + '''"), (doc) => {
+    const unsub = onSnapshot(doc(db, "users", "test", "_jobs", "{{job_id}}"), (doc) => {
         console.log("Current data: ", doc.data());
-        document.getElementById("''' + self.job_id + '''").innerHTML = doc.data().status;
+        document.getElementById("{{job_id}}").innerHTML = doc.data().status;
 
         if (doc.data().status == "complete") {
             unsub();
-            window.location.href = "''' + self.redirect_url + '''";
+            window.location.href = "{{redirect_url}}";
         }
     });
 </script>
 <div class="flex items-center justify-center p-5 border border-gray-200 rounded-lg bg-gray-50 dark:bg-gray-800 dark:border-gray-700">
     <svg aria-hidden="true" class="w-8 h-8 mr-2 text-gray-200 animate-spin dark:text-gray-600 fill-blue-600" viewBox="0 0 100 101" fill="none" xmlns="http://www.w3.org/2000/svg"><path d="M100 50.5908C100 78.2051 77.6142 100.591 50 100.591C22.3858 100.591 0 78.2051 0 50.5908C0 22.9766 22.3858 0.59082 50 0.59082C77.6142 0.59082 100 22.9766 100 50.5908ZM9.08144 50.5908C9.08144 73.1895 27.4013 91.5094 50 91.5094C72.5987 91.5094 90.9186 73.1895 90.9186 50.5908C90.9186 27.9921 72.5987 9.67226 50 9.67226C27.4013 9.67226 9.08144 27.9921 9.08144 50.5908Z" fill="currentColor"/><path d="M93.9676 39.0409C96.393 38.4038 97.8624 35.9116 97.0079 33.5539C95.2932 28.8227 92.871 24.3692 89.8167 20.348C85.8452 15.1192 80.8826 10.7238 75.2124 7.41289C69.5422 4.10194 63.2754 1.94025 56.7698 1.05124C51.7666 0.367541 46.6976 0.446843 41.7345 1.27873C39.2613 1.69328 37.813 4.19778 38.4501 6.62326C39.0873 9.04874 41.5694 10.4717 44.0505 10.1071C47.8511 9.54855 51.7191 9.52689 55.5402 10.0491C60.8642 10.7766 65.9928 12.5457 70.6331 15.2552C75.2735 17.9648 79.3347 21.5619 82.5849 25.841C84.9175 28.9121 86.7997 32.2913 88.1811 35.8758C89.083 38.2158 91.5421 39.6781 93.9676 39.0409Z" fill="currentFill"/></svg>
-    <div id="''' + self.job_id + '''" class="px-3 py-1 text-xs font-medium leading-none text-center text-blue-800 bg-blue-200 rounded-full animate-pulse dark:bg-blue-900 dark:text-blue-200">waiting...</div>
+    <div id="{{job_id}}" class="px-3 py-1 text-xs font-medium leading-none text-center text-blue-800 bg-blue-200 rounded-full animate-pulse dark:bg-blue-900 dark:text-blue-200">waiting...</div>
 </div>'''
 
 class SectionComponent(Component):
@@ -2328,6 +2493,7 @@ class SectionComponent(Component):
   
   Instead, use the `Page.add_section` method of the parent component.
   """
+  __slots__ = ('id', 'name', 'level')
   def __init__(self, id: str, name: str, level: int = 1):    
     self.id = id
     self.name = name
@@ -2340,14 +2506,14 @@ class SectionComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<span id=''' + self.id + '''></span>'''
+  _template = '''<span id={{id}}></span>'''
 
 class SelectoptionComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_selectoption` method of the parent component.
   """
+  __slots__ = ('label', 'value', 'selected')
   def __init__(self, label: str, value: str, selected: str = ''):    
     self.label = label
     self.value = value
@@ -2360,14 +2526,14 @@ class SelectoptionComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<option value="''' + self.value + '''" ''' + self.selected + '''>''' + self.label + '''</option>'''
+  _template = '''<option value="{{value}}" {{selected}}>{{label}}</option>'''
 
 class SidebarComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_sidebar` method of the parent component.
   """
+  __slots__ = ('components',)
   def __init__(self, components: list = None):    
     # https://stackoverflow.com/questions/4841782/python-constructor-and-default-value
     self.components = components or []
@@ -2379,8 +2545,7 @@ class SidebarComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<style>
+  _template = '''<style>
 @media (min-width: 1024px) {
     #page-container {
         max-width: calc( 100vw - 320px );
@@ -2404,7 +2569,7 @@ class SidebarComponent(Component):
 </script>
 <aside style="min-width: 300px" class="hidden lg:block overflow-y-auto flex w-72 flex-col space-y-2 bg-gray-50 dark:bg-gray-800 p-2 h-screen sticky top-0">
     <div class="sticky top-0">
-        ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+        {{components}} 
     </div>
 </aside>'''
 
@@ -2435,6 +2600,7 @@ class SidebarcategoryComponent(Component):
   
   Instead, use the `Page.add_sidebarcategory` method of the parent component.
   """
+  __slots__ = ('title', 'components')
   def __init__(self, title: str, components: list = None):    
     self.title = title
     # https://stackoverflow.com/questions/4841782/python-constructor-and-default-value
@@ -2447,11 +2613,10 @@ class SidebarcategoryComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<div class="mb-8">
-    <h2 class="text-lg font-medium text-gray-500 dark:text-gray-400 tracking-wider uppercase mb-3">''' + self.title + '''</h2>
+  _template = '''<div class="mb-8">
+    <h2 class="text-lg font-medium text-gray-500 dark:text-gray-400 tracking-wider uppercase mb-3">{{title}}</h2>
     <ul class="ml-5 list-none">
-        ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+        {{components}} 
     </ul>
 </div>'''
 
@@ -2482,6 +2647,7 @@ class SidebarlinkComponent(Component):
   
   Instead, use the `Page.add_sidebarlink` method of the parent component.
   """
+  __slots__ = ('title', 'url')
   def __init__(self, title: str, url: str):    
     self.title = title
     self.url = url
@@ -2493,14 +2659,14 @@ class SidebarlinkComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<li><a href="''' + self.url + '''" onclick="event.preventDefault(); smoothScrollTo(this)" class="text-gray-900 dark:text-white hover:text-gray-800">''' + self.title + '''</a></li>'''
+  _template = '''<li><a href="{{url}}" onclick="event.preventDefault(); smoothScrollTo(this)" class="text-gray-900 dark:text-white hover:text-gray-800">{{title}}</a></li>'''
 
 class TablebodyComponent(Component):
   """You don't normally need to invoke this constructor directly.
   
   Instead, use the `Page.add_tablebody` method of the parent component.
   """
+  __slots__ = ('components',)
   def __init__(self, components: list = None):    
     # https://stackoverflow.com/questions/4841782/python-constructor-and-default-value
     self.components = components or []
@@ -2512,9 +2678,8 @@ class TablebodyComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<tbody>
-    ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+  _template = '''<tbody>
+    {{components}} 
 </tbody>'''
 
   def add(self, component):
@@ -2543,6 +2708,7 @@ class TablecellComponent(Component):
   
   Instead, use the `Page.add_tablecell` method of the parent component.
   """
+  __slots__ = ('value',)
   def __init__(self, value: str):    
     self.value = value
     
@@ -2553,9 +2719,8 @@ class TablecellComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<td class="px-6 py-4 whitespace-nowrap">
-    ''' + self.value + '''
+  _template = '''<td class="px-6 py-4 whitespace-nowrap">
+    {{value}}
 </td>'''
 
 class TablecellheaderComponent(Component):
@@ -2563,6 +2728,7 @@ class TablecellheaderComponent(Component):
   
   Instead, use the `Page.add_tablecellheader` method of the parent component.
   """
+  __slots__ = ('value',)
   def __init__(self, value: str):    
     self.value = value
     
@@ -2573,9 +2739,8 @@ class TablecellheaderComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">
-    ''' + self.value + '''
+  _template = '''<th class="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">
+    {{value}}
 </th>'''
 
 class TablecolComponent(Component):
@@ -2583,6 +2748,7 @@ class TablecolComponent(Component):
   
   Instead, use the `Page.add_tablecol` method of the parent component.
   """
+  __slots__ = ('components',)
   def __init__(self, components: list = None):    
     # https://stackoverflow.com/questions/4841782/python-constructor-and-default-value
     self.components = components or []
@@ -2594,9 +2760,8 @@ class TablecolComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<td class="px-6 py-4 whitespace-nowrap">
-    ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+  _template = '''<td class="px-6 py-4 whitespace-nowrap">
+    {{components}} 
 </td>'''
 
   def add(self, component):
@@ -2611,6 +2776,7 @@ class TableheadComponent(Component):
   
   Instead, use the `Page.add_tablehead` method of the parent component.
   """
+  __slots__ = ('components',)
   def __init__(self, components: list = None):    
     # https://stackoverflow.com/questions/4841782/python-constructor-and-default-value
     self.components = components or []
@@ -2622,10 +2788,9 @@ class TableheadComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<thead class="bg-gray-50 dark:bg-gray-800">
+  _template = '''<thead class="bg-gray-50 dark:bg-gray-800">
     <tr>
-        ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+        {{components}} 
     </tr>
 </thead>'''
 
@@ -2697,6 +2862,7 @@ class TablerowComponent(Component):
   
   Instead, use the `Page.add_tablerow` method of the parent component.
   """
+  __slots__ = ('components',)
   def __init__(self, components: list = None):    
     # https://stackoverflow.com/questions/4841782/python-constructor-and-default-value
     self.components = components or []
@@ -2708,9 +2874,8 @@ class TablerowComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<tr class="border-t border-gray-200 dark:border-gray-700">
-    ''' + '\n'.join(map(lambda x: x.to_html(), self.components)) + ''' 
+  _template = '''<tr class="border-t border-gray-200 dark:border-gray-700">
+    {{components}} 
 </tr>'''
 
   def add(self, component):
@@ -2767,6 +2932,7 @@ class TextComponent(Component):
   
   Instead, use the `Page.add_text` method of the parent component.
   """
+  __slots__ = ('value',)
   def __init__(self, value: str):    
     self.value = value
     
@@ -2777,8 +2943,7 @@ class TextComponent(Component):
   def __exit__(self, exc_type, exc_value, traceback):
     pass
 
-  def to_html(self):
-    return '''<p class="mb-6 text-lg font-normal text-gray-500 lg:text-xl dark:text-gray-400">''' + self.value + '''</p>'''
+  _template = '''<p class="mb-6 text-lg font-normal text-gray-500 lg:text-xl dark:text-gray-400">{{value}}</p>'''
 
 
 #
@@ -2788,161 +2953,332 @@ class TextComponent(Component):
 #
 #
 from urllib.parse import quote
+from functools import partial
+from itertools import chain, repeat
+from string import Formatter
+from .formatting import format_column, format_value
+from .json_encoder import encode_records
+from .columnar import ColumnarTable, as_columnar
+from .request import _page_access
+from .cache import RenderCache
+from .component_interface import Component
 import re
 import json
+import operator
+import uuid
 
-def advanced_add_pandastable(self, df, hide_fields, action_buttons):
-    cols_to_show = []
-    show_actions = False
+# DataFrames of paginated tables by id, with the columns and action buttons to render.
+# Served by the /_pycob/table/<id> route. Each request for rows keeps the table for another ttl.
+_pandastable_datasets = RenderCache(ttl=1800, max_entries=64, sliding=True, max_bytes=512 * 2 ** 20)
+# The ids of those tables by frame, shown columns and action buttons, so every render of a table shares one
+_pandastable_ids = RenderCache(ttl=1800, max_entries=256, sliding=True)
+
+# DataFrames of server-side data grids by id, with their action buttons, their ids by frame and action
+# buttons, and the row positions of their recent sorts and filters. Served by the /_pycob/datagrid/<id> route.
+_datagrid_datasets = RenderCache(ttl=1800, max_entries=64, sliding=True, max_bytes=512 * 2 ** 20)
+_datagrid_ids = RenderCache(ttl=1800, max_entries=256, sliding=True)
+_datagrid_views = RenderCache(ttl=1800, max_entries=256, sliding=True, max_bytes=256 * 2 ** 20)
+
+# Rows fetched at a time from a SQL result given to add_pandastable() or add_datagrid()
+_SQL_CHUNK_SIZE = 10000
+
+# Rows of a table rendered at a time when the page is streamed
+_TABLE_BLOCK_SIZE = 1000
+
+class PandastableComponent(Component):
+    """The rows of a DataFrame as a table. You don't normally need to invoke this constructor directly.
+
+    Instead, use `Page.add_pandastable`. The rows are rendered with the page, not when the table is added.
+    A streaming response sends them _TABLE_BLOCK_SIZE rows at a time, so the browser gets the head of the
+    table while the rest is rendered.
+    """
+    __slots__ = ('head', 'rows', 'row_count', 'foot')
+    def __init__(self, head: str, rows, row_count: int, foot: str):
+        self.head = head
+        # rows(start, stop) returns the HTML of rows start to stop as a list of strings
+        self.rows = rows
+        self.row_count = row_count
+        self.foot = foot
+
+    def render_into(self, out: list):
+        out.append(self.head)
+        out.extend(self.rows(0, self.row_count))
+        out.append(self.foot)
+
+    def iter_html(self):
+        yield self.head
 
+        for start in range(0, self.row_count, _TABLE_BLOCK_SIZE):
+            yield "".join(self.rows(start, min(start + _TABLE_BLOCK_SIZE, self.row_count)))
+
+        yield self.foot
+
+class HtmlStreamComponent(Component):
+    """HTML that is produced while the page is being sent. You don't normally need to invoke this constructor directly.
+
+    Instead, pass an iterator of DataFrames or a SQL result to `Page.add_pandastable` or `Page.add_datagrid`.
+    With a streaming response, each piece goes out to the client as soon as it is made. The pieces are
+    only made once, so the component can only be rendered once. Pieces after the first are made while the
+    page is sent, after the page function has returned.
+    """
+    __slots__ = ('chunks', 'assets')
+    def __init__(self, chunks, assets: list = None):
+        self.chunks = chunks
+        self.assets = tuple(assets or ())
+
+    def render_into(self, out: list):
+        out.extend(self.chunks)
+
+    def iter_html(self):
+        return iter(self.chunks)
+
+def advanced_add_pandastable(self, df, hide_fields, action_buttons, page_size=None):
     if action_buttons is None:
         action_buttons = []
 
-    if len(__get_action_buttons_to_add(action_buttons)) > 0:
-        show_actions = True
+    if page_size is not None and page_size < 1:
+        raise ValueError("page_size must be at least 1")
+
+    source = df
+    df = __as_table(df)
+
+    if __is_chunked(df):
+        if page_size is not None:
+            raise ValueError("page_size needs a DataFrame. Chunked sources are rendered as they are read.")
+
+        self.components.append(HtmlStreamComponent(__stream_pandastable(__iter_chunks(df), hide_fields, action_buttons)))
+        return self
+
+    cols_to_show = []
 
     for col in df.columns:
         if col not in hide_fields:
             cols_to_show.append(col)
 
+    head = __pandastable_head(df, cols_to_show, action_buttons)
+
+    # The Actions column's buttons are spaced apart, those in place of a value aren't
+    buttons = __compile_action_buttons(df.columns, cols_to_show, action_buttons, " mr-1", "")
+    paginate = page_size is not None and len(df) > page_size
+    foot = ["</tbody>", "</table>", "</div>"]
+
+    if paginate:
+        options = (tuple(cols_to_show), __action_buttons_identity(action_buttons))
+        table_id, _ = __shared_dataset_id(_pandastable_datasets, _pandastable_ids, source, options, lambda: (df, cols_to_show, buttons))
+        head.append('''<tbody data-pycob-table-rows>''')
+
+        # Later rows are fetched from the server by loadTableRows()
+        foot.append('''<div class="flex items-center justify-between mt-4 text-sm text-gray-500 dark:text-gray-400">''')
+        foot.append('''<span data-pycob-table-status>Showing ''' + "{:,}".format(page_size) + " of " + "{:,}".format(len(df)) + " rows</span>")
+        foot.append('''<button onclick="loadTableRows(this)" data-pycob-table="''' + table_id + '''" data-offset="''' + str(page_size) + '''" data-limit="''' + str(page_size) + '''" data-total="''' + str(len(df)) + '''" class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800">Load more</button>''')
+        foot.append("</div>")
+    else:
+        head.append("<tbody>")
+
+    foot.append("</div>")
+
+    rows = partial(__pandastable_block, df, cols_to_show, buttons)
+    self.components.append(PandastableComponent("".join(head), rows, page_size if paginate else len(df), "".join(foot)))
+    return self
+
+def __shared_dataset_id(datasets, ids, source, options: tuple, make_dataset) -> tuple:
+    # Returns the id and dataset stored for the frame or table the caller passed in, with the given
+    # options, storing make_dataset() (a tuple starting with the frame to serve) the first time. Entries
+    # are (source, dataset, access), with the access rule of the page being rendered, and pages with
+    # different rules get different ids. They hold the source, so while one is cached no other object can
+    # have its id().
+    access = _page_access.get()
+    identity = (id(source), access) + options
+    dataset_id = ids.get(identity)
+
+    if dataset_id is not None:
+        stored = datasets.get(dataset_id)
+
+        if stored is not None and stored[0] is source:
+            return dataset_id, stored[1]
+
+    dataset = make_dataset()
+    dataset_id = str(uuid.uuid4())
+    datasets.set(dataset_id, (source, dataset, access), __table_nbytes(dataset[0]))
+    ids.set(identity, dataset_id)
+    return dataset_id, dataset
+
+def advanced_pandastable_access(table_id: str):
+    """Returns the access rule of the page that made a paginated table, as (require_login, protect_with_code), or None."""
+    return __dataset_access(_pandastable_datasets, table_id)
+
+def advanced_datagrid_access(grid_id: str):
+    """Returns the access rule of the page that made a server-side data grid, as (require_login, protect_with_code), or None."""
+    return __dataset_access(_datagrid_datasets, grid_id)
+
+def __dataset_access(datasets, dataset_id: str):
+    # None too if the dataset has expired, which its route answers with a 404 anyway
+    stored = datasets.get(dataset_id)
+    return None if stored is None else stored[2]
+
+def __action_buttons_identity(action_buttons) -> tuple:
+    return tuple((button.label, button.url, button.open_in_new_window) for button in action_buttons)
+
+def __table_nbytes(df) -> int:
+    # Text in object columns is counted by its pointers only. Counting the strings themselves takes longer
+    # than rendering a page of rows.
+    if isinstance(df, ColumnarTable):
+        return df.nbytes()
+
+    return int(df.memory_usage(index=True).sum())
+
+def __pandastable_head(df, cols_to_show, action_buttons) -> list:
     # Pandas dataframe to html
-    html = '''<div class="p-8">'''
+    html = ['''<div class="p-8">''']
 
-    html += '''<div class="relative overflow-x-auto shadow-md sm:rounded-lg">'''
+    html.append('''<div class="relative overflow-x-auto shadow-md sm:rounded-lg">''')
 
-    html += '''<table class="w-full text-sm text-left text-gray-500 dark:text-gray-400">'''
+    html.append('''<table class="w-full text-sm text-left text-gray-500 dark:text-gray-400">''')
 
-    # Pandas DataFrame columns to 
-    html += '''<thead class="text-xs text-gray-700 uppercase bg-gray-50 dark:bg-gray-700 dark:text-gray-400">'''
+    # Pandas DataFrame columns to
+    html.append('''<thead class="text-xs text-gray-700 uppercase bg-gray-50 dark:bg-gray-700 dark:text-gray-400">''')
 
-    html += "<tr>"
+    html.append("<tr>")
 
-    # Get df index name
-    if df.index.name is not None:
-        html += '''<th scope="col" class="px-6 py-3">''' + df.index.name +  "</th>"
+    # Get df index name. Arrow and Polars tables don't have an index.
+    if not isinstance(df, ColumnarTable) and df.index.name is not None:
+        html.append('''<th scope="col" class="px-6 py-3">''' + df.index.name +  "</th>")
 
-    if show_actions:
-        html += '''<th scope="col" class="px-6 py-3">Actions</th>'''
+    if len(__get_action_buttons_to_add(action_buttons)) > 0:
+        html.append('''<th scope="col" class="px-6 py-3">Actions</th>''')
 
     for column in df.columns:
         if column in cols_to_show:
-            html += '''<th scope="col" class="px-6 py-3">''' + column + "</th>"
+            html.append('''<th scope="col" class="px-6 py-3">''' + column + "</th>")
 
-    html += "</tr>"
+    html.append("</tr>")
 
-    html += "</thead>"
+    html.append("</thead>")
 
-    # Pandas DataFrame rows to html
-    html += "<tbody>"
-    i = 0
-    for index, row in df.iterrows():
-        record = row.to_dict()
+    return html
 
-        if i % 2 == 0:
-            html += '''<tr class="bg-white border-b dark:bg-gray-900 dark:border-gray-700">'''
-        else:
-            html += '''<tr class="bg-gray-50 border-b dark:bg-gray-800 dark:border-gray-700">'''
+def __stream_pandastable(chunks, hide_fields, action_buttons):
+    # The header is rendered from the first chunk. Each chunk's rows are then rendered as it is read, so
+    # only one chunk is in memory at a time.
+    buttons = None
+    first_row = 0
 
-        if show_actions:
-            html += '''<td class="px-6 py-4">'''
-        
-            action_buttons_to_add = __get_action_buttons_to_add(action_buttons)
-            
-            for button_to_add in action_buttons_to_add:
-                hydrated_label = button_to_add.label.format(**record)
-                hydrated_url = button_to_add.url.format(**record)
+    for df in chunks:
+        if buttons is None:
+            cols_to_show = [col for col in df.columns if col not in hide_fields]
+            buttons = __compile_action_buttons(df.columns, cols_to_show, action_buttons, " mr-1", "")
+            yield "".join(__pandastable_head(df, cols_to_show, action_buttons)) + "<tbody>"
 
-                if button_to_add.open_in_new_window:
-                    html += """<a href='""" + hydrated_url + """' target="_blank" class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap mr-1">""" + hydrated_label + """</button>"""
-                else:
-                    html += """<a href='""" + hydrated_url + """' class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap mr-1">""" + hydrated_label + """</button>"""
+        yield "".join(__pandastable_rows(df, cols_to_show, buttons, first_row))
+        first_row += len(df)
 
+    if buttons is not None:
+        yield "</tbody></table></div></div>"
 
-            html += '''</td>'''
+def __as_table(source):
+    # pyarrow and Polars tables are read column by column as they are. Anything else is used as it is.
+    columnar = as_columnar(source)
 
-        for column in df.columns:
-            key = column
-            if column in cols_to_show:
-                action_button = __find_key_in_action_buttons(key, action_buttons)
+    if columnar is None:
+        return source
 
-                value = __format_python_object_for_json(record[key])
+    return columnar
 
-                if action_button is not None:
-                    hydrated_label = action_button.label.format(**record)
-                    hydrated_url = action_button.url.format(**record)
-                    if action_button.open_in_new_window:
-                        html += """<td class="px-6 py-4"><a href='""" + hydrated_url + """' target="_blank" class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap">""" + hydrated_label + """</button></td>"""
-                    else:
-                        html += """<td class="px-6 py-4"><a href='""" + hydrated_url + """' class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap">""" + hydrated_label + """</button></td>"""
-                else:
-                    html += '''<td class="px-6 py-4">''' + format_input(row[column]) + "</td>"
+def __slice_table(df, start: int, stop: int):
+    if isinstance(df, ColumnarTable):
+        return df.slice(start, stop)
 
-        html += "</tr>"
-        i += 1
+    return df.iloc[start:stop]
 
-    html += "</tbody>"
+def __table_column(df, i: int):
+    # A pandas Series, or an Arrow or Polars column. format_column() takes any of them.
+    if isinstance(df, ColumnarTable):
+        return df.column(i)
 
-    html += "</table>"
+    return df.iloc[:, i]
 
-    html += "</div>"
+def __is_chunked(source) -> bool:
+    return hasattr(source, "fetchmany") or (hasattr(source, "__iter__") and not hasattr(source, "columns"))
 
-    html += "</div>"
+def __iter_chunks(source):
+    # The first chunk is read right away, while the page function runs, so a source that can't be read
+    # fails there and gets the usual error page. The rest are read as the page is sent, so a connection
+    # has to stay open until then unless the whole result fits in the first chunk.
+    chunks = __read_chunks(source)
+    first = next(chunks, None)
 
-    self.components.append(HtmlComponent(html))
-    return self
+    if first is None:
+        return iter(())
 
+    return chain((first,), chunks)
 
-"""
-A function that formats input into a human-readable string:
-Input: An arbitrary type that could be string, integer, floating point, a numpy object, a pandas datetime, or something else
-Output: String
+def __read_chunks(source):
+    # DataFrames from a chunked source: an iterable of DataFrames (e.g. pd.read_csv(..., chunksize=...)) or
+    # of Arrow record batches or Polars DataFrames, or a SQLAlchemy result or DB-API cursor, read
+    # _SQL_CHUNK_SIZE rows at a time
+    if not hasattr(source, "fetchmany"):
+        yield from map(__as_table, source)
+        return
 
-Dates should be formatted using ISO-8601. Numbers below 10 should include 2 decimal places. Numbers between 10 and 100 should have 1 decimal place. Numbers between 100 and 1000 should have 0 decimal places. Numbers between 1000 and 1000000 should have 0 decimal places and be formatted with a comma for the thousands separator. Numbers between 1000000 and 1000000000 should be formatted as X.Y million. Numbers above 1000000000 should be formatted as X.Y billion
-"""
+    import pandas as pd
 
+    columns = list(source.keys()) if hasattr(source, "keys") else [column[0] for column in source.description]
+    rows = source.fetchmany(_SQL_CHUNK_SIZE)
 
-def format_input(input):
-    is_int = "int" in type(input).__name__
-    is_float = "float" in type(input).__name__
+    # The first chunk is used even when it's empty, so a result without rows still gets its header
+    while True:
+        yield pd.DataFrame.from_records(rows, columns=columns)
 
-    if is_float or is_int:
-        if input < 10:
-            if is_float:
-                return '{:.2f}'.format(input)
-            else:
-                return string_format_with_more(str(input), 10)
-        elif input < 100:
-            if is_float:
-                return '{:.1f}'.format(input)
+        # Fewer rows than asked for is the end of the result, which then isn't read again
+        if len(rows) < _SQL_CHUNK_SIZE:
+            return
+
+        rows = source.fetchmany(_SQL_CHUNK_SIZE)
+
+        if len(rows) == 0:
+            return
+
+def advanced_pandastable_rows(table_id: str, offset: int, limit: int):
+    """Returns the HTML of rows offset to offset + limit of a paginated table, or None if the table has expired."""
+    dataset = _pandastable_datasets.get(table_id)
+
+    if dataset is None:
+        return None
+
+    df, cols_to_show, buttons = dataset[1]
+    return "".join(__pandastable_block(df, cols_to_show, buttons, offset, offset + limit))
+
+def __pandastable_block(df, cols_to_show, buttons, start: int, stop: int) -> list:
+    return __pandastable_rows(__slice_table(df, start, stop), cols_to_show, buttons, start)
+
+def __pandastable_rows(df, cols_to_show, buttons, first_row: int) -> list:
+    # Pandas DataFrame rows to html. The cells are built a column at a time and the rows are
+    # assembled with a single join by the caller.
+    actions, column_buttons = buttons
+    rows = len(df)
+    values_of = __column_values(df)
+    cell_columns = []
+
+    if len(actions) > 0:
+        cell_columns.append(['''<td class="px-6 py-4">''' + "".join(cell) + "</td>" for cell in zip(*(action(values_of, rows) for action in actions))])
+
+    for i, column in enumerate(df.columns):
+        if column in cols_to_show:
+            if i in column_buttons:
+                cell_columns.append(['''<td class="px-6 py-4">''' + cell + "</td>" for cell in column_buttons[i](values_of, rows)])
             else:
-                return string_format_with_more(str(input), 10)
-        elif input < 1000:
-            return '{:.0f}'.format(input)
-        elif input < 1000000:
-            return '{:,.0f}'.format(input)
-        elif input < 1000000000:
-            return '{:.1f} million'.format(input / 1000000)
-        # Check if it's nan
-        elif input != input:
-            return "N/A"
-        else:
-            return '{:.1f} billion'.format(input / 1000000000)
-    elif callable(getattr(input, "isoformat", None)):
-        iso = input.isoformat()
+                cell_columns.append(['''<td class="px-6 py-4">''' + value + "</td>" for value in format_column(__table_column(df, i))])
 
-        if "T00:00:00" in iso:
-            return iso[0:10]
+    # Rows alternate between white and gray, counted from the top of the whole table
+    row_starts = ('''<tr class="bg-white border-b dark:bg-gray-900 dark:border-gray-700">''', '''<tr class="bg-gray-50 border-b dark:bg-gray-800 dark:border-gray-700">''') * (rows // 2 + 2)
+    return list(chain.from_iterable(zip(row_starts[first_row % 2:], *cell_columns, repeat("</tr>", rows))))
 
-        return iso
-    else:
-        formatted_string = str(input)
-        return string_format_with_more(formatted_string, 100)
+def format_input(input):
+    """Formats a single value into a human-readable string. See pycob.formatting for the rules.
 
-def string_format_with_more(text: str, max_length: int) -> str:
-    if len(text) > max_length:
-        return text[0:max_length] + f'... <button data-text-full="{text}" data-text-truncated="{text[0:max_length]}..." onclick="toggleMore(this)" class="text-blue-500">more</button>'
-    else:
-        return text
+    Tables don't call this per cell. They format whole columns with format_column().
+    """
+    return format_value(input)
 
 def __format_python_object_for_json(t):
     if callable(getattr(t, "isoformat", None)):
@@ -2993,45 +3329,363 @@ def __find_key_in_action_buttons(key: str, action_buttons):
 
     return None
 
-def __replace_text_with_button(record: dict, action_buttons) -> dict:
-    new_record = {}
+def __column_values(df):
+    # Returns a function that gives a column's values by position, converting each column once and
+    # only if it's asked for
+    values = {}
 
-    for key in record.keys():
-        action_button = __find_key_in_action_buttons(key, action_buttons)
+    def values_of(i: int) -> list:
+        if i not in values:
+            values[i] = df.values(i) if isinstance(df, ColumnarTable) else df.iloc[:, i].tolist()
 
-        value = __format_python_object_for_json(record[key])
+        return values[i]
 
-        if action_button is not None:
-            hydrated_label = action_button.label.format(**record)
-            hydrated_url = action_button.url.format(**record)
-            if action_button.open_in_new_window:
-                new_record[key] = """<a href='""" + hydrated_url + """' target="_blank" class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap mr-1">""" + hydrated_label + """</button>"""
-            else:
-                new_record[key] = """<a href='""" + hydrated_url + """' class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap mr-1">""" + hydrated_label + """</button>"""
-        else:
-            new_record[key] = value
-    
-    action_buttons_html = ''
+    return values_of
 
-    action_buttons_to_add = __get_action_buttons_to_add(action_buttons)
-    for button_to_add in action_buttons_to_add:
-        hydrated_label = button_to_add.label.format(**record)
-        hydrated_url = button_to_add.url.format(**record)
+def __compile_row_template(template: str, columns):
+    # Compiles a Rowaction's label or url, e.g. "/edit/{id}", into a function that formats it for every
+    # row at once. Each field is bound to its column's position, so only the referenced columns are read.
+    positions = {column: i for i, column in enumerate(columns)}
+    parts = []
+    fields = []
 
-        if button_to_add.open_in_new_window:
-            action_buttons_html += """<a href='""" + hydrated_url + """' target="_blank" class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap">""" + hydrated_label + """</button>"""
-        else:
-            action_buttons_html += """<a href='""" + hydrated_url + """' class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap">""" + hydrated_label + """</button>"""
+    for literal, field_name, format_spec, conversion in Formatter().parse(template):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
 
-    new_record['Actions'] = action_buttons_html
+        if field_name is None:
+            continue
 
-    return new_record
+        if field_name not in positions or "." in field_name or "[" in field_name or "{" in format_spec:
+            # Attributes, indexes, nested format specs and unknown fields are left to str.format(),
+            # which raises the same errors it always has
+            return lambda values_of, rows: [template.format(**dict(zip(columns, row))) for row in zip(*map(values_of, range(len(columns))))]
 
-def advanced_add_datagrid(page, dataframe, action_buttons):
+        parts.append("{" + str(len(fields)) + ("!" + conversion if conversion else "") + (":" + format_spec if format_spec else "") + "}")
+        fields.append(positions[field_name])
+
+    compiled = "".join(parts)
+
+    if len(fields) == 0:
+        return lambda values_of, rows: [compiled.format()] * rows
+
+    return lambda values_of, rows: list(map(compiled.format, *map(values_of, fields)))
+
+def __compile_rowaction(action_button, columns, spacing: str):
+    label = __compile_row_template(action_button.label, columns)
+    url = __compile_row_template(action_button.url, columns)
+    target = ''' target="_blank"''' if action_button.open_in_new_window else ""
+    link_end = "'" + target + ''' class="px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800 whitespace-nowrap''' + spacing + '">'
+
+    def render(values_of, rows: int) -> list:
+        return ["<a href='" + hydrated_url + link_end + hydrated_label + "</button>" for hydrated_url, hydrated_label in zip(url(values_of, rows), label(values_of, rows))]
+
+    return render
+
+def __compile_action_buttons(columns, cols_to_show, action_buttons, action_spacing: str, column_spacing: str) -> tuple:
+    # Compiles a table's action buttons once, before any rows are rendered. Returns the buttons of the
+    # Actions column and the buttons that replace a shown column's values, by column position.
+    actions = [__compile_rowaction(button, columns, action_spacing) for button in __get_action_buttons_to_add(action_buttons)]
+    column_buttons = {}
+
+    for i, column in enumerate(columns):
+        if column in cols_to_show:
+            action_button = __find_key_in_action_buttons(column, action_buttons)
+
+            if action_button is not None:
+                column_buttons[i] = __compile_rowaction(action_button, columns, column_spacing)
+
+    return actions, column_buttons
+
+def advanced_add_datagrid(page, dataframe, action_buttons, server_side=False):
     if action_buttons is None:
         action_buttons = []
 
-    cols = list(map(lambda x: {'headerName': __format_column_header(x), 'field': x} , dataframe.columns.to_list()))
+    source = dataframe
+    dataframe = __as_table(dataframe)
+
+    if server_side:
+        if __is_chunked(dataframe):
+            raise ValueError("server_side needs a DataFrame. Chunked sources are rendered as they are read.")
+
+        page.components.append(HtmlComponent(__server_side_datagrid(source, dataframe, action_buttons), assets=["ag-grid"]))
+        return
+
+    if __is_chunked(dataframe):
+        page.components.append(HtmlStreamComponent(__stream_datagrid(__iter_chunks(dataframe), action_buttons), assets=["ag-grid"]))
+        return
+
+    datagridHtml = __datagrid_script_start(dataframe, action_buttons)
+
+    datagridHtml += __datagrid_rows_json(dataframe, action_buttons)
+
+    datagridHtml += _DATAGRID_SCRIPT_END
+
+    page.components.append(HtmlComponent(datagridHtml, assets=["ag-grid"]))
+
+def __server_side_datagrid(source, dataframe, action_buttons) -> str:
+    # Only the column definitions are sent with the page. ag-grid's infinite row model asks
+    # /_pycob/datagrid/<id> for each block of rows as the grid scrolls, with its sort and filter models.
+    # Every render of a grid of the same frame shares its dataset. Sorting and filtering are done in
+    # pandas, so Arrow and Polars tables are converted when they are first stored.
+    to_pandas = lambda: (dataframe.table.to_pandas() if isinstance(dataframe, ColumnarTable) else dataframe, action_buttons)
+    grid_id, (dataframe, action_buttons) = __shared_dataset_id(_datagrid_datasets, _datagrid_ids, source, (__action_buttons_identity(action_buttons),), to_pandas)
+    # The grid's element, which is new for every render because the same grid can be on a page twice
+    element_id = str(uuid.uuid4())
+
+    cols = [{'headerName': __format_column_header(column), 'field': column, 'filter': __datagrid_filter(dtype)} for column, dtype in zip(dataframe.columns, dataframe.dtypes)]
+
+    if len(__get_action_buttons_to_add(action_buttons)) > 0:
+        cols.append({'headerName': 'Actions', 'field': 'Actions', 'sortable': False, 'filter': False})
+
+    # Rows of the infinite row model have a fixed height, so cells don't wrap
+    return '''
+        <script>
+        (function() {
+            var columnDefs = ''' + json.dumps(cols) + ''';
+            columnDefs.forEach( (x) => { x.cellRenderer = function(params) { return params.value ? params.value : '' } } );
+
+            var gridOptions = {
+                columnDefs: columnDefs,
+                rowModelType: 'infinite',
+                cacheBlockSize: 100,
+                datasource: {
+                    getRows: function(params) {
+                        fetch('/_pycob/datagrid/''' + grid_id + '''' + window.location.search, {
+                            method: 'POST',
+                            headers: { 'Content-Type': 'application/json' },
+                            body: JSON.stringify({ startRow: params.startRow, endRow: params.endRow, sortModel: params.sortModel, filterModel: params.filterModel })
+                        }).then((response) => {
+                            if (!response.ok) {
+                                throw new Error(response.status);
+                            }
+                            return response.json();
+                        }).then((result) => {
+                            params.successCallback(result.rows, result.lastRow);
+                        }).catch(() => {
+                            params.failCallback();
+                        });
+                    }
+                },
+                defaultColDef: {
+                    sortable: true,
+                    filter: true,
+                    resizable: true,
+                    floatingFilter: true,
+                    autoSizePadding: 10,
+                }
+            };
+
+            function createGrid() {
+                var gridDiv = document.getElementById('divid_aggrid_''' + element_id + '''');
+
+                if (agGrid.createGrid) {
+                    agGrid.createGrid(gridDiv, gridOptions);
+                } else {
+                    new agGrid.Grid(gridDiv, gridOptions);
+                }
+            }
+
+            if (document.readyState === 'loading') {
+                document.addEventListener('DOMContentLoaded', createGrid);
+            } else {
+                createGrid();
+            }
+        })();
+
+        function expand(e) {
+            e.parentElement.children[1].style.height = 'calc( 100vh )';
+            e.scrollIntoView();
+        }
+        </script>
+        <div>
+            <button onclick="expand(this)" class="mb-4 px-3 py-2 text-xs font-medium text-center text-white bg-blue-700 rounded-lg hover:bg-blue-800 focus:ring-4 focus:outline-none focus:ring-blue-300 dark:bg-blue-600 dark:hover:bg-blue-700 dark:focus:ring-blue-800">Expand</button>
+            <div id="divid_aggrid_''' + element_id + '''" style="height: 500px; max-height: calc( 100vh - 60px ); " class="data-grid ag-theme-alpine-dark "></div>
+        </div>
+    '''
+
+def __datagrid_filter(dtype) -> str:
+    # The ag-grid filter for a column, which decides the filter model the server gets
+    kind = getattr(dtype, "kind", "O")
+
+    if kind in "iuf":
+        return 'agNumberColumnFilter'
+
+    if kind == "M":
+        return 'agDateColumnFilter'
+
+    return 'agTextColumnFilter'
+
+def advanced_datagrid_rows(grid_id: str, start: int, end: int, sort_model: list, filter_model: dict):
+    """Returns the JSON for rows start to end of a server-side data grid after sorting and filtering, or None if the grid has expired.
+
+    sort_model and filter_model are ag-grid's. The row positions of each sort and filter are kept, so
+    scrolling through them only slices.
+    """
+    dataset = _datagrid_datasets.get(grid_id)
+
+    if dataset is None:
+        return None
+
+    dataframe, action_buttons = dataset[1]
+    view_key = grid_id + json.dumps([sort_model, filter_model], sort_keys=True)
+    positions = _datagrid_views.get(view_key)
+
+    if positions is None:
+        positions = __datagrid_view(dataframe, sort_model, filter_model)
+        _datagrid_views.set(view_key, positions, positions.nbytes)
+
+    # JSON.parse() doesn't accept NaN, so the rows are encoded strictly
+    rows = __datagrid_rows_json(dataframe.iloc[positions[start:end]], action_buttons, strict=True)
+    return '{"rows": ' + rows + ', "lastRow": ' + str(len(positions)) + '}'
+
+def __datagrid_view(dataframe, sort_model: list, filter_model: dict):
+    # The positions of the rows that pass every column's filter, in sorted order
+    import numpy as np
+    import pandas as pd
+
+    column_positions = {str(column): i for i, column in enumerate(dataframe.columns)}
+    keep = np.ones(len(dataframe), dtype=bool)
+
+    for column, model in filter_model.items():
+        # Filters on the Actions column or on columns that aren't there are ignored
+        if column in column_positions and isinstance(model, dict):
+            keep &= __datagrid_filter_mask(np, pd, dataframe.iloc[:, column_positions[column]], model)
+
+    positions = np.flatnonzero(keep)
+    keys = [(column_positions[sort["colId"]], sort.get("sort") != "desc") for sort in sort_model if sort.get("colId") in column_positions]
+
+    if len(keys) == 0:
+        return positions
+
+    sort_frame = pd.DataFrame({n: dataframe.iloc[positions, i].reset_index(drop=True) for n, (i, _) in enumerate(keys)})
+    ascending = [ascending for _, ascending in keys]
+
+    try:
+        order = sort_frame.sort_values(list(sort_frame.columns), ascending=ascending, kind="stable", na_position="last").index
+    except TypeError:
+        # Object columns whose values can't be compared to each other (e.g. numbers and text) sort as text
+        order = sort_frame.astype(str).sort_values(list(sort_frame.columns), ascending=ascending, kind="stable").index
+
+    return positions[order.to_numpy()]
+
+# ag-grid's number and date filter types
+_FILTER_COMPARISONS = {
+    "equals": operator.eq,
+    "notEqual": operator.ne,
+    "lessThan": operator.lt,
+    "lessThanOrEqual": operator.le,
+    "greaterThan": operator.gt,
+    "greaterThanOrEqual": operator.ge,
+}
+
+def __datagrid_filter_mask(np, pd, column, model: dict):
+    # A column's filter model is either one condition or conditions joined by an operator
+    if "conditions" in model or "condition1" in model:
+        conditions = model.get("conditions") or [model.get("condition1"), model.get("condition2")]
+        masks = [__datagrid_filter_mask(np, pd, column, condition) for condition in conditions if condition]
+
+        if len(masks) == 0:
+            return np.ones(len(column), dtype=bool)
+
+        if model.get("operator") == "OR":
+            return np.logical_or.reduce(masks)
+
+        return np.logical_and.reduce(masks)
+
+    filter_type = model.get("filterType")
+    comparison = model.get("type")
+    missing = column.isna().to_numpy()
+
+    if filter_type == "number":
+        values = pd.to_numeric(column, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        low, high = model.get("filter"), model.get("filterTo")
+    elif filter_type == "date":
+        values = pd.to_datetime(column, errors="coerce")
+
+        if getattr(values.dt, "tz", None) is not None:
+            values = values.dt.tz_localize(None)
+
+        # ag-grid's date filter compares days
+        values = values.dt.normalize().to_numpy()
+
+        try:
+            low, high = [None if model.get(key) is None else np.datetime64(pd.Timestamp(model.get(key)).normalize()) for key in ("dateFrom", "dateTo")]
+        except (TypeError, ValueError, OverflowError):
+            # Dates the client sent that don't parse (pandas' DateParseError is a ValueError) filter nothing
+            return np.ones(len(column), dtype=bool)
+    else:
+        # Text filters are case insensitive, like ag-grid's own
+        text = pd.Series(column.to_numpy(dtype=object)).where(~missing, "").astype(str).str.lower()
+        blank = missing | (text == "").to_numpy()
+        query = str(model.get("filter") or "").lower()
+
+        if comparison == "blank":
+            return blank
+        if comparison == "notBlank":
+            return ~blank
+        if comparison == "contains":
+            return text.str.contains(query, regex=False).to_numpy()
+        if comparison == "notContains":
+            return ~text.str.contains(query, regex=False).to_numpy()
+        if comparison == "equals":
+            return (text == query).to_numpy()
+        if comparison == "notEqual":
+            return (text != query).to_numpy()
+        if comparison == "startsWith":
+            return text.str.startswith(query).to_numpy()
+        if comparison == "endsWith":
+            return text.str.endswith(query).to_numpy()
+
+        return np.ones(len(column), dtype=bool)
+
+    if comparison == "blank":
+        return missing
+    if comparison == "notBlank":
+        return ~missing
+
+    if filter_type == "number":
+        try:
+            low = None if low is None else float(low)
+            high = None if high is None else float(high)
+        except (TypeError, ValueError):
+            return np.ones(len(column), dtype=bool)
+
+    if low is None:
+        return np.ones(len(column), dtype=bool)
+
+    with np.errstate(invalid="ignore"):
+        # Like ag-grid, ranges don't include their ends and blanks are never equal or not equal to anything
+        if comparison == "inRange" and high is not None:
+            return (values > low) & (values < high) & ~missing
+
+        if comparison in _FILTER_COMPARISONS:
+            return _FILTER_COMPARISONS[comparison](values, low) & ~missing
+
+    return np.ones(len(column), dtype=bool)
+
+def __stream_datagrid(chunks, action_buttons):
+    # The rows are written into the script's rowData array a chunk at a time, so only one chunk is in
+    # memory at a time
+    started = False
+    empty = True
+
+    for dataframe in chunks:
+        if not started:
+            started = True
+            yield __datagrid_script_start(dataframe, action_buttons) + "["
+
+        records = __datagrid_rows_json(dataframe, action_buttons)[1:-1]
+
+        if records != "":
+            yield records if empty else ", " + records
+            empty = False
+
+    if started:
+        yield "]" + _DATAGRID_SCRIPT_END
+
+def __datagrid_script_start(dataframe, action_buttons) -> str:
+    # The script up to the rowData array
+    cols = list(map(lambda x: {'headerName': __format_column_header(x), 'field': x} , list(dataframe.columns)))
 
     if len(__get_action_buttons_to_add(action_buttons)) > 0:
         cols.append({'headerName': 'Actions', 'field': 'Actions'})
@@ -3041,17 +3695,73 @@ def advanced_add_datagrid(page, dataframe, action_buttons):
         var columnDefsasdf = {columns};
         '''.format(columns = cols)
 
-    records = list (map(lambda x: __replace_text_with_button(x, action_buttons=action_buttons), dataframe.to_dict(orient='records')))
-
     datagridHtml += '''
     columnDefsasdf.forEach( (x) => { x.cellRenderer = function(params) { return params.value ? params.value : '' } } )
     '''
 
     datagridHtml += '''
-        var rowDataasdf = {records};
-        '''.format(records = json.dumps( records ) )
+        var rowDataasdf = '''
 
-    datagridHtml += '''
+    return datagridHtml
+
+def __datagrid_rows_json(dataframe, action_buttons, strict: bool = False) -> str:
+    # The rows as a JSON array of objects, encoded a column at a time without a dict per row
+    columns = list(dataframe.columns)
+
+    if isinstance(dataframe, ColumnarTable):
+        shown_values = list(map(partial(__datagrid_columnar_values, dataframe), range(len(columns))))
+    else:
+        shown_values = __datagrid_dataframe_values(dataframe)
+
+    # Action buttons replace the values of their columns and fill the Actions column, which is empty without any
+    actions, column_buttons = __compile_action_buttons(columns, columns, action_buttons, "", " mr-1")
+    rows = len(dataframe)
+    values_of = __column_values(dataframe)
+
+    for i, render in column_buttons.items():
+        shown_values[i] = render(values_of, rows)
+
+    if len(actions) > 0:
+        shown_values.append(["".join(cell) for cell in zip(*(action(values_of, rows) for action in actions))])
+    else:
+        shown_values.append([""] * rows)
+
+    return encode_records(columns + ['Actions'], shown_values, strict)
+
+def __datagrid_columnar_values(dataframe, i: int):
+    # The values to send for a column of an Arrow or Polars table. Numbers and booleans without nulls are
+    # encoded straight from their buffers, dates are sent as ISO strings and the rest as Python values.
+    if dataframe.is_temporal(i):
+        return format_column(dataframe.column(i))
+
+    values = dataframe.to_numpy(i)
+
+    if values is None:
+        return dataframe.values(i)
+
+    return values
+
+def __datagrid_dataframe_values(dataframe) -> list:
+    # The values to send for each column of a pandas DataFrame. Datetime columns are sent as ISO strings,
+    # formatted a column at a time. Numbers and booleans are encoded straight from their NumPy arrays.
+    # Dates and durations in other columns are converted one by one.
+    shown_values = []
+
+    for i, dtype in enumerate(dataframe.dtypes):
+        column = dataframe.iloc[:, i]
+
+        if dtype.kind == 'M':
+            shown_values.append(format_column(column))
+        elif dtype.kind in 'iufb' and not hasattr(dtype, 'numpy_dtype'):
+            # NumPy dtypes. Nullable and Arrow-backed ones have a numpy_dtype and missing values that NumPy doesn't.
+            shown_values.append(column.to_numpy())
+        else:
+            shown_values.append(list(map(__format_python_object_for_json, column.tolist())))
+
+    return shown_values
+
+_DATAGRID_SCRIPT_END = ''';
+        
         var gridOptionsasdf = {
             columnDefs: columnDefsasdf,
             rowData: rowDataasdf,
@@ -3085,5 +3795,4 @@ def advanced_add_datagrid(page, dataframe, action_buttons):
         </div>
     '''
 
-    page.components.append(HtmlComponent(datagridHtml))
 
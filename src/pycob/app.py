@@ -1,7 +1,10 @@
 import flask
 from .all_components import Page
 from .request import Request
-from .handler import PageHandler, LoginHandler, SignupHandler, LogoutHandler
+from .handler import PageHandler, LoginHandler, SignupHandler, LogoutHandler, FragmentHandler, StylesheetHandler, TableHandler, DatagridHandler
+from .cache import RenderCache
+from .component_interface import _set_minify_html
+import hashlib
 import inspect
 import os
 import requests
@@ -18,7 +21,7 @@ demo_page.add_header('Demo Page', 2)
 class App:
     flask_app = None
 
-    def __init__(self, name: str, subtitle="", app_nav=[], api_key=None, use_built_in_auth=False, profile_page=profile):
+    def __init__(self, name: str, subtitle="", app_nav=[], api_key=None, use_built_in_auth=False, profile_page=profile, stylesheet=None, compress=True, minify_html=False):
         self.flask_app = flask.Flask(__name__)
         self.name = name
         self.subtitle = subtitle
@@ -28,9 +31,26 @@ class App:
         self.use_built_in_auth = use_built_in_auth
         self.profile_page = profile_page
         self.flask_app.add_url_rule('/favicon.ico', 'favicon.ico', redirect_to="https://cdn.pycob.com/favicon.ico")
+        self.flask_app.add_url_rule('/_pycob/fragment/<fragment_id>', '_pycob_fragment', view_func=FragmentHandler(self), methods=["GET"])
+        self.flask_app.add_url_rule('/_pycob/table/<table_id>', '_pycob_table', view_func=TableHandler(self), methods=["GET"])
+        self.flask_app.add_url_rule('/_pycob/datagrid/<grid_id>', '_pycob_datagrid', view_func=DatagridHandler(self), methods=["POST"])
         self.temp_dir = os.getcwd() + '/tmp/' + ''.join(random.choices(string.ascii_uppercase, k=5))
         self.error = None
         self.home_page_registered = False
+        self.render_caches = {}
+        # Rendered navbar and footer, rebuilt on the next request after the registered pages change
+        self.page_chrome = None
+        self.stylesheet_url = None
+        # Compress pages with the best of zstd/br/gzip the browser accepts. Turn off when a proxy in front of the app already does.
+        self.compress = compress
+        # Strip the indentation and line breaks between tags from every template. Templates are compiled
+        # once per process, so this applies to all components, not only this app's, and every App in the
+        # process must pass the same value.
+        self.minify_html = minify_html
+        _set_minify_html(minify_html)
+
+        if stylesheet is not None:
+            self.__add_stylesheet(stylesheet)
 
         if use_built_in_auth:
             if self.api_key is None:
@@ -52,6 +72,12 @@ class App:
         self.flask_app.add_url_rule('/auth/__handle_signup', "__handle_signup", view_func=SignupHandler(self), methods=["POST"])
 
 
+    def __add_stylesheet(self, path: str):
+        # Serves a stylesheet built with python -m pycob.tailwind in place of the Tailwind CDN script
+        css = Path(path).read_bytes()
+        self.stylesheet_url = "/_pycob/static/pycob." + hashlib.sha256(css).hexdigest()[:16] + ".css"
+        self.flask_app.add_url_rule(self.stylesheet_url, "_pycob_stylesheet", view_func=StylesheetHandler(css), methods=["GET"])
+
     def __check_login(self, redirect):
         if self.use_built_in_auth:
             if "username" not in flask.session:
@@ -317,10 +343,11 @@ class App:
             print("API request failed to return valid JSON.")
             return {"error": "API request failed to return valid JSON."}
 
-    def add_page(self, route: str, page_name: str, page_function, show_in_navbar=True, footer_category="All Pages", require_login=False, protect_with_code=None):
+    def add_page(self, route: str, page_name: str, page_function, show_in_navbar=True, footer_category="All Pages", require_login=False, protect_with_code=None, stream=False):
         print("Warning: add_page() is deprecated. Use register_function() instead.")
         endpoint_name = _strip_slashes(route)
         self.pages[endpoint_name] = {"page_name": page_name, "show_in_navbar": show_in_navbar, "footer_category": footer_category}
+        self.page_chrome = None
 
         redirect_url = None
         if require_login:
@@ -328,11 +355,24 @@ class App:
                 self.error = "You must set use_built_in_auth=True to use the require_login parameter."                
             redirect_url = "/"+endpoint_name
 
-        self.flask_app.add_url_rule("/" + endpoint_name, endpoint_name, PageHandler(self, page_function, redirect_url, protect_with_code), methods=["GET", "POST"])
+        self.flask_app.add_url_rule("/" + endpoint_name, endpoint_name, PageHandler(self, page_function, redirect_url, protect_with_code, stream=stream), methods=["GET", "POST"])
+
+    def register_function(self, function, show_in_navbar=True, footer_category="All Pages", require_login=False, protect_with_code=None, stream=False, cache_ttl=None, cache_key=None, cache_size=256):
+        """Registers a page function at /<function name>. The first registered function is also served at /.
+
+        The function may be an async function. It then runs on its own event loop and can use the
+        Request *_async helpers to await several storage lookups at once.
 
-    def register_function(self, function, show_in_navbar=True, footer_category="All Pages", require_login=False, protect_with_code=None):
+        Set stream=True to send the page to the browser in chunks as it is rendered instead of all at once.
+
+        Set cache_ttl to a number of seconds to reuse the rendered page for that long. Pages are cached per
+        path, query string and username unless cache_key is given, in which case it is called with the Request
+        and must return a hashable key. At most cache_size pages are kept per function. Only GET and HEAD
+        requests use the cache. Form submits (POST) always run the function.
+        """
         endpoint_name = function.__name__
         self.pages[endpoint_name] = {"page_name": endpoint_name.replace("_", " ").title(), "show_in_navbar": show_in_navbar, "footer_category": footer_category}
+        self.page_chrome = None
 
         redirect_url = None
         if require_login:
@@ -340,11 +380,20 @@ class App:
                 self.error = "You must set use_built_in_auth=True to use the require_login parameter."                
             redirect_url = "/"+endpoint_name
 
-        self.flask_app.add_url_rule("/" + endpoint_name, endpoint_name, PageHandler(self, function, redirect_url, protect_with_code), methods=["GET", "POST"])
+        cache = None
+        if cache_ttl is not None:
+            cache = RenderCache(cache_ttl, cache_size)
+            self.render_caches[endpoint_name] = cache
+
+        self.flask_app.add_url_rule("/" + endpoint_name, endpoint_name, PageHandler(self, function, redirect_url, protect_with_code, stream=stream, cache=cache, cache_key=cache_key), methods=["GET", "POST"])
 
         if not self.home_page_registered:
             self.home_page_registered = True
-            self.flask_app.add_url_rule("/", "_home", PageHandler(self, function, redirect_url, protect_with_code), methods=["GET", "POST"])
+            self.flask_app.add_url_rule("/", "_home", PageHandler(self, function, redirect_url, protect_with_code, stream=stream, cache=cache, cache_key=cache_key), methods=["GET", "POST"])
+
+    def get_cache_stats(self) -> dict:
+        """Returns hit/miss counters and sizes of the page render caches, keyed by function name."""
+        return {endpoint_name: cache.stats() for endpoint_name, cache in self.render_caches.items()}
 
     def run(self, port=8080, force_dev_mode=False):
         caller = inspect.currentframe().f_back
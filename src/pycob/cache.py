@@ -0,0 +1,56 @@
+import threading
+import time
+from collections import OrderedDict
+
+class RenderCache:
+    """A thread-safe, size-bounded LRU cache whose entries expire after ttl seconds.
+
+    With sliding=True, every get() that finds an entry starts its ttl over. With max_bytes, the oldest
+    entries are also evicted while the sizes given to set() add up to more than it. The newest entry is
+    always kept.
+    """
+    def __init__(self, ttl: float, max_entries: int = 256, sliding: bool = False, max_bytes: int = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.sliding = sliding
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                    self.bytes -= entry[2]
+                self.misses += 1
+                return None
+
+            if self.sliding:
+                self._entries[key] = (time.monotonic() + self.ttl, entry[1], entry[2])
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, nbytes: int = 0):
+        with self._lock:
+            replaced = self._entries.pop(key, None)
+
+            if replaced is not None:
+                self.bytes -= replaced[2]
+
+            self._entries[key] = (time.monotonic() + self.ttl, value, nbytes)
+            self.bytes += nbytes
+
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.bytes > self.max_bytes and len(self._entries) > 1):
+                self.bytes -= self._entries.popitem(last=False)[1][2]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_entries": self.max_entries, "ttl": self.ttl}
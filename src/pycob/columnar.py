@@ -0,0 +1,76 @@
+"""Reads pyarrow and Polars tables a column at a time, without converting them to pandas."""
+import sys
+
+def as_columnar(table):
+    """Returns a ColumnarTable for a pyarrow Table or RecordBatch or a Polars DataFrame, or None for anything else."""
+    # A table can only be one of these if its library has been imported, so neither is imported here
+    pa = sys.modules.get("pyarrow")
+    pl = sys.modules.get("polars")
+
+    if pa is not None and isinstance(table, (pa.Table, pa.RecordBatch)):
+        return ColumnarTable(table, False)
+
+    if pl is not None and isinstance(table, pl.DataFrame):
+        return ColumnarTable(table, True)
+
+    return None
+
+class ColumnarTable:
+    """The parts of a DataFrame that tables and data grids use, read straight from Arrow or Polars columns.
+
+    Columns are formatted with format_column(), which reads numbers and dates from their buffers. Values
+    for row actions are converted to Python a column at a time, and so are those of data grid columns that
+    to_numpy() can't read.
+    """
+    __slots__ = ('table', 'polars', 'columns')
+
+    def __init__(self, table, polars: bool):
+        self.table = table
+        self.polars = polars
+        self.columns = list(table.columns if polars else table.column_names)
+
+    def __len__(self) -> int:
+        return self.table.height if self.polars else self.table.num_rows
+
+    def column(self, i: int):
+        """Returns the column at position i: a Polars Series, or a pyarrow ChunkedArray or Array."""
+        return self.table.to_series(i) if self.polars else self.table.column(i)
+
+    def slice(self, start: int, stop: int):
+        """Returns rows start to stop, without copying them."""
+        return ColumnarTable(self.table.slice(start, max(stop - start, 0)), self.polars)
+
+    def values(self, i: int) -> list:
+        """Returns the values of the column at position i as Python objects, with None for nulls."""
+        column = self.column(i)
+        return column.to_list() if self.polars else column.to_pylist()
+
+    def to_numpy(self, i: int):
+        """Returns the column at position i as a NumPy array if it holds numbers or booleans without nulls, or None."""
+        column = self.column(i)
+
+        if self.polars:
+            dtype = column.dtype
+            readable = dtype.is_integer() or dtype.is_float() or dtype == sys.modules["polars"].Boolean
+            nulls = column.null_count()
+        else:
+            types = sys.modules["pyarrow"].types
+            dtype = column.type
+            readable = types.is_integer(dtype) or types.is_floating(dtype) or types.is_boolean(dtype)
+            nulls = column.null_count
+
+        if not readable or nulls > 0:
+            return None
+
+        return column.to_numpy()
+
+    def nbytes(self) -> int:
+        """Returns the size of the table's buffers."""
+        return self.table.estimated_size() if self.polars else self.table.nbytes
+
+    def is_temporal(self, i: int) -> bool:
+        """Returns whether the column at position i holds dates, times or durations."""
+        if self.polars:
+            return self.table.dtypes[i].is_temporal()
+
+        return sys.modules["pyarrow"].types.is_temporal(self.table.schema.field(i).type)
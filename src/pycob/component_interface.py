@@ -1,16 +1,361 @@
+from __future__ import annotations
 import json
-from abc import ABC, abstractmethod
+import re
+from abc import ABC
+from itertools import chain
+from operator import attrgetter
 
 # Base class for all components
 class Component:
-    @abstractmethod
+    # Components declare their attributes in __slots__ so large trees (e.g. tables with
+    # hundreds of thousands of cells) don't pay for a __dict__ per instance
+    __slots__ = ()
+
+    # Markup with {{attribute}} slots. {{components}} marks where a container's children go.
+    # Subclasses that set it get a render_into compiled from it once, when the class is created.
+    _template = None
+
+    # Client libraries this component needs on the page, e.g. ('plotly',). The page only loads the
+    # libraries its components declare.
+    assets = ()
+
+    # The children to walk in collect_assets(). Containers alias it to their components slot.
+    _child_components = ()
+
+    # The _template the compiled render_into was made from, and what goes between a container's
+    # children. Both lose their insignificant whitespace when an App is created with minify_html=True.
+    _markup = None
+    _component_separator = '\n'
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if 'components' in cls.__dict__.get('__slots__', ()):
+            cls._child_components = cls.__dict__['components']
+        elif cls.__dictoffset__ != 0 and '_child_components' not in cls.__dict__:
+            # Subclasses without __slots__ may set components on the instance
+            cls._child_components = property(lambda self: self.__dict__.get('components') or ())
+        if '_template' in cls.__dict__ and cls._template is not None:
+            _templated_classes.append(cls)
+            _compile_class(cls)
+        elif 'to_html' in cls.__dict__:
+            # A subclass that overrides to_html (e.g. of a templated component) renders through it, not
+            # through the render_into and iter_html it would otherwise inherit
+            if 'render_into' not in cls.__dict__:
+                cls.render_into = Component.render_into
+            if 'iter_html' not in cls.__dict__:
+                cls.iter_html = Component.iter_html
+
     def to_html(self) -> str:
-        pass
+        out = []
+        self.render_into(out)
+        return ''.join(out)
+
+    def render_into(self, out: list):
+        """Appends this component's HTML to out.
+
+        Components with a _template get a compiled version of this. Components that only define
+        to_html get this default. Containers render their children into the same list, so the whole
+        tree is joined once instead of once per nesting level.
+        """
+        out.append(self.to_html())
+
+    def iter_html(self):
+        """Yields this component's HTML in pieces, for streaming responses.
+
+        Most components are a single piece. Tables read from a chunked source yield their rows as they are read.
+        """
+        yield self.to_html()
+
+    def _render_components_into(self, out: list):
+        separator = self._component_separator
+        components = iter(self.components)
+        for component in components:
+            component.render_into(out)
+            break
+        for component in components:
+            out.append(separator)
+            component.render_into(out)
+
+    def collect_assets(self) -> list:
+        """Returns the client libraries needed by this component and everything below it, without duplicates."""
+        found = {}
+        level = [self]
+
+        # One level of the tree at a time. Components whose type has no children and class-level assets
+        # are only looked at by type, so the thousands of cells in a big table cost next to nothing.
+        while level:
+            types = dict.fromkeys(map(type, level))
+            next_level = []
+
+            for cls in types:
+                if cls._child_components == () and type(cls.assets) is tuple:
+                    found.update(dict.fromkeys(cls.assets))
+                    continue
+
+                components = level if len(types) == 1 else [component for component in level if type(component) is cls]
+                found.update(dict.fromkeys(chain.from_iterable(map(_get_assets, components))))
+                next_level.extend(chain.from_iterable(map(_get_child_components, components)))
+
+            level = next_level
+
+        return list(found)
+
+    def find_fragment(self, id: str):
+        """Returns the fragment with the given id in this component's subtree, or None if there isn't one."""
+        for component in getattr(self, 'components', None) or ():
+            fragment = component.find_fragment(id)
+
+            if fragment is not None:
+                return fragment
+
+        return None
+
+    def freeze(self) -> FrozenComponent:
+        """Renders this component once and returns an immutable stand-in that reuses that HTML.
+
+        Use it for static sections (heroes, explanatory cards, headers) that are built once and added
+        to many pages. The subtree itself is frozen too: adding to it or setting its attributes raises
+        AttributeError. The frozen component can be shared across threads and requests.
+        """
+        return FrozenComponent(self)
 
     def _repr_html_(self):
         return self.to_html()
 
     def to_json(self) -> str:
-        return json.dumps(self, default=lambda o: o.__dict__,
+        return json.dumps(self, default=_attributes,
             sort_keys=True, indent=4)
 
+class FrozenComponent(Component):
+    """A component subtree rendered once. You don't normally need to invoke this constructor directly.
+
+    Instead, call `freeze()` on the component.
+    """
+    __slots__ = ('component', 'html', 'assets')
+
+    def __init__(self, component: Component):
+        _seal(component)
+        object.__setattr__(self, 'component', component)
+        object.__setattr__(self, 'html', component.to_html())
+        object.__setattr__(self, 'assets', tuple(component.collect_assets()))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenComponent is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenComponent is immutable")
+
+    def render_into(self, out: list):
+        out.append(self.html)
+
+    def to_html(self) -> str:
+        return self.html
+
+    def freeze(self) -> FrozenComponent:
+        return self
+
+_get_assets = attrgetter('assets')
+_get_child_components = attrgetter('_child_components')
+
+def _attributes(o) -> dict:
+    # Like o.__dict__, but also picks up the public attributes stored in __slots__
+    attributes = dict(getattr(o, '__dict__', {}))
+
+    for cls in type(o).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if hasattr(o, name) and not name.startswith('_'):
+                attributes[name] = getattr(o, name)
+
+    # Components that need no client libraries serialize as they did before they could name any
+    if attributes.get('assets') == ():
+        del attributes['assets']
+
+    return attributes
+
+def _seal(component):
+    # Every component of a frozen subtree becomes an instance of a subclass that refuses changes, and its
+    # child list becomes a tuple that does the same, so changing it fails instead of being silently ignored
+    cls = type(component)
+
+    if cls in _sealed_classes.values() or isinstance(component, FrozenComponent):
+        return
+
+    components = getattr(component, 'components', None)
+    if isinstance(components, list):
+        component.components = _SealedComponents(components)
+    for child in components or ():
+        _seal(child)
+
+    if cls not in _sealed_classes:
+        # Same name and no slots of its own, so instances can switch to it and render the same
+        _sealed_classes[cls] = type(cls.__name__, (cls,), {
+            '__slots__': (), '__module__': cls.__module__, '__qualname__': cls.__qualname__,
+            '_child_components': cls._child_components,
+            '__setattr__': _refuse_change, '__delattr__': _refuse_change,
+        })
+
+    component.__class__ = _sealed_classes[cls]
+
+# The sealed subclass of each component class that has been frozen
+_sealed_classes = {}
+
+def _refuse_change(self, *args):
+    raise AttributeError(type(self).__name__ + " is part of a frozen subtree and can't be changed. Build a new component instead.")
+
+class _SealedComponents(tuple):
+    __slots__ = ()
+
+    def _refuse(self, *args):
+        raise AttributeError("Components can't be added to a frozen subtree. Build a new component instead.")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = __iadd__ = __setitem__ = __delitem__ = _refuse
+
+_TEMPLATE_SLOT = re.compile(r'\{\{(\w+)\}\}')
+
+# Classes with a _template, so _set_minify_html() can recompile them
+_templated_classes = []
+# Whether they are compiled minified. None until the first App sets it.
+_minify = None
+
+def _compile_class(cls):
+    cls._markup = _minify_markup(cls._template) if _minify else cls._template
+    cls.render_into = _compile_template(cls._markup, cls.__name__)
+
+def _set_minify_html(enabled: bool):
+    """Recompiles every component template with (or without) its insignificant whitespace.
+
+    Called by every App. Templates are only compiled here and when a class is created, so minified pages
+    cost nothing extra per request. The setting is process-wide: the first App decides it, and an App
+    created later with a different minify_html raises ValueError.
+    """
+    global _minify
+
+    if _minify is not None:
+        if _minify != enabled:
+            raise ValueError(f"minify_html={enabled} conflicts with an App created earlier in this process with minify_html={_minify}. "
+                             "Templates are compiled once per process, so every App must use the same setting.")
+        return
+
+    _minify = enabled
+    # A line break between components is a space to the browser, which matters between inline ones
+    Component._component_separator = ' ' if enabled else '\n'
+
+    for cls in _templated_classes:
+        _compile_class(cls)
+
+# Elements whose text isn't markup. Whitespace in <pre> and <textarea> is content, and a line break in a
+# script can end a statement or a // comment.
+_RAW_TEXT = re.compile(r'(<(script|style|pre|textarea)\b.*?</\2\s*>)', re.DOTALL | re.IGNORECASE)
+_TAG = re.compile(r'(<[^<>]*>)')
+_TAG_NAME = re.compile(r'</?([a-zA-Z][\w:-]*)')
+# Elements that whitespace next to doesn't render: block-level elements, the parts of tables and lists,
+# metadata, and SVG shapes. Next to anything else (e.g. between two <code> or <span> elements) a line
+# break shows as a space.
+_BLOCK_TAGS = frozenset('''address article aside blockquote body caption col colgroup dd details dialog div dl dt
+    fieldset figcaption figure footer form h1 h2 h3 h4 h5 h6 head header hr html legend li link main meta nav
+    ol optgroup option p pre script section style summary table tbody td tfoot th thead title tr ul
+    circle defs ellipse g line lineargradient path polygon polyline rect stop'''.split())
+_LEADING_WHITESPACE = re.compile(r'^\s*\n\s*')
+_TRAILING_WHITESPACE = re.compile(r'\s*\n\s*$')
+_LINE_WHITESPACE = re.compile(r'\s*\n\s*')
+# Indentation and blank lines in a script. The line breaks themselves stay.
+_SCRIPT_INDENTATION = re.compile(r'\n\s*')
+
+def _minify_markup(markup: str) -> str:
+    """Removes the line breaks and indentation that browsers ignore.
+
+    Whitespace with a line break in it is dropped next to a block-level tag (and at either end of the
+    markup) and becomes a single space everywhere else, which renders the same. Styles are collapsed onto
+    one line and scripts lose their indentation. <pre> and <textarea> are left as they are.
+    """
+    parts = _RAW_TEXT.split(markup)
+    minified = []
+
+    # split() returns text, raw element, raw element's tag name, text, ...
+    for i in range(0, len(parts), 3):
+        before = parts[i - 1].lower() if i > 0 else None
+        after = parts[i + 2].lower() if i + 2 < len(parts) else None
+        minified.append(_minify_text(parts[i], before, after))
+
+        if i + 1 < len(parts):
+            raw = parts[i + 1]
+            tag = parts[i + 2].lower()
+
+            if tag == 'style':
+                raw = _LINE_WHITESPACE.sub(' ', raw)
+            elif tag == 'script' and '`' not in raw and '\\\n' not in raw:
+                # Template literals and continued strings would keep the indentation as part of their value
+                raw = _SCRIPT_INDENTATION.sub('\n', raw)
+
+            minified.append(raw)
+
+    return ''.join(minified)
+
+def _minify_text(markup: str, before: str, after: str) -> str:
+    # before and after are the names of the raw elements around this markup, or None at the ends of the template
+    tokens = _TAG.split(markup)
+
+    # split() returns text, tag, text, ... The tags are looked at by name.
+    names = [None if i % 2 == 0 else _tag_name(token) for i, token in enumerate(tokens)]
+    minified = []
+
+    for i, token in enumerate(tokens):
+        if i % 2 == 1:
+            minified.append(_LINE_WHITESPACE.sub(' ', token))
+            continue
+
+        previous = names[i - 1] if i > 0 else before
+        following = names[i + 1] if i + 1 < len(tokens) else after
+
+        if token.isspace() and '\n' in token:
+            # Only whitespace between two tags. It goes if either of them is block-level.
+            minified.append('' if _drops_whitespace(previous) or _drops_whitespace(following) else ' ')
+            continue
+
+        token = _LEADING_WHITESPACE.sub('' if _drops_whitespace(previous) else ' ', token)
+        token = _TRAILING_WHITESPACE.sub('' if _drops_whitespace(following) else ' ', token)
+        minified.append(_LINE_WHITESPACE.sub(' ', token))
+
+    return ''.join(minified)
+
+def _tag_name(tag: str) -> str:
+    # Comments and doctypes count as block-level, so whitespace next to them goes
+    match = _TAG_NAME.match(tag)
+    return match.group(1).lower() if match else 'div'
+
+def _drops_whitespace(name: str) -> bool:
+    return name is None or name in _BLOCK_TAGS
+
+def _compile_template(template: str, name: str = 'template'):
+    """Compiles a component template into a render_into function.
+
+    The static segments become constants of the generated function, so rendering only fetches
+    the slot attributes and extends the output list with one tuple per run of segments.
+    """
+    parts = _TEMPLATE_SLOT.split(template)
+    namespace = {}
+    body = []
+    pending = []
+
+    def flush():
+        if len(pending) == 1:
+            body.append('out.append(' + pending[0] + ')')
+        elif pending:
+            body.append('out += (' + ', '.join(pending) + ')')
+        pending.clear()
+
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            if part != '':
+                namespace['_s' + str(i)] = part
+                pending.append('_s' + str(i))
+        elif part == 'components':
+            flush()
+            body.append('self._render_components_into(out)')
+        else:
+            pending.append('self.' + part)
+    flush()
+
+    source = 'def render_into(self, out):\n    ' + '\n    '.join(body or ['pass']) + '\n'
+    exec(compile(source, '<' + name + ' template>', 'exec'), namespace)
+    return namespace['render_into']
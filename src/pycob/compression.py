@@ -0,0 +1,142 @@
+import gzip
+import hashlib
+import zlib
+
+# Optional. pip install brotli zstandard (or pycob[compression]) to offer them to browsers that accept them.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Bodies smaller than this aren't worth the Content-Encoding header and the client's decompression
+MIN_SIZE = 1024
+
+def available_encodings() -> list:
+    """Returns the encodings this server can produce, most preferred first."""
+    encodings = []
+
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+
+    encodings.append("gzip")
+    return encodings
+
+def negotiate(accept_encoding: str):
+    """Returns the encoding to use for a request's Accept-Encoding header, or None to send the body as is.
+
+    The client's q-values win. Between encodings it rates equally, the server's preference does.
+    """
+    accepted = {}
+
+    for item in (accept_encoding or "").split(","):
+        name, _, parameters = item.partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        parameters = parameters.strip()
+
+        if parameters.startswith("q="):
+            try:
+                q = float(parameters[2:])
+            except ValueError:
+                q = 0.0
+
+        if name:
+            accepted[name] = q
+
+    best = None
+    best_q = 0.0
+
+    for encoding in available_encodings():
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+
+        if q > best_q:
+            best, best_q = encoding, q
+
+    return best
+
+def compress(data: bytes, encoding: str, cached: bool = False) -> bytes:
+    """Compresses data with the given encoding.
+
+    Bodies that are stored in a render cache are compressed once and sent many times, so they get the
+    slowest, smallest settings. Everything else uses settings cheap enough to run on every request.
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9 if cached else 6, mtime=0)
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if cached else 5)
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=19 if cached else 3).compress(data)
+
+    raise ValueError("Unsupported encoding: " + str(encoding))
+
+def compress_stream(chunks, encoding: str):
+    """Compresses a stream of chunks, flushing after each one so the browser can render what it has so far."""
+    if encoding == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+        yield compressor.flush()
+    elif encoding == "br":
+        compressor = brotli.Compressor(quality=5)
+
+        for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+
+        yield compressor.finish()
+    elif encoding == "zstd":
+        compressor = zstandard.ZstdCompressor(level=3).compressobj()
+
+        for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+        yield compressor.flush()
+    else:
+        raise ValueError("Unsupported encoding: " + str(encoding))
+
+class PageBody:
+    """A rendered page and its compressed variants, each made the first time a client asks for it.
+
+    Render caches store these, so a cached page is compressed once per encoding and hashed once for its
+    ETag instead of once per hit.
+    """
+    __slots__ = ('data', 'cached', 'variants', 'digest', 'keep_alive')
+
+    def __init__(self, data: bytes, cached: bool = False, keep_alive: tuple = ()):
+        self.data = data
+        self.cached = cached
+        self.variants = {}
+        self.digest = None
+        # Objects the page's HTML refers to, e.g. its lazy components, kept for as long as the body is cached
+        self.keep_alive = keep_alive
+
+    def etag(self, encoding: str) -> str:
+        """Returns a strong ETag for the body as sent with the given encoding (None for uncompressed)."""
+        if self.digest is None:
+            self.digest = hashlib.blake2b(self.data, digest_size=16).hexdigest()
+
+        # Each encoding is a different sequence of bytes, so it gets its own tag
+        if encoding is None:
+            return self.digest
+
+        return self.digest + "-" + encoding
+
+    def encode(self, encoding: str) -> bytes:
+        if encoding is None:
+            return self.data
+
+        variant = self.variants.get(encoding)
+
+        if variant is None:
+            variant = compress(self.data, encoding, self.cached)
+            self.variants[encoding] = variant
+
+        return variant
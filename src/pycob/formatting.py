@@ -0,0 +1,350 @@
+"""Formats values for display in tables, a whole column at a time.
+
+Dates are formatted using ISO-8601, without the time of day at midnight. Numbers below 10 have 2 decimal
+places, between 10 and 100 1 decimal place and between 100 and 1000 none. Numbers between 1000 and 1000000
+have a comma as the thousands separator. Numbers between 1000000 and 1000000000 are shown as X.Y million
+and larger ones as X.Y billion. Integers below 100 are shown as they are. Missing values (None, NaN, NaT,
+pd.NA, Arrow and Polars nulls) are shown as N/A. Long text is truncated behind a "more" button.
+"""
+import bisect
+import datetime
+import numbers
+import sys
+
+# Optional. Columns can only be formatted in bulk when NumPy is installed, which it is wherever pandas is.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+MISSING = "N/A"
+
+# Text longer than this is truncated behind a "more" button
+MAX_TEXT_LENGTH = 100
+
+# A number's bucket is the number of these it is greater than or equal to
+THRESHOLDS = (10, 100, 1000, 1000000, 1000000000)
+
+def string_format_with_more(text: str, max_length: int) -> str:
+    if len(text) > max_length:
+        return text[0:max_length] + f'... <button data-text-full="{text}" data-text-truncated="{text[0:max_length]}..." onclick="toggleMore(this)" class="text-blue-500">more</button>'
+    else:
+        return text
+
+def _format_small_int(value) -> str:
+    return string_format_with_more(str(value), 10)
+
+_THRESHOLD_ARRAY = np.array(THRESHOLDS, dtype=float) if np is not None else None
+
+# (format, divisor) for each bucket
+_FLOAT_FORMATS = (('{:.2f}'.format, 1), ('{:.1f}'.format, 1), ('{:.0f}'.format, 1), ('{:,.0f}'.format, 1),
+    ('{:.1f} million'.format, 1000000), ('{:.1f} billion'.format, 1000000000))
+_INT_FORMATS = ((_format_small_int, 1), (_format_small_int, 1)) + _FLOAT_FORMATS[2:]
+
+def format_value(value) -> str:
+    """Formats a single value for display."""
+    if _is_missing(value):
+        return MISSING
+
+    if isinstance(value, bool) or (np is not None and isinstance(value, np.bool_)):
+        return str(value)
+
+    if isinstance(value, numbers.Integral):
+        format, divisor = _INT_FORMATS[bisect.bisect_right(THRESHOLDS, value)]
+        return format(value if divisor == 1 else value / divisor)
+
+    if isinstance(value, numbers.Real):
+        format, divisor = _FLOAT_FORMATS[bisect.bisect_right(THRESHOLDS, value)]
+        return format(value if divisor == 1 else value / divisor)
+
+    if callable(getattr(value, "isoformat", None)):
+        iso = value.isoformat()
+
+        if "T00:00:00" in iso:
+            return iso[0:10]
+
+        return iso
+
+    return _format_text(str(value))
+
+def format_column(column) -> list:
+    """Formats every value of a column for display, like format_value() but a dtype at a time.
+
+    Takes a pandas Series or Index, a NumPy array, a list, a pyarrow Array or ChunkedArray or a Polars
+    Series. Numbers are put in their buckets with one searchsorted() over the whole column and each
+    bucket is formatted with a single format method. Datetimes become ISO strings in NumPy. Categoricals
+    and dictionary-encoded columns format each category once. Object columns are split by the type of
+    their values. Missing values are found up front and shown as N/A.
+
+    >>> format_column([datetime.datetime(1, 1, 1, 3), datetime.datetime(9999, 12, 31, 23, 59, 59, 999999), datetime.datetime(2500, 6, 1)])
+    ['0001-01-01T03:00:00', '9999-12-31T23:59:59.999999', '2500-06-01']
+    """
+    pa, pl = _arrow_modules()
+
+    if pa is not None and isinstance(column, (pa.Array, pa.ChunkedArray)):
+        return _format_arrow(pa, column)
+
+    if pl is not None and isinstance(column, pl.Series):
+        return _format_polars(pl, column)
+
+    if pd is not None and isinstance(column, pd.Index):
+        column = pd.Series(column, copy=False)
+
+    dtype = getattr(column, "dtype", None)
+
+    if dtype is None:
+        return _format_objects(_object_array(column))
+
+    if isinstance(dtype, np.dtype):
+        values = column.to_numpy() if hasattr(column, "to_numpy") else np.asarray(column)
+        return _format_array(values)
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        categories = np.array(format_column(column.cat.categories) + [MISSING], dtype=object)
+        # Missing values have code -1, which picks the MISSING added at the end
+        return categories[column.cat.codes.to_numpy()].tolist()
+
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        return _format_datetimes_with_timezone(column)
+
+    numpy_dtype = getattr(dtype, "numpy_dtype", None)
+
+    if numpy_dtype is not None and numpy_dtype.kind in "iufbM":
+        # Nullable and Arrow-backed columns. The missing values are filled in and then replaced.
+        missing = np.asarray(column.isna())
+
+        if numpy_dtype.kind == "M":
+            values = column.to_numpy(dtype=numpy_dtype, na_value=np.datetime64("NaT"))
+        else:
+            values = column.to_numpy(dtype=numpy_dtype, na_value=0)
+
+        return _format_with_missing(values, missing)
+
+    return _format_objects(column.to_numpy(dtype=object))
+
+def _arrow_modules() -> tuple:
+    # pyarrow and Polars, if they have been imported. A column can only come from one of them if it
+    # has, so they never have to be imported here.
+    return sys.modules.get("pyarrow"), sys.modules.get("polars")
+
+def _format_arrow(pa, column) -> list:
+    # Numbers, booleans, dates and datetimes without a time zone are read from the column's buffers into
+    # NumPy. Everything else is converted to Python objects.
+    arrow_type = column.type
+
+    if pa.types.is_dictionary(arrow_type):
+        return _format_arrow_dictionary(pa, column)
+
+    numeric = pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type) or pa.types.is_boolean(arrow_type)
+
+    if not (numeric or pa.types.is_date(arrow_type) or (pa.types.is_timestamp(arrow_type) and arrow_type.tz is None)):
+        return _format_objects(_object_array(column.to_pylist()))
+
+    if column.null_count == 0:
+        return _format_array(_arrow_to_numpy(pa, column))
+
+    missing = _arrow_to_numpy(pa, column.is_null())
+
+    # Integers with nulls would become floats. Dates and datetimes become NaT by themselves.
+    if numeric:
+        column = column.fill_null(False if pa.types.is_boolean(arrow_type) else 0)
+
+    return _format_with_missing(_arrow_to_numpy(pa, column), missing)
+
+def _format_arrow_dictionary(pa, column) -> list:
+    # Like categoricals, each chunk's dictionary is formatted once and looked up by index
+    formatted = []
+
+    for chunk in (column.chunks if isinstance(column, pa.ChunkedArray) else [column]):
+        # The MISSING at the end keeps index 0 valid when the dictionary is empty and every value is missing
+        dictionary = np.array(format_column(chunk.dictionary) + [MISSING], dtype=object)
+        formatted_chunk = dictionary[_arrow_to_numpy(pa, chunk.indices.fill_null(0))]
+
+        if chunk.null_count > 0:
+            formatted_chunk[_arrow_to_numpy(pa, chunk.is_null())] = MISSING
+
+        formatted.extend(formatted_chunk.tolist())
+
+    return formatted
+
+def _arrow_to_numpy(pa, column):
+    if isinstance(column, pa.ChunkedArray):
+        return column.to_numpy()
+
+    return column.to_numpy(zero_copy_only=False)
+
+def _format_polars(pl, column) -> list:
+    dtype = column.dtype
+
+    if not (dtype.is_numeric() or dtype == pl.Boolean or dtype == pl.Date or (isinstance(dtype, pl.Datetime) and dtype.time_zone is None)):
+        return _format_objects(_object_array(column.to_list()))
+
+    if column.null_count() == 0:
+        return _format_array(column.to_numpy())
+
+    missing = column.is_null().to_numpy()
+
+    # Integers with nulls would become floats. Dates and datetimes become NaT by themselves.
+    if dtype.is_numeric() or dtype == pl.Boolean:
+        column = column.fill_null(False if dtype == pl.Boolean else 0)
+
+    return _format_with_missing(column.to_numpy(), missing)
+
+def _format_with_missing(values, missing) -> list:
+    # The missing values have been filled in with placeholders, which are formatted and then replaced
+    formatted = np.array(_format_array(values), dtype=object)
+    formatted[missing] = MISSING
+    return formatted.tolist()
+
+def _format_array(values) -> list:
+    kind = values.dtype.kind
+
+    if kind in "iu":
+        return _format_numbers(values, _INT_FORMATS)
+
+    if kind == "f":
+        return _format_numbers(values, _FLOAT_FORMATS)
+
+    if kind == "b":
+        return np.where(values, "True", "False").tolist()
+
+    if kind == "M":
+        return _format_datetimes(values)
+
+    if kind == "m" and pd is not None:
+        # pd.Timedelta has isoformat(), the datetime.timedelta that astype(object) would give doesn't
+        return list(map(format_value, pd.TimedeltaIndex(values).tolist()))
+
+    return _format_objects(values.astype(object))
+
+def _format_numbers(values, formats) -> list:
+    formatted = np.empty(len(values), dtype=object)
+    buckets = np.searchsorted(_THRESHOLD_ARRAY, values, side="right")
+
+    if values.dtype.kind == "f":
+        # NaN sorts after every threshold, so it would otherwise land in the billions
+        missing = np.isnan(values)
+        buckets[missing] = len(formats)
+        formatted[missing] = MISSING
+
+    for bucket, (format, divisor) in enumerate(formats):
+        rows = np.flatnonzero(buckets == bucket)
+
+        if len(rows) == 0:
+            continue
+
+        selected = values[rows]
+
+        if divisor != 1:
+            selected = selected / divisor
+
+        formatted[rows] = list(map(format, selected.tolist()))
+
+    return formatted.tolist()
+
+def _format_datetimes(values) -> list:
+    # Like Timestamp.isoformat(), without the time of day at midnight
+    seconds = values.astype("datetime64[s]")
+    formatted = np.datetime_as_string(seconds, unit="s").astype(object)
+    midnight = seconds == seconds.astype("datetime64[D]")
+    formatted[midnight] = np.datetime_as_string(seconds[midnight], unit="D")
+
+    # isoformat() adds microseconds, or nanoseconds when there are any
+    fractional = (values != seconds) & ~midnight
+
+    if fractional.any():
+        microseconds = values.astype("datetime64[us]")
+        nanoseconds = fractional & (values != microseconds)
+        fractional &= ~nanoseconds
+        formatted[fractional] = np.datetime_as_string(microseconds[fractional], unit="us")
+
+        if nanoseconds.any():
+            formatted[nanoseconds] = np.datetime_as_string(values[nanoseconds].astype("datetime64[ns]"), unit="ns")
+
+    formatted[np.isnat(values)] = MISSING
+    return formatted.tolist()
+
+def _format_datetimes_with_timezone(column) -> list:
+    # The local time, followed by its UTC offset (e.g. +05:30) unless it's midnight
+    local = column.dt.tz_localize(None).to_numpy()
+    utc = column.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()
+    formatted = np.array(_format_datetimes(local), dtype=object)
+    seconds = local.astype("datetime64[s]")
+    with_time = ~np.isnat(local) & (seconds != seconds.astype("datetime64[D]"))
+
+    offsets = ((local[with_time] - utc[with_time]) // np.timedelta64(1, "m")).astype(np.int64)
+    unique_offsets, positions = np.unique(offsets, return_inverse=True)
+    suffixes = np.array([_format_utc_offset(int(offset)) for offset in unique_offsets], dtype=object)
+    formatted[with_time] = formatted[with_time] + suffixes[positions]
+    return formatted.tolist()
+
+def _format_utc_offset(minutes: int) -> str:
+    sign = "-" if minutes < 0 else "+"
+    hours, minutes = divmod(abs(minutes), 60)
+    return "{}{:02d}:{:02d}".format(sign, hours, minutes)
+
+def _format_objects(values) -> list:
+    formatted = np.empty(len(values), dtype=object)
+    missing = np.asarray(pd.isna(values)) if pd is not None else np.array([_is_missing(value) for value in values], dtype=bool)
+    formatted[missing] = MISSING
+    present = np.flatnonzero(~missing)
+    value_types = list(map(type, values[present].tolist()))
+
+    # The values of each type in the column are formatted together
+    if len(set(value_types)) == 1:
+        groups = {value_types[0]: present}
+    else:
+        groups = {}
+
+        for row, value_type in zip(present.tolist(), value_types):
+            groups.setdefault(value_type, []).append(row)
+
+    for value_type, rows in groups.items():
+        formatted[rows] = _format_values_of_type(value_type, values[rows])
+
+    return formatted.tolist()
+
+def _format_values_of_type(value_type, values) -> list:
+    if value_type is str:
+        return list(map(_format_text, values.tolist()))
+
+    if issubclass(value_type, (bool, np.bool_)):
+        return list(map(str, values.tolist()))
+
+    if issubclass(value_type, (numbers.Integral, numbers.Real)):
+        numbers_array = np.array(values.tolist())
+
+        # Python ints too big for int64 stay objects
+        if numbers_array.dtype.kind in "iuf":
+            return _format_array(numbers_array)
+
+    if issubclass(value_type, datetime.datetime) and all(value.tzinfo is None for value in values.tolist()):
+        # Microseconds cover every year a datetime can have. Nanoseconds only go from 1677 to 2262.
+        return _format_datetimes(np.array(values.tolist(), dtype="datetime64[us]"))
+
+    if value_type is datetime.date:
+        return np.datetime_as_string(np.array(values.tolist(), dtype="datetime64[D]"), unit="D").tolist()
+
+    return list(map(format_value, values.tolist()))
+
+def _format_text(text: str) -> str:
+    if len(text) > MAX_TEXT_LENGTH:
+        return string_format_with_more(text, MAX_TEXT_LENGTH)
+
+    return text
+
+def _is_missing(value) -> bool:
+    if value is None or (isinstance(value, float) and value != value):
+        return True
+
+    return pd is not None and (value is pd.NA or value is pd.NaT)
+
+def _object_array(values):
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
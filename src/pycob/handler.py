@@ -1,9 +1,12 @@
 # Inspired by https://stackoverflow.com/a/40466535/3179416
 from flask import Flask, Response
 import flask
-from .request import Request
+from .request import Request, _run_page_function
 from .all_components import *
 from werkzeug.security import generate_password_hash, check_password_hash
+from .component_interface import _TEMPLATE_SLOT, _minify_markup
+from .compression import PageBody, MIN_SIZE, negotiate, compress_stream
+import html
 import traceback
 
 class LogoutHandler(object):
@@ -62,17 +65,66 @@ class SignupHandler(object):
         return flask.redirect("/auth/profile")
 
 class PageHandler(object):
-    def __init__(self, pycob_app, action, redirect_url, protect_with_code):
+    def __init__(self, pycob_app, action, redirect_url, protect_with_code, stream=False, cache=None, cache_key=None):
         self.action = action
         self.pycob_app = pycob_app
         self.redirect_url = redirect_url
         self.protect_with_code = protect_with_code
+        self.stream = stream
+        self.cache = cache
+        self.cache_key = cache_key or _default_cache_key
+        # Recorded by the lazy components, paginated tables and server-side grids the page makes
+        self.access = (redirect_url is not None, protect_with_code) if redirect_url is not None or protect_with_code is not None else None
         self.response = Response(status=200, headers={})
 
     def __call__(self, *args):
+        response = flask.make_response(self._respond())
+
+        # Fragment responses have the page's URL, so caches must tell them apart from the page by this header
+        response.vary.add("X-Pycob-Fragment")
+        return response
+
+    def _respond(self):
         request = Request(flask.request, self.pycob_app)
 
-        if self.pycob_app.error is not None:
+        if self.redirect_url is not None:
+            username = request.get_username()
+
+            if username is None or username == "":                
+                return flask.redirect("/auth/login?redirect=" + self.redirect_url)
+
+        key = None
+        failed = False
+        fragment_id = request.get_fragment_id()
+        locked = False
+
+        # Checked before the cache so a cache_key that ignores the query can't serve the page without the code
+        if self.protect_with_code is not None:
+            login_code = request.get_query_parameter("login_code")
+            locked = login_code is None or login_code != str(self.protect_with_code)
+
+        # Fragment responses are small and only asked for after a form submit, so they skip the page cache.
+        # So do form submits themselves, which have to run the page function for its side effects.
+        # The code page is never cached.
+        if self.cache is not None and self.pycob_app.error is None and not locked and fragment_id == "" and flask.request.method in ("GET", "HEAD"):
+            key = self.cache_key(request)
+            body = self.cache.get(key)
+
+            if body is not None:
+                return _page_response(self.pycob_app, body)
+
+        if locked:
+            page = Page("Enter Code")
+            card = page.add_card()
+            card.add_header("Enter Code", size=5)
+            if login_code != "" and login_code != str(self.protect_with_code):
+                card.add_alert("Incorrect Code", "Error", color="red")
+            card.add_text("Contact the developer of this site to give you a code for access")
+            form = card.add_form(action="?")
+
+            form.add_formtext("Code", "login_code", "Code from the developer")
+            form.add_formsubmit('Enter')
+        elif self.pycob_app.error is not None:
             page = Page("Error")
             card = page.add_card()
             card.add_header("Error", size=5)
@@ -80,74 +132,312 @@ class PageHandler(object):
             card.add_alert(str(self.pycob_app.error), "Error", color="red")
         else:            
             try:
-                page = self.action(request)
+                page = _run_page_function(self.action, request, self.access)
             except Exception as e:
+                failed = True
                 page = Page("Error")
-                card = page.add_card()
-                card.add_header("Error", size=5)
-                card.add_text("An error occured while trying to load this page.")
-                card.add_alert(str(e), "Error", color="red")
-
-                for i, x in enumerate(traceback.TracebackException.from_exception(e).format()):
-                    if i > 1:
-                        card.add_code(x, header="Traceback", prefix="")
+                page.add_component(_error_card(e))
 
         if page is None:
             raise ValueError(f'Did you forget to return the page at the end of the {self.action.__name__} function?')
 
-        if self.redirect_url is not None:
-            username = request.get_username()
+        if fragment_id != "":
+            fragment = page.find_fragment(fragment_id)
 
-            if username is None or username == "":                
-                return flask.redirect("/auth/login?redirect=" + self.redirect_url)
-
-        if self.protect_with_code is not None:
-            login_code = request.get_query_parameter("login_code")
-            
-            if login_code is None or login_code != str(self.protect_with_code):
-                page = Page("Enter Code")
-                card = page.add_card()
-                card.add_header("Enter Code", size=5)
-                if login_code != "" and login_code != str(self.protect_with_code):
-                    card.add_alert("Incorrect Code", "Error", color="red")
-                card.add_text("Contact the developer of this site to give you a code for access")
-                form = card.add_form(action="?")
-
-                form.add_formtext("Code", "login_code", "Code from the developer")
-                form.add_formsubmit('Enter')
+            if fragment is None:
+                # Error and code pages don't have the fragment. The browser falls back to loading the whole page.
+                return "", 404
 
+            return _page_response(self.pycob_app, PageBody(_get_asset_scripts(fragment.collect_assets()) + fragment.to_html().encode("utf-8")))
 
         # if flask.request.accept_mimetypes['application/json'] and (not flask.request.accept_mimetypes['text/html']):
         #     json_response = page._to_json()
         #     print(json_response)
         #     return json_response, '200 OK', {'Content-Type': 'application/json'}
 
-        html = ""
+        errors = []
+        chunks = _render_document(self.pycob_app, page, request, errors)
+
+        # Error pages are never cached so the next request retries the page function
+        cache = key is not None and not failed
+
+        if self.stream:
+            if cache:
+                chunks = _cache_chunks(chunks, self.cache, key, _find_lazy_components(page), errors)
+
+            # Send the head and navbar right away and each top-level component as soon as it is rendered
+            return _stream_response(self.pycob_app, chunks)
+
+        data = b"".join(chunks)
+        # Nor are pages whose components failed to render
+        cache = cache and len(errors) == 0
+        body = PageBody(data, cached=cache, keep_alive=_find_lazy_components(page) if cache else ())
+
+        if cache:
+            self.cache.set(key, body)
+
+        return _page_response(self.pycob_app, body)
+
+class StylesheetHandler(object):
+    def __init__(self, css: bytes):
+        self.css = css
+
+    def __call__(self, *args):
+        # The URL has the content hash in it, so browsers can keep the file until the app ships a new one
+        return Response(self.css, mimetype="text/css", headers={"Cache-Control": "public, max-age=31536000, immutable"})
+
+class FragmentHandler(object):
+    def __init__(self, pycob_app):
+        self.pycob_app = pycob_app
+
+    def __call__(self, fragment_id: str):
+        fragment = LazyComponent.fragments.get(fragment_id)
+
+        if fragment is None:
+            # Lazy components in a frozen subtree or a cached page outlive the fragment cache
+            lazy = LazyComponent.live.get(fragment_id)
+            fragment = None if lazy is None else (lazy.func, lazy._access)
+
+        if fragment is None:
+            return AlertComponent("This section has expired. Reload the page to see it.", "Expired", color="orange").to_html(), 404
+
+        func, access = fragment
+        request = Request(flask.request, self.pycob_app)
+
+        if not _is_allowed(access, request):
+            return "", 403
+
+        try:
+            # Lazy components inside it get the page's access rule too
+            component = _run_page_function(func, request, access)
+        except Exception as e:
+            component = AlertComponent(str(e), "Error", color="red")
+
+        if component is None:
+            raise ValueError(f'Did you forget to return the component at the end of the {func.__name__} function?')
+
+        # The page only loaded the libraries of its own components, so send the ones this component needs along with it
+        return _page_response(self.pycob_app, PageBody(_get_asset_scripts(component.collect_assets()) + component.to_html().encode("utf-8")))
+
+class TableHandler(object):
+    def __init__(self, pycob_app):
+        self.pycob_app = pycob_app
+
+    def __call__(self, table_id: str):
+        # Rows of a table added with add_pandastable(..., page_size=N), starting at offset
+        offset = max(flask.request.args.get("offset", 0, type=int), 0)
+        limit = min(max(flask.request.args.get("limit", 100, type=int), 0), _MAX_TABLE_ROWS)
+
+        if not _is_allowed(advanced_pandastable_access(table_id), Request(flask.request, self.pycob_app)):
+            return "", 403
+
+        rows = advanced_pandastable_rows(table_id, offset, limit)
+
+        if rows is None:
+            return "", 404
+
+        return _page_response(self.pycob_app, PageBody(rows.encode("utf-8")))
+
+class DatagridHandler(object):
+    def __init__(self, pycob_app):
+        self.pycob_app = pycob_app
+
+    def __call__(self, grid_id: str):
+        # A block of rows of a data grid added with add_datagrid(..., server_side=True). The body is the
+        # startRow, endRow, sortModel and filterModel of ag-grid's getRows request.
+        if not _is_allowed(advanced_datagrid_access(grid_id), Request(flask.request, self.pycob_app)):
+            return "", 403
+
+        query = flask.request.get_json(silent=True)
+
+        if not isinstance(query, dict):
+            return "", 400
+
+        try:
+            start = max(int(query.get("startRow") or 0), 0)
+            end = min(max(int(query.get("endRow") or 0), start), start + _MAX_TABLE_ROWS)
+        except (TypeError, ValueError):
+            return "", 400
+
+        sort_model = query.get("sortModel") or []
+        filter_model = query.get("filterModel") or {}
+
+        if not isinstance(sort_model, list) or not isinstance(filter_model, dict):
+            return "", 400
+
+        rows = advanced_datagrid_rows(grid_id, start, end, [sort for sort in sort_model if isinstance(sort, dict)], filter_model)
+
+        if rows is None:
+            return "", 404
+
+        return _page_response(self.pycob_app, PageBody(rows.encode("utf-8")), mimetype="application/json")
+
+# The most rows a single request to TableHandler or DatagridHandler can ask for
+_MAX_TABLE_ROWS = 10000
+
+def _is_allowed(access, request: Request) -> bool:
+    # Whether the request may see a fragment, table or grid made by a page with the given access rule.
+    # The scripts that fetch them send the page's query string along, with the login code in it.
+    if access is None:
+        return True
+
+    require_login, protect_with_code = access
+
+    if require_login and (request.get_username() is None or request.get_username() == ""):
+        return False
+
+    return protect_with_code is None or request.params("login_code") == str(protect_with_code)
+
+def _default_cache_key(request: Request):
+    # The path and the whole query string. Only GET and HEAD requests are cached, so there is no form data.
+    return (request.flask_request.full_path, request.get_username())
+
+def _cache_chunks(chunks, cache, key, keep_alive: tuple, errors: list):
+    rendered = []
+
+    for chunk in chunks:
+        rendered.append(chunk)
+        yield chunk
+
+    if len(errors) == 0:
+        cache.set(key, PageBody(b"".join(rendered), cached=True, keep_alive=keep_alive))
+
+def _error_card(e: Exception) -> CardComponent:
+    card = CardComponent()
+    card.add_header("Error", size=5)
+    card.add_text("An error occured while trying to load this page.")
+    card.add_alert(str(e), "Error", color="red")
+
+    for i, x in enumerate(traceback.TracebackException.from_exception(e).format()):
+        if i > 1:
+            card.add_code(x, header="Traceback", prefix="")
+
+    return card
+
+def _find_lazy_components(component) -> tuple:
+    # The lazy components of a page, which its cached body keeps alive so their fragments can still be loaded
+    found = []
+    level = [component]
 
-        html += _tailwind_header_to_sidebar(page.title, page.description, page.image, flask.request.url)
+    while level:
+        found.extend(child for child in level if isinstance(child, LazyComponent))
+        level = [child for parent in level for child in parent._child_components]
 
-        if page.auto_navbar:
-            html += get_navbar_html(self.pycob_app, request.get_username())
+    return tuple(found)
 
-        # Add a sidebar here
-        sidebar = _get_sidebar(page.components)
-        if len(sidebar.components) > 0:
-            html += '''<div class="flex">'''
-            html += sidebar.to_html()
+def _page_response(pycob_app, body: PageBody, mimetype: str = "text/html") -> Response:
+    encoding = _negotiate_encoding(pycob_app) if len(body.data) >= MIN_SIZE else None
+    etag = body.etag(encoding)
 
-        html += page.to_html()
+    # The browser already has this exact page (e.g. a dashboard being polled), so don't send it again.
+    # If-None-Match uses the weak comparison (RFC 7232), so it still matches after a compressing proxy
+    # has turned the tag into W/"...".
+    if flask.request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        _set_content_encoding(response, pycob_app, None)
+        return response
 
-        if len(sidebar.components) > 0:
-            html += "</div>"
+    response = Response(body.encode(encoding), mimetype=mimetype)
+    response.set_etag(etag)
+    _set_content_encoding(response, pycob_app, encoding)
+    return response
 
-        if page.auto_footer:
-            html += get_footer_html(self.pycob_app)
+def _stream_response(pycob_app, chunks) -> Response:
+    encoding = _negotiate_encoding(pycob_app)
 
-        html += _tailwind_body_end
+    if encoding is not None:
+        chunks = compress_stream(chunks, encoding)
 
-        return html
+    response = Response(flask.stream_with_context(chunks), mimetype="text/html")
+    _set_content_encoding(response, pycob_app, encoding)
+    return response
+
+def _negotiate_encoding(pycob_app):
+    if not pycob_app.compress:
+        return None
+
+    return negotiate(flask.request.headers.get("Accept-Encoding", ""))
+
+def _set_content_encoding(response: Response, pycob_app, encoding: str):
+    if pycob_app.compress:
+        response.vary.add("Accept-Encoding")
+
+    if encoding is not None:
+        response.headers["Content-Encoding"] = encoding
+
+def _render_document(pycob_app, page, request, errors: list = None):
+    # Chunks are UTF-8 bytes, so they can be streamed or joined as they are. Errors raised while the
+    # components render are added to errors.
+    chrome = _get_page_chrome(pycob_app)
+    yield _tailwind_head(chrome, page.title, page.description, page.image, flask.request.url, _get_asset_scripts(page.collect_assets()))
+
+    if page.auto_navbar:
+        yield _get_navbar_bytes(pycob_app, request.get_username())
+
+    # Add a sidebar here
+    sidebar = _get_sidebar(page.components)
+    if len(sidebar.components) > 0:
+        yield b'''<div class="flex">'''
+        yield sidebar.to_html().encode("utf-8")
+
+    try:
+        for chunk in page.iter_html():
+            yield chunk.encode("utf-8")
+    except Exception as e:
+        # Components can fail after the page function has returned, e.g. a table whose database connection
+        # was closed before the rest of its rows were read. Whatever was sent stays and the error follows it.
+        if errors is not None:
+            errors.append(e)
+
+        yield _error_card(e).to_html().encode("utf-8")
+
+    if len(sidebar.components) > 0:
+        yield b"</div>"
+
+    if page.auto_footer:
+        yield chrome["footer"]
+
+    yield chrome["body_end"]
 
 def get_navbar_html(pycob_app, username: str):
+    return _get_navbar_bytes(pycob_app, username).decode("utf-8")
+
+def get_footer_html(pycob_app):
+    return _get_page_chrome(pycob_app)["footer"].decode("utf-8")
+
+def _get_navbar_bytes(pycob_app, username: str) -> bytes:
+    chrome = _get_page_chrome(pycob_app)
+
+    if username == "" or username is None:
+        return chrome["navbar"]
+
+    before, after = chrome["navbar_parts"]
+    return before + username.encode("utf-8") + after
+
+# Stands in for the username while the signed-in navbar is rendered, so it can be spliced in per request
+_USERNAME_SLOT = "\x00username\x00"
+
+def _get_page_chrome(pycob_app) -> dict:
+    # The navbar and footer only depend on the registered pages, so they are rendered (and encoded) once
+    # and again only after register_function()/add_page() reset pycob_app.page_chrome
+    chrome = pycob_app.page_chrome
+
+    if chrome is None:
+        chrome = {
+            "navbar": _build_navbar(pycob_app, None).to_html().encode("utf-8"),
+            "navbar_parts": tuple(part.encode("utf-8") for part in _build_navbar(pycob_app, _USERNAME_SLOT).to_html().split(_USERNAME_SLOT)),
+            "footer": _build_footer(pycob_app).to_html().encode("utf-8"),
+            "stylesheet": (_minify_markup(_tailwind_cdn.decode("utf-8")).encode("utf-8") if pycob_app.minify_html else _tailwind_cdn)
+                if pycob_app.stylesheet_url is None else b'<link rel="stylesheet" href="' + pycob_app.stylesheet_url.encode("utf-8") + b'">',
+            "head_parts": _split_template(_minify_markup(_tailwind_head_template)) if pycob_app.minify_html else _tailwind_head_parts,
+            "body_end": b"</body></html>" if pycob_app.minify_html else _tailwind_body_end,
+        }
+        pycob_app.page_chrome = chrome
+
+    return chrome
+
+def _build_navbar(pycob_app, username: str) -> NavbarComponent:
     if username == "" or username is None:
         navbar = NavbarComponent(pycob_app.name, "https://cdn.pycob.com/pycob_hex.png")
     else:
@@ -157,9 +447,9 @@ def get_navbar_html(pycob_app, username: str):
         if page_dict['show_in_navbar']:
             navbar.add_plainlink(page_dict['page_name'], "/" + page_path, "block rounded-lg py-2 pl-3 pr-4 text-white hover:bg-blue-800 md:p-2")
 
-    return navbar.to_html()
+    return navbar
 
-def get_footer_html(pycob_app):
+def _build_footer(pycob_app) -> FooterComponent:
     footer = FooterComponent(pycob_app.name, pycob_app.subtitle, "https://cdn.pycob.com/pycob_hex.png")
 
     categorized = {}
@@ -175,7 +465,7 @@ def get_footer_html(pycob_app):
         footercategory = FootercategoryComponent(category_name, components=footerlinks)
         footer.add_component(footercategory)
 
-    return footer.to_html()
+    return footer
 
 def _get_sidebar(components) -> SidebarComponent:
     sidebar = SidebarComponent()
@@ -198,8 +488,19 @@ def _get_sidebar(components) -> SidebarComponent:
 
     return sidebar
 
-def _tailwind_header_to_sidebar(title: str, description: str, image: str, url: str) -> str:
-    html = '''
+def _tailwind_head(chrome: dict, title: str, description: str, image: str, url: str, scripts: bytes = b"") -> bytes:
+    # The static markup is encoded once, with the page chrome. Only the escaped meta fields are encoded per request.
+    parts = chrome["head_parts"]
+    return b"".join((parts[0], _encode_attribute(title), parts[2], _encode_attribute(title), parts[4], _encode_attribute(description),
+        parts[6], _encode_attribute(image), parts[8], _encode_attribute(url), parts[10], chrome["stylesheet"], parts[12], scripts, parts[14]))
+
+def _split_template(template: str) -> list:
+    return [part.encode("utf-8") for part in _TEMPLATE_SLOT.split(template)]
+
+def _encode_attribute(value: str) -> bytes:
+    return html.escape(value).encode("utf-8")
+
+_tailwind_head_template = '''
     <!doctype html>
     <html>
     <head>
@@ -213,26 +514,12 @@ def _tailwind_header_to_sidebar(title: str, description: str, image: str, url: s
     <meta name="msapplication-config" content="https://cdn.pycob.com/browserconfig.xml">
     <meta name="theme-color" content="#ffffff">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>''' + title + '''</title>
-    <meta property="og:title" content="''' + title + '''">
-    <meta property="og:description" content="''' + description + '''">
-    <meta property="og:image" content="''' + image + '''">
-    <meta property="og:url" content="''' + url + '''">
-    <script src="https://cdn.tailwindcss.com"></script>
-    <script src="https://unpkg.com/ag-grid-community/dist/ag-grid-community.min.js"></script>
-    <script src="https://cdn.plot.ly/plotly-2.18.2.min.js"></script>
-    <script>
-        tailwind.config = {
-            theme: {
-                extend: {
-                    colors: {
-                        clifford: '#da373d',
-                    }
-                }
-            },
-            darkMode: 'class'
-        }
-    </script>
+    <title>{{title}}</title>
+    <meta property="og:title" content="{{title}}">
+    <meta property="og:description" content="{{description}}">
+    <meta property="og:image" content="{{image}}">
+    <meta property="og:url" content="{{url}}">
+    {{stylesheet}}{{scripts}}
     <script>
         function toggleDarkMode() {
             if (document.documentElement.classList.contains('dark')) {
@@ -260,6 +547,121 @@ def _tailwind_header_to_sidebar(title: str, description: str, image: str, url: s
             }, "10000")
         }
 
+        function swapHtml(el, html) {
+            const container = document.createElement("div")
+            container.innerHTML = html
+
+            const loaded = new Set(Array.from(document.scripts).map((script) => script.src).filter((src) => src))
+            const scripts = Array.from(container.querySelectorAll("script"))
+            el.replaceWith(...container.childNodes)
+
+            // Scripts inserted through innerHTML don't run, so replace them with fresh copies. They run one
+            // at a time so inline scripts can use the libraries loaded before them. Libraries the page
+            // already has are skipped.
+            return scripts.reduce((previous, oldScript) => previous.then(() => new Promise((resolve) => {
+                if (oldScript.src && loaded.has(oldScript.src)) {
+                    oldScript.remove()
+                    return resolve()
+                }
+
+                const script = document.createElement("script")
+                Array.from(oldScript.attributes).forEach((attribute) => script.setAttribute(attribute.name, attribute.value))
+                script.textContent = oldScript.textContent
+
+                if (script.src) {
+                    loaded.add(script.src)
+                    script.onload = script.onerror = resolve
+                }
+
+                oldScript.replaceWith(script)
+
+                if (!script.src) {
+                    resolve()
+                }
+            })), Promise.resolve())
+        }
+
+        function loadFragment(el, url) {
+            return fetch(url).then((response) => response.text()).then((html) => swapHtml(el, html))
+        }
+
+        function refreshFragment(id, url, init, fallback) {
+            url = url || window.location.href
+            init = Object.assign({}, init, { headers: { "X-Pycob-Fragment": id } })
+
+            return fetch(url, init).then((response) => {
+                const el = document.getElementById(id)
+
+                if (!response.ok || el === null) {
+                    // The page didn't render this fragment (e.g. it raised an error), so load it in full
+                    fallback ? fallback() : window.location.assign(url)
+                    return false
+                }
+
+                return response.text().then((html) => {
+                    swapHtml(el, html)
+                    return true
+                })
+            })
+        }
+
+        // Forms inside a fragment are submitted in the background and only the fragment is replaced
+        document.addEventListener("submit", (event) => {
+            const form = event.target
+            const fragment = form.closest("[data-pycob-fragment]")
+
+            if (fragment === null) {
+                return
+            }
+
+            event.preventDefault()
+            const data = new FormData(form)
+
+            if (form.method.toLowerCase() === "post") {
+                refreshFragment(fragment.id, form.action, { method: "POST", body: data }, () => form.submit())
+            } else {
+                const url = form.action.split("?")[0] + "?" + new URLSearchParams(data)
+                refreshFragment(fragment.id, url).then((swapped) => swapped && history.replaceState(null, "", url))
+            }
+        })
+
+        document.addEventListener("DOMContentLoaded", () => {
+            document.querySelectorAll("[data-pycob-lazy]").forEach((el) => {
+                loadFragment(el, "/_pycob/fragment/" + el.getAttribute("data-pycob-lazy") + window.location.search)
+            })
+        })
+
+        function loadTableRows(button) {
+            const id = button.getAttribute("data-pycob-table")
+            const offset = parseInt(button.getAttribute("data-offset"))
+            const limit = parseInt(button.getAttribute("data-limit"))
+            const total = parseInt(button.getAttribute("data-total"))
+            const status = button.parentElement.querySelector("[data-pycob-table-status]")
+            button.disabled = true
+
+            const params = new URLSearchParams(window.location.search)
+            params.set("offset", offset)
+            params.set("limit", limit)
+
+            fetch("/_pycob/table/" + id + "?" + params).then((response) => {
+                if (!response.ok) {
+                    throw new Error(response.status)
+                }
+
+                return response.text()
+            }).then((html) => {
+                const shown = Math.min(offset + limit, total)
+                button.parentElement.parentElement.querySelector("tbody[data-pycob-table-rows]").insertAdjacentHTML("beforeend", html)
+                button.setAttribute("data-offset", shown)
+                status.textContent = "Showing " + shown.toLocaleString("en-US") + " of " + total.toLocaleString("en-US") + " rows"
+                button.disabled = false
+                button.hidden = shown >= total
+            }).catch(() => {
+                status.textContent = "This table has expired. Reload the page to see more rows."
+                button.hidden = true
+            })
+        }
+
         function toggleMore(button) {
             x = button
 
@@ -309,11 +711,38 @@ def _tailwind_header_to_sidebar(title: str, description: str, image: str, url: s
     </head>
     <body class="flex flex-col h-screen dark:bg-gray-900 ">
 '''
-    return html
+
+_tailwind_head_parts = _split_template(_tailwind_head_template)
+
+# Script tags of the client libraries components can declare in their assets
+_asset_scripts = {
+    "ag-grid": b'''<script src="https://unpkg.com/ag-grid-community/dist/ag-grid-community.min.js"></script>''',
+    "plotly": b'''<script src="https://cdn.plot.ly/plotly-2.18.2.min.js"></script>''',
+    "ace": b'''<script src="https://cdn.jsdelivr.net/gh/ajaxorg/ace-builds/src-noconflict/ace.js" type="text/javascript" charset="utf-8"></script>''',
+}
+
+def _get_asset_scripts(assets: list) -> bytes:
+    # Assets that aren't known libraries are taken to be script URLs
+    return b"".join(b"\n    " + (_asset_scripts.get(asset) or b'<script src="' + _encode_attribute(asset) + b'"></script>') for asset in assets)
+
+# Compiles the Tailwind classes in the browser. Used unless the app has a stylesheet built with python -m pycob.tailwind.
+_tailwind_cdn = b'''<script src="https://cdn.tailwindcss.com"></script>
+    <script>
+        tailwind.config = {
+            theme: {
+                extend: {
+                    colors: {
+                        clifford: '#da373d',
+                    }
+                }
+            },
+            darkMode: 'class'
+        }
+    </script>'''
 
 
 
 _tailwind_body_end = '''            
         </body>
         </html>
-    '''
\ No newline at end of file
+    '''.encode("utf-8")
\ No newline at end of file
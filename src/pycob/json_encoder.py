@@ -0,0 +1,170 @@
+"""Encodes table columns as a JSON array of row objects, a column at a time.
+
+Data grids send their rows as [{"column": value, ...}, ...]. Building a dict per row and passing the list to
+json.dumps() costs a Python object per cell and holds every row twice. Here each column is encoded on its
+own: NumPy columns in bulk, lists of Python values through the standard library's C string escaper, and the
+rows are put together with a single format string. Rows are encoded a block at a time, so the memory used
+besides the result is bounded by the block size.
+
+NumPy scalars, datetimes, NaN and pandas' missing values are handled without a default= hook. NaN and the
+infinities are written like json.dumps() writes them, which JavaScript accepts, or as null when strict=True
+because JSON.parse() doesn't.
+"""
+import datetime
+import json
+import math
+from json.encoder import encode_basestring_ascii
+
+from .formatting import _is_missing
+
+# Optional. pip install orjson to encode numeric columns (and nested values) faster.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Rows encoded at a time
+BLOCK_SIZE = 10000
+
+def encode_records(keys: list, columns: list, strict: bool = False) -> str:
+    """Returns the JSON of the rows [{keys[0]: columns[0][i], ...} for each row i].
+
+    Columns are lists or NumPy arrays of equal length. Like a dict, a key that appears twice is written once,
+    at its first position, with the value of its last column. With strict=True, NaN and the infinities are
+    written as null.
+    """
+    # Key: position of its last column, in the order the keys first appear
+    positions = {}
+
+    for i, key in enumerate(keys):
+        positions[key] = i
+
+    if len(positions) == 0:
+        return "[]"
+
+    columns = [columns[i] for i in positions.values()]
+    # json.dumps() turns keys that aren't strings (e.g. numbers) into strings like it does for dicts
+    row_format = "{{" + ", ".join(json.dumps({key: 0})[1:-4].replace("{", "{{").replace("}", "}}") + ": {}" for key in positions) + "}}"
+    rows = len(columns[0])
+    blocks = []
+
+    for start in range(0, rows, BLOCK_SIZE):
+        encoded = [encode_column(column[start:start + BLOCK_SIZE], strict) for column in columns]
+        blocks.append(", ".join(map(row_format.format, *encoded)))
+
+    if len(blocks) == 0:
+        return "[]"
+
+    # The brackets go on the first and last blocks, so the rows are copied once, by the join
+    blocks[0] = "[" + blocks[0]
+    blocks[-1] += "]"
+    return ", ".join(blocks)
+
+def encode_column(values, strict: bool = False) -> list:
+    """Returns the JSON of each value of a list or NumPy array."""
+    if np is not None and isinstance(values, np.ndarray) and values.dtype.kind in "iufb":
+        return _encode_array(values, strict)
+
+    encode_float = _encode_float_strict if strict else _encode_float
+    encoders = _STRICT_ENCODERS if strict else _ENCODERS
+    encode_other = lambda value: _encode_other(value, encode_float)
+
+    # Exact types are looked up, subclasses and everything else go through _encode_other()
+    return [encoders.get(type(value), encode_other)(value) for value in values]
+
+def _encode_array(values, strict: bool) -> list:
+    kind = values.dtype.kind
+
+    if len(values) == 0:
+        return []
+
+    if kind == "b":
+        return np.where(values, "true", "false").tolist()
+
+    if orjson is not None and (strict or kind != "f" or np.isfinite(values).all()):
+        # orjson writes the whole column at once. Numbers have no commas in them, so it splits into values.
+        # It writes NaN as null, so columns with NaN only go through it when that is what's wanted.
+        # float32 is widened first, so both backends write the same values
+        array = np.ascontiguousarray(values, dtype=np.float64 if kind == "f" else None)
+
+        try:
+            return orjson.dumps(array, option=orjson.OPT_SERIALIZE_NUMPY)[1:-1].decode().split(",")
+        except orjson.JSONEncodeError:
+            pass
+
+    if kind in "iu":
+        return list(map(str, values.tolist()))
+
+    encoded = np.array(list(map(float.__repr__, values.tolist())), dtype=object)
+    non_finite = ~np.isfinite(values)
+
+    if non_finite.any():
+        encoded[non_finite] = list(map(_encode_float_strict if strict else _encode_float, values[non_finite].tolist()))
+
+    return encoded.tolist()
+
+def _encode_float(value: float) -> str:
+    # Like json.dumps()
+    if math.isfinite(value):
+        return float.__repr__(value)
+    if value != value:
+        return "NaN"
+
+    return "Infinity" if value > 0 else "-Infinity"
+
+def _encode_float_strict(value: float) -> str:
+    if math.isfinite(value):
+        return float.__repr__(value)
+
+    return "null"
+
+def _encode_other(value, encode_float) -> str:
+    if value is None:
+        return "null"
+
+    if isinstance(value, bool):
+        return "true" if value else "false"
+
+    if isinstance(value, int):
+        return int.__repr__(value)
+
+    if isinstance(value, float):
+        return encode_float(value)
+
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+
+    if np is not None and isinstance(value, np.generic):
+        # NumPy scalars, e.g. np.int64 in an object column
+        return _encode_other(value.item(), encode_float)
+
+    # pd.NA and pd.NaT. NaT is a datetime, so this comes first.
+    if _is_missing(value):
+        return "null"
+
+    if isinstance(value, (datetime.date, datetime.time)):
+        return encode_basestring_ascii(value.isoformat())
+
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+        except orjson.JSONEncodeError:
+            pass
+
+    # Lists, dicts and anything else json.dumps() knows, or its usual TypeError
+    return json.dumps(value)
+
+_ENCODERS = {
+    str: encode_basestring_ascii,
+    int: int.__repr__,
+    float: _encode_float,
+    bool: lambda value: "true" if value else "false",
+    type(None): lambda value: "null",
+}
+
+_STRICT_ENCODERS = {**_ENCODERS, float: _encode_float_strict}
@@ -1,3 +1,6 @@
+import asyncio
+import contextvars
+import functools
 import flask
 from typing import Union
 
@@ -38,6 +41,34 @@ class Request:
     def retrieve_secret(self, secret_name: str) -> str:
         return self.app.retrieve_secret(secret_name)
 
+    # Awaitable versions of the storage helpers for async page functions. Each call runs in a worker
+    # thread, so independent lookups can be awaited together with asyncio.gather().
+
+    async def store_dict_async(self, table_id: str, object_id: str, value: dict):
+        return await _run_in_thread(self.app.store_dict, table_id, object_id, value)
+
+    async def retrieve_dict_async(self, table_id: str, object_id: str) -> dict:
+        return await _run_in_thread(self.app.retrieve_dict, table_id, object_id)
+
+    async def delete_dict_async(self, table_id: str, object_id: str):
+        return await _run_in_thread(self.app.delete_dict, table_id, object_id)
+
+    async def query_dict_async(self, table_id: str, field_name: str, field_value) -> list:
+        return await _run_in_thread(self.app.query_dict, table_id, field_name, field_value)
+
+    async def list_object_ids_async(self, table_id: str) -> list:
+        return await _run_in_thread(self.app.list_object_ids, table_id)
+
+    async def list_objects_async(self, table_id: str) -> list:
+        return await _run_in_thread(self.app.list_objects, table_id)
+
+    async def retrieve_secret_async(self, secret_name: str) -> str:
+        return await _run_in_thread(self.app.retrieve_secret, secret_name)
+
+    def get_fragment_id(self) -> str:
+        """Returns the id of the fragment the browser asked to re-render, or "" when it asked for the whole page."""
+        return self.flask_request.headers.get("X-Pycob-Fragment", "")
+
     def params(self, key: str = "") -> Union[str, dict]:
         """Returns the value of the query parameter with the given key. If no key is given, returns a dictionary of all query parameters."""
         if key == "":
@@ -77,3 +108,23 @@ class Request:
     
 def _sanitize(unsanitized: str) -> str:
     return unsanitized.replace('<', '&lt;').replace('>', '&gt;')
+
+async def _run_in_thread(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(func, *args))
+
+# The access rule of the page whose function is running, as (require_login, protect_with_code), or None if
+# anyone can see it. Lazy components, paginated tables and server-side grids made while it runs record it,
+# and their /_pycob/ routes check it like the page does.
+_page_access = contextvars.ContextVar("pycob_page_access", default=None)
+
+def _run_page_function(func, request: Request, access: tuple = None):
+    """Calls a page function, running it on a new event loop if it is an async function."""
+    token = _page_access.set(access)
+
+    try:
+        if asyncio.iscoroutinefunction(func):
+            return asyncio.run(func(request))
+
+        return func(request)
+    finally:
+        _page_access.reset(token)
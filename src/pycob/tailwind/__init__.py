@@ -0,0 +1,536 @@
+"""Builds a static stylesheet with just the Tailwind utilities an app uses.
+
+By default pycob pages load the Tailwind Play CDN, which compiles the CSS in the browser on every page
+load. build_stylesheet() does that work once, ahead of time and offline, from the theme and preflight
+vendored next to this module:
+
+    python -m pycob.tailwind my_app.py [more files or directories] -o pycob.css
+
+Then pass the file to the app with App(..., stylesheet="pycob.css").
+
+Only the utilities pycob's components use (plus the common layout, spacing, sizing, typography, color
+and effect utilities) are supported, with the responsive, dark, hover/focus and group-hover variants.
+Arbitrary values like w-[500px] aren't.
+"""
+import json
+import re
+from pathlib import Path
+
+_HERE = Path(__file__).parent
+
+theme = json.loads((_HERE / "theme.json").read_text())
+preflight = (_HERE / "preflight.css").read_text()
+
+# Files of this package whose strings hold the classes of the built-in components
+PACKAGE_SOURCES = [_HERE.parent / name for name in ("all_components.py", "advanced.py", "auth_forms.py", "handler.py")]
+
+# Classes that components put together at runtime, so they can't be found by scanning the source
+SAFELIST = ["md:grid-cols-" + str(n) for n in range(1, 13)]
+
+def build_stylesheet(sources: list) -> str:
+    """Returns the CSS for every Tailwind class that appears in sources (strings of source code or markup)."""
+    candidates = set(SAFELIST)
+
+    for source in sources:
+        candidates.update(extract_candidates(source))
+
+    return generate_css(candidates)
+
+_CANDIDATE = re.compile(r'''[^\s"'`<>=\\]+''')
+
+def extract_candidates(source: str) -> set:
+    """Returns the tokens of source that could be class names.
+
+    Like Tailwind's own scanner this doesn't parse anything, so most tokens are not classes and are
+    dropped by generate_css(). Tokens with a {{color}} template slot are expanded to every color.
+    """
+    candidates = set()
+
+    for token in _CANDIDATE.findall(source):
+        token = token.strip(",;")
+
+        if "{{color}}" in token:
+            candidates.update(token.replace("{{color}}", color) for color in theme["colors"])
+        else:
+            candidates.add(token)
+
+    return candidates
+
+def generate_css(candidates) -> str:
+    rules = []
+
+    for candidate in candidates:
+        rule = _parse(candidate)
+
+        if rule is not None:
+            rules.append(rule)
+
+    rules.sort(key=lambda rule: rule[0])
+
+    out = [preflight]
+
+    if "container" in candidates:
+        out.append(".container { width: 100%; }\n")
+
+        for screen in theme["screens"].values():
+            out.append("@media (min-width: %s) { .container { max-width: %s; } }\n" % (screen, screen))
+
+    keyframes = set()
+    media = None
+
+    for _, rule_media, selector, declarations, rule_keyframes in rules:
+        if rule_keyframes is not None and rule_keyframes not in keyframes:
+            keyframes.add(rule_keyframes)
+            out.append(("  " if media else "") + rule_keyframes + "\n")
+
+        if rule_media != media:
+            if media is not None:
+                out.append("}\n")
+            if rule_media is not None:
+                out.append("@media (min-width: %s) {\n" % rule_media)
+            media = rule_media
+
+        body = " ".join("%s: %s;" % declaration for declaration in declarations)
+        out.append(("  " if media else "") + selector + " { " + body + " }\n")
+
+    if media is not None:
+        out.append("}\n")
+
+    return "".join(out)
+
+# Variants in the order Tailwind sorts them. A rule's sort key has one bit per variant it uses, so
+# e.g. hover: rules come after plain ones and every md: rule after every sm: rule.
+_VARIANTS = ["first", "last", "odd", "even", "visited", "focus-within", "hover", "focus", "focus-visible", "active", "disabled",
+    "group-hover", "group-focus", "placeholder", "dark"] + list(theme["screens"])
+
+_PSEUDO_CLASSES = {"first": ":first-child", "last": ":last-child", "odd": ":nth-child(odd)", "even": ":nth-child(even)", "visited": ":visited",
+    "focus-within": ":focus-within", "hover": ":hover", "focus": ":focus", "focus-visible": ":focus-visible", "active": ":active", "disabled": ":disabled"}
+
+def _parse(candidate: str):
+    *variants, utility = candidate.split(":")
+
+    media = None
+    bits = 0
+    prefix = ""
+    pseudo_classes = ""
+    pseudo_element = ""
+
+    for variant in variants:
+        if variant not in _VARIANTS:
+            return None
+
+        bits |= 1 << _VARIANTS.index(variant)
+
+        if variant in theme["screens"]:
+            if media is not None:
+                return None
+            media = theme["screens"][variant]
+        elif variant in _PSEUDO_CLASSES:
+            pseudo_classes += _PSEUDO_CLASSES[variant]
+        elif variant.startswith("group-"):
+            prefix += ".group:" + variant[len("group-"):] + " "
+        elif variant == "placeholder":
+            pseudo_element = "::placeholder"
+        elif variant == "dark":
+            prefix = ".dark " + prefix
+
+    for order, utility_function in enumerate(_UTILITIES):
+        match = utility_function(utility)
+
+        if match is not None:
+            declarations, suffix, subrank = match
+            selector = prefix + "." + _escape(candidate) + pseudo_classes + suffix + pseudo_element
+            keyframes = None
+
+            if utility_function is _animation:
+                keyframes = theme["keyframes"].get(utility[len("animate-"):])
+
+            return (bits, order, subrank, candidate), media, selector, declarations, keyframes
+
+    return None
+
+def _escape(candidate: str) -> str:
+    escaped = re.sub(r'([^a-zA-Z0-9_-])', r'\\\1', candidate)
+
+    if escaped[0].isdigit():
+        escaped = "\\3" + escaped[0] + " " + escaped[1:]
+
+    return escaped
+
+def _rule(declarations, suffix: str = "", subrank: int = 0):
+    return declarations, suffix, subrank
+
+def _split(name: str, prefixes):
+    # Returns (prefix, value, negative) for names like "mb-10" or "-mb-10", trying the longest prefix first
+    negative = name.startswith("-")
+
+    if negative:
+        name = name[1:]
+
+    for prefix in sorted(prefixes, key=len, reverse=True):
+        if name.startswith(prefix + "-"):
+            return prefix, name[len(prefix) + 1:], negative
+        if name == prefix:
+            return prefix, "DEFAULT", negative
+
+    return None, None, negative
+
+def _negate(value: str) -> str:
+    if value in ("0px", "0", "auto") or value is None:
+        return value
+    if value.startswith("calc") or value[0] in "-":
+        return None
+    return "-" + value
+
+def _lookup(value: str, *scales, negative: bool = False):
+    for scale in scales:
+        if value in scale:
+            result = scale[value]
+            return _negate(result) if negative else result
+    return None
+
+def _color(name: str):
+    special = {"transparent": "transparent", "current": "currentColor", "inherit": "inherit"}
+
+    if name in special:
+        return special[name]
+
+    colors = theme["colors"]
+
+    if isinstance(colors.get(name), str):
+        return colors[name]
+
+    palette, _, shade = name.rpartition("-")
+
+    if isinstance(colors.get(palette), dict):
+        return colors[palette].get(shade)
+
+    return None
+
+def _rgb(hex_color: str) -> str:
+    return " ".join(str(int(hex_color[i:i + 2], 16)) for i in (1, 3, 5))
+
+def _color_declarations(prop: str, name: str, opacity_variable: str = None):
+    value = _color(name)
+
+    if value is None:
+        return None
+
+    if opacity_variable is None or not value.startswith("#"):
+        return [(prop, value)]
+
+    return [(opacity_variable, "1"), (prop, "rgb(%s / var(%s))" % (_rgb(value), opacity_variable))]
+
+def _keywords(mapping: dict):
+    # A utility whose classes are a fixed set of names
+    def utility(name: str):
+        declarations = mapping.get(name)
+        return None if declarations is None else _rule(declarations)
+    return utility
+
+_sr_only = _keywords({
+    "sr-only": [("position", "absolute"), ("width", "1px"), ("height", "1px"), ("padding", "0"), ("margin", "-1px"), ("overflow", "hidden"),
+        ("clip", "rect(0, 0, 0, 0)"), ("white-space", "nowrap"), ("border-width", "0")],
+    "not-sr-only": [("position", "static"), ("width", "auto"), ("height", "auto"), ("padding", "0"), ("margin", "0"), ("overflow", "visible"),
+        ("clip", "auto"), ("white-space", "normal")],
+})
+
+_visibility = _keywords({"visible": [("visibility", "visible")], "invisible": [("visibility", "hidden")]})
+
+_position = _keywords({name: [("position", name)] for name in ("static", "fixed", "absolute", "relative", "sticky")})
+
+_SIDES = {"t": ["top"], "r": ["right"], "b": ["bottom"], "l": ["left"], "x": ["left", "right"], "y": ["top", "bottom"], "": ["top", "right", "bottom", "left"]}
+
+def _inset(name: str):
+    prefix, value, negative = _split(name, ["inset", "inset-x", "inset-y", "top", "right", "bottom", "left"])
+
+    if prefix is None:
+        return None
+
+    value = _lookup(value, theme["spacing"], theme["fractions"], {"auto": "auto", "full": "100%"}, negative=negative)
+
+    if value is None:
+        return None
+
+    sides = {"inset": _SIDES[""], "inset-x": _SIDES["x"], "inset-y": _SIDES["y"]}.get(prefix, [prefix])
+    return _rule([(side, value) for side in sides], subrank=0 if prefix == "inset" else 1 if prefix in ("inset-x", "inset-y") else 2)
+
+def _z_index(name: str):
+    prefix, value, negative = _split(name, ["z"])
+    value = _lookup(value, theme["zIndex"], negative=negative) if prefix else None
+    return None if value is None else _rule([("z-index", value)])
+
+def _order(name: str):
+    prefix, value, negative = _split(name, ["order"])
+
+    if prefix is None:
+        return None
+
+    value = {"first": "-9999", "last": "9999", "none": "0"}.get(value, value if value.isdigit() and 1 <= int(value) <= 12 else None)
+    return None if value is None else _rule([("order", _negate(value) if negative else value)])
+
+def _col_span(name: str):
+    prefix, value, _ = _split(name, ["col-span"])
+
+    if prefix is None:
+        return None
+    if value == "full":
+        return _rule([("grid-column", "1 / -1")])
+    if value.isdigit() and 1 <= int(value) <= 12:
+        return _rule([("grid-column", "span %s / span %s" % (value, value))])
+
+    return None
+
+def _box_sides(property_name: str, letter: str, allow_auto: bool):
+    # margin and padding: m/mx/my/mt/mr/mb/ml and the same for p
+    def utility(name: str):
+        prefix, value, negative = _split(name, [letter + side for side in _SIDES])
+
+        if prefix is None or (negative and not allow_auto):
+            return None
+
+        value = _lookup(value, theme["spacing"], {"auto": "auto"} if allow_auto else {}, negative=negative)
+
+        if value is None:
+            return None
+
+        side = prefix[1:]
+        subrank = 0 if side == "" else 1 if side in "xy" else 2
+        return _rule([(property_name + "-" + edge, value) for edge in _SIDES[side]] if side else [(property_name, value)], subrank=subrank)
+    return utility
+
+_margin = _box_sides("margin", "m", True)
+_padding = _box_sides("padding", "p", False)
+
+_display = _keywords(dict([(name, [("display", name)]) for name in ("block", "inline-block", "inline", "flex", "inline-flex", "table", "table-row",
+    "table-cell", "grid", "inline-grid", "contents", "list-item")] + [("hidden", [("display", "none")])]))
+
+def _sizing(prefixes: dict, *scales):
+    # A utility that maps prefix-value to one CSS property, e.g. w-64 or max-w-md
+    def utility(name: str):
+        prefix, value, negative = _split(name, prefixes)
+
+        if prefix is None or negative:
+            return None
+
+        value = _lookup(value, *scales)
+        return None if value is None else _rule([(prefixes[prefix], value)])
+    return utility
+
+_height = _sizing({"h": "height"}, theme["spacing"], theme["fractions"], theme["height"])
+_max_height = _sizing({"max-h": "max-height"}, theme["spacing"], {"none": "none", "full": "100%", "screen": "100vh", "min": "min-content", "max": "max-content", "fit": "fit-content"})
+_min_height = _sizing({"min-h": "min-height"}, {"0": "0px", "full": "100%", "screen": "100vh", "min": "min-content", "max": "max-content", "fit": "fit-content"})
+_width = _sizing({"w": "width"}, theme["spacing"], theme["fractions"], theme["width"])
+_min_width = _sizing({"min-w": "min-width"}, {"0": "0px", "full": "100%", "min": "min-content", "max": "max-content", "fit": "fit-content"})
+_max_width = _sizing({"max-w": "max-width"}, theme["maxWidth"])
+
+_flex = _keywords({"flex-1": [("flex", "1 1 0%")], "flex-auto": [("flex", "1 1 auto")], "flex-initial": [("flex", "0 1 auto")], "flex-none": [("flex", "none")]})
+
+_flex_shrink = _keywords({"shrink": [("flex-shrink", "1")], "shrink-0": [("flex-shrink", "0")], "flex-shrink": [("flex-shrink", "1")], "flex-shrink-0": [("flex-shrink", "0")]})
+
+_flex_grow = _keywords({"grow": [("flex-grow", "1")], "grow-0": [("flex-grow", "0")], "flex-grow": [("flex-grow", "1")], "flex-grow-0": [("flex-grow", "0")]})
+
+_animation = _keywords({"animate-" + name: [("animation", value)] for name, value in theme["animation"].items()})
+
+_cursor = _keywords({"cursor-" + name: [("cursor", name)] for name in ("auto", "default", "pointer", "wait", "text", "move", "help", "not-allowed")})
+
+_user_select = _keywords({"select-" + name: [("user-select", name)] for name in ("none", "text", "all", "auto")})
+
+_list_position = _keywords({"list-inside": [("list-style-position", "inside")], "list-outside": [("list-style-position", "outside")]})
+
+_list_type = _keywords({"list-" + name: [("list-style-type", name)] for name in ("none", "disc", "decimal")})
+
+def _grid_columns(name: str):
+    prefix, value, _ = _split(name, ["grid-cols"])
+
+    if prefix is None:
+        return None
+    if value == "none":
+        return _rule([("grid-template-columns", "none")])
+    if value.isdigit() and 1 <= int(value) <= 12:
+        return _rule([("grid-template-columns", "repeat(%s, minmax(0, 1fr))" % value)])
+
+    return None
+
+_flex_direction = _keywords({"flex-row": [("flex-direction", "row")], "flex-row-reverse": [("flex-direction", "row-reverse")],
+    "flex-col": [("flex-direction", "column")], "flex-col-reverse": [("flex-direction", "column-reverse")]})
+
+_flex_wrap = _keywords({"flex-wrap": [("flex-wrap", "wrap")], "flex-wrap-reverse": [("flex-wrap", "wrap-reverse")], "flex-nowrap": [("flex-wrap", "nowrap")]})
+
+_FLEX_VALUES = {"start": "flex-start", "end": "flex-end", "center": "center", "between": "space-between", "around": "space-around",
+    "evenly": "space-evenly", "baseline": "baseline", "stretch": "stretch", "auto": "auto"}
+
+_align_items = _keywords({"items-" + name: [("align-items", _FLEX_VALUES[name])] for name in ("start", "end", "center", "baseline", "stretch")})
+
+_justify_content = _keywords({"justify-" + name: [("justify-content", _FLEX_VALUES[name])] for name in ("start", "end", "center", "between", "around", "evenly")})
+
+def _gap(name: str):
+    prefix, value, negative = _split(name, ["gap", "gap-x", "gap-y"])
+    value = _lookup(value, theme["spacing"]) if prefix and not negative else None
+
+    if value is None:
+        return None
+
+    properties = {"gap": "gap", "gap-x": "column-gap", "gap-y": "row-gap"}
+    return _rule([(properties[prefix], value)], subrank=int(prefix != "gap"))
+
+def _space(name: str):
+    prefix, value, negative = _split(name, ["space-x", "space-y"])
+    value = _lookup(value, theme["spacing"], negative=negative) if prefix else None
+
+    if value is None:
+        return None
+
+    side = "margin-left" if prefix == "space-x" else "margin-top"
+    return _rule([(side, value)], suffix=" > :not([hidden]) ~ :not([hidden])")
+
+_align_self = _keywords({"self-" + name: [("align-self", _FLEX_VALUES[name])] for name in ("auto", "start", "end", "center", "stretch", "baseline")})
+
+def _overflow(name: str):
+    prefix, value, _ = _split(name, ["overflow", "overflow-x", "overflow-y"])
+
+    if prefix is None or value not in ("auto", "hidden", "clip", "visible", "scroll"):
+        return None
+
+    return _rule([(prefix, value)], subrank=int(prefix != "overflow"))
+
+_truncate = _keywords({"truncate": [("overflow", "hidden"), ("text-overflow", "ellipsis"), ("white-space", "nowrap")]})
+
+_whitespace = _keywords({"whitespace-" + name: [("white-space", name)] for name in ("normal", "nowrap", "pre", "pre-line", "pre-wrap")})
+
+_word_break = _keywords({"break-normal": [("overflow-wrap", "normal"), ("word-break", "normal")], "break-words": [("overflow-wrap", "break-word")],
+    "break-all": [("word-break", "break-all")]})
+
+_CORNERS = {"": ["top-left", "top-right", "bottom-right", "bottom-left"], "t": ["top-left", "top-right"], "r": ["top-right", "bottom-right"],
+    "b": ["bottom-right", "bottom-left"], "l": ["top-left", "bottom-left"], "tl": ["top-left"], "tr": ["top-right"], "br": ["bottom-right"], "bl": ["bottom-left"]}
+
+def _border_radius(name: str):
+    prefix, value, negative = _split(name, ["rounded" + ("-" + corner if corner else "") for corner in _CORNERS])
+    value = _lookup(value, theme["borderRadius"]) if prefix and not negative else None
+
+    if value is None:
+        return None
+
+    corner = prefix[len("rounded-"):]
+
+    if corner == "":
+        return _rule([("border-radius", value)])
+
+    return _rule([("border-" + side + "-radius", value) for side in _CORNERS[corner]], subrank=len(corner))
+
+def _border_width(name: str):
+    prefix, value, negative = _split(name, ["border" + ("-" + side if side else "") for side in _SIDES])
+    value = _lookup(value, theme["borderWidth"]) if prefix and not negative else None
+
+    if value is None:
+        return None
+
+    side = prefix[len("border-"):]
+
+    if side == "":
+        return _rule([("border-width", value)])
+
+    if side in "xy":
+        return _rule([("border-" + edge + "-width", value) for edge in _SIDES[side]], subrank=1)
+
+    return _rule([("border-" + _SIDES[side][0] + "-width", value)], subrank=2)
+
+_border_style = _keywords({"border-" + name: [("border-style", name)] for name in ("solid", "dashed", "dotted", "double", "hidden", "none")})
+
+def _color_utility(prefix: str, property_name: str, opacity_variable: str = None, suffix: str = ""):
+    def utility(name: str):
+        if not name.startswith(prefix + "-"):
+            return None
+
+        declarations = _color_declarations(property_name, name[len(prefix) + 1:], opacity_variable)
+        return None if declarations is None else _rule(declarations, suffix=suffix)
+    return utility
+
+_border_color = _color_utility("border", "border-color", "--tw-border-opacity")
+_background_color = _color_utility("bg", "background-color", "--tw-bg-opacity")
+
+_GRADIENT_DIRECTIONS = {"t": "top", "tr": "top right", "r": "right", "br": "bottom right", "b": "bottom", "bl": "bottom left", "l": "left", "tl": "top left"}
+
+_background_image = _keywords(dict([("bg-none", [("background-image", "none")])] + [("bg-gradient-to-" + key, [("background-image", "linear-gradient(to %s, var(--tw-gradient-stops))" % value)])
+    for key, value in _GRADIENT_DIRECTIONS.items()]))
+
+def _gradient_color_stops(name: str):
+    prefix, value, negative = _split(name, ["from", "via", "to"])
+    color = _color(value) if prefix and not negative else None
+
+    if color is None:
+        return None
+
+    transparent = "rgb(%s / 0)" % _rgb(color) if color.startswith("#") else "rgb(255 255 255 / 0)"
+
+    if prefix == "from":
+        return _rule([("--tw-gradient-from", color), ("--tw-gradient-to", transparent),
+            ("--tw-gradient-stops", "var(--tw-gradient-from), var(--tw-gradient-to)")])
+
+    if prefix == "via":
+        return _rule([("--tw-gradient-to", transparent), ("--tw-gradient-stops", "var(--tw-gradient-from), %s, var(--tw-gradient-to)" % color)], subrank=1)
+
+    return _rule([("--tw-gradient-to", color)], subrank=2)
+
+_fill = _color_utility("fill", "fill")
+_stroke = _color_utility("stroke", "stroke")
+
+_object_fit = _keywords({"object-" + name: [("object-fit", name)] for name in ("contain", "cover", "fill", "none", "scale-down")})
+
+_text_align = _keywords({"text-" + name: [("text-align", name)] for name in ("left", "center", "right", "justify", "start", "end")})
+
+_font_family = _keywords({"font-" + name: [("font-family", value)] for name, value in theme["fontFamily"].items()})
+
+_font_size = _keywords({"text-" + name: [("font-size", size), ("line-height", line_height)] for name, (size, line_height) in theme["fontSize"].items()})
+
+_font_weight = _keywords({"font-" + name: [("font-weight", value)] for name, value in theme["fontWeight"].items()})
+
+_text_transform = _keywords({"uppercase": [("text-transform", "uppercase")], "lowercase": [("text-transform", "lowercase")],
+    "capitalize": [("text-transform", "capitalize")], "normal-case": [("text-transform", "none")]})
+
+_font_style = _keywords({"italic": [("font-style", "italic")], "not-italic": [("font-style", "normal")]})
+
+_line_height = _keywords({"leading-" + name: [("line-height", value)] for name, value in theme["lineHeight"].items()})
+
+_letter_spacing = _keywords({"tracking-" + name: [("letter-spacing", value)] for name, value in theme["letterSpacing"].items()})
+
+_text_color = _color_utility("text", "color", "--tw-text-opacity")
+
+_text_decoration = _keywords({"underline": [("text-decoration-line", "underline")], "overline": [("text-decoration-line", "overline")],
+    "line-through": [("text-decoration-line", "line-through")], "no-underline": [("text-decoration-line", "none")]})
+
+_placeholder_color = _color_utility("placeholder", "color", "--tw-placeholder-opacity", suffix="::placeholder")
+
+_opacity = _keywords({"opacity-" + name: [("opacity", value)] for name, value in theme["opacity"].items()})
+
+_box_shadow = _keywords({("shadow" if name == "DEFAULT" else "shadow-" + name): [("--tw-shadow", value),
+    ("box-shadow", "var(--tw-ring-offset-shadow, 0 0 #0000), var(--tw-ring-shadow, 0 0 #0000), var(--tw-shadow)")]
+    for name, value in theme["boxShadow"].items()})
+
+_outline = _keywords({"outline-none": [("outline", "2px solid transparent"), ("outline-offset", "2px")], "outline": [("outline-style", "solid")]})
+
+_ring_width = _keywords(dict([("ring-inset", [("--tw-ring-inset", "inset")])] + [(("ring" if name == "DEFAULT" else "ring-" + name), [
+    ("--tw-ring-offset-shadow", "var(--tw-ring-inset) 0 0 0 var(--tw-ring-offset-width) var(--tw-ring-offset-color)"),
+    ("--tw-ring-shadow", "var(--tw-ring-inset) 0 0 0 calc(%s + var(--tw-ring-offset-width)) var(--tw-ring-color)" % value),
+    ("box-shadow", "var(--tw-ring-offset-shadow), var(--tw-ring-shadow), var(--tw-shadow, 0 0 #0000)")])
+    for name, value in theme["ringWidth"].items()]))
+
+_ring_color = _color_utility("ring", "--tw-ring-color", "--tw-ring-opacity")
+
+_TRANSITION = [("transition-timing-function", "cubic-bezier(0.4, 0, 0.2, 1)"), ("transition-duration", "150ms")]
+
+_transition = _keywords({"transition-none": [("transition-property", "none")],
+    "transition-all": [("transition-property", "all")] + _TRANSITION,
+    "transition-colors": [("transition-property", "color, background-color, border-color, text-decoration-color, fill, stroke")] + _TRANSITION,
+    "transition": [("transition-property", "color, background-color, border-color, text-decoration-color, fill, stroke, opacity, box-shadow, transform, filter, backdrop-filter")] + _TRANSITION})
+
+_duration = _keywords({"duration-" + name: [("transition-duration", value)] for name, value in theme["transitionDuration"].items()})
+
+# In Tailwind's plugin order, which decides which of two conflicting classes wins
+_UTILITIES = [_sr_only, _visibility, _position, _inset, _z_index, _order, _col_span, _margin, _display, _height, _max_height,
+    _min_height, _width, _min_width, _max_width, _flex, _flex_shrink, _flex_grow, _animation, _cursor, _user_select, _list_position,
+    _list_type, _grid_columns, _flex_direction, _flex_wrap, _align_items, _justify_content, _gap, _space, _align_self, _overflow,
+    _truncate, _whitespace, _word_break, _border_radius, _border_width, _border_style, _border_color, _background_color,
+    _background_image, _gradient_color_stops, _fill, _stroke, _object_fit, _padding, _text_align, _font_family, _font_size,
+    _font_weight, _text_transform, _font_style, _line_height, _letter_spacing, _text_color, _text_decoration, _placeholder_color,
+    _opacity, _box_shadow, _outline, _ring_width, _ring_color, _transition, _duration]
@@ -0,0 +1,23 @@
+import argparse
+from pathlib import Path
+from . import PACKAGE_SOURCES, build_stylesheet
+
+parser = argparse.ArgumentParser(prog="python -m pycob.tailwind", description="Builds a static stylesheet with the Tailwind classes used by pycob and your app.")
+parser.add_argument("paths", nargs="*", default=["."], help="Files or directories of your app to scan for classes (default: the current directory)")
+parser.add_argument("-o", "--output", default="pycob.css", help="Stylesheet to write (default: pycob.css)")
+args = parser.parse_args()
+
+files = list(PACKAGE_SOURCES)
+
+for path in map(Path, args.paths):
+    if path.is_dir():
+        files.extend(file for pattern in ("*.py", "*.html", "*.js") for file in sorted(path.rglob(pattern)) if "site-packages" not in file.parts)
+    else:
+        files.append(path)
+
+css = build_stylesheet([file.read_text(encoding="utf-8", errors="ignore") for file in files])
+Path(args.output).write_text(css, encoding="utf-8")
+
+print("Scanned " + str(len(files)) + " files")
+print("Wrote " + str(len(css)) + " bytes to " + args.output)
+print("Use it with App(..., stylesheet=\"" + args.output + "\")")